@@ -5,8 +5,14 @@ This file is the entry point of the module and must contain a createPlugin()
 or createPlugins() function.
 """
 
-from .installer import SimpleInstaller
 
+def createPlugins():
+    # The plugins are imported here and not at the top of the file: some modules of
+    # this plugin (e.g. the pre-scan of the downloads folder) run in worker processes
+    # where mobase is not available, and importing any of them imports this file.
+    from .installer import SimpleInstaller
+    from .batchtool import BatchInstallTool
 
-def createPlugin() -> SimpleInstaller:
-    return SimpleInstaller()
+    # The tool installs the archives with the installer, so they share the instance:
+    installer = SimpleInstaller()
+    return [installer, BatchInstallTool(installer)]
@@ -0,0 +1,578 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the analysis of archive trees used by the simple installer.
+
+The functions here do not depend on `mobase` directly: the trees only need to
+behave like `mobase.IFileTree` and the mod-data-checker is passed as a simple
+predicate, so this module can be used outside of MO2.
+"""
+
+import enum
+
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .rules import CompiledRules
+from .treestats import TreeStatsCache
+
+# Type of the trees and entries - These are usually mobase.IFileTree and
+# mobase.FileTreeEntry, but anything behaving the same way is fine:
+FileTree = Any
+
+# Predicate used to check if a tree is a valid data folder (this usually wraps
+# mobase.ModDataChecker.dataLooksValid()):
+DataChecker = Callable[[FileTree], bool]
+
+
+def walkTree(
+    tree: FileTree,
+    prefix: str = "",
+    descend: Optional[Callable[[FileTree], bool]] = None,
+) -> Iterator[Tuple[str, FileTree]]:
+    """ Iterate the entries of the given tree recursively (depth-first, each folder
+    before its entries).
+
+    This uses an explicit stack of iterators, so the memory used only depends on the
+    depth of the tree (not on its number of entries), and the walk stops as soon as
+    the caller stops consuming the entries.
+
+    Args:
+        tree: The tree to walk. It must not be modified during the walk.
+        prefix: Prefix to add to the paths.
+        descend: Predicate called on the folders to check if their entries should be
+            walked, or None to walk all the folders.
+
+    Yields: The entries of the tree with their path relative to the tree (using "/"
+        as separator).
+    """
+    stack = [(prefix, iter(tree))]
+    while stack:
+        folder_prefix, it = stack.pop()
+        for entry in it:
+            path = folder_prefix + entry.name()
+            yield path, entry
+
+            # The current folder is resumed once the sub-folder has been walked:
+            if entry.isDir() and (descend is None or descend(entry)):
+                stack.append((folder_prefix, it))
+                stack.append((path + "/", iter(entry)))
+                break
+
+
+class LayoutKind(enum.Enum):
+
+    """ The kind of layout of an archive supported by the simple installer. """
+
+    # The base of the archive is a valid data folder:
+    DATA = enum.auto()
+
+    # The base of the archive contains the data folder and some txt/pdf files:
+    DATA_TEXT = enum.auto()
+
+
+class ArchiveAnalysis:
+
+    """ Result of the analysis of an archive tree.
+
+    An analysis is bound to the tree it was computed on and keeps a small signature
+    of the levels that were visited so that it can be invalidated if the tree is
+    modified afterwards.
+    """
+
+    __slots__ = ("levels", "kind", "data", "_signature")
+
+    # The levels of the tree between the original tree (first) and the base of the
+    # archive (last):
+    levels: Tuple[FileTree, ...]
+
+    # Kind of layout found:
+    kind: LayoutKind
+
+    # The data folder for data-text archives, None otherwise:
+    data: Optional[FileTree]
+
+    def __init__(
+        self,
+        levels: Sequence[FileTree],
+        kind: LayoutKind,
+        data: Optional[FileTree] = None,
+    ):
+        self.levels = tuple(levels)
+        self.kind = kind
+        self.data = data
+        self._signature = self._computeSignature()
+
+    @property
+    def tree(self) -> FileTree:
+        """ The original tree. """
+        return self.levels[0]
+
+    @property
+    def base(self) -> FileTree:
+        """ The base of the archive, i.e., the data folder or the folder containing
+        the data folder and the text files. """
+        return self.levels[-1]
+
+    @property
+    def depth(self) -> int:
+        """ Depth of the base in the original tree (0 if the base is the tree). """
+        return len(self.levels) - 1
+
+    def _computeSignature(self) -> Optional[Tuple[int, ...]]:
+        """ Compute the signature of the tree, i.e., the number of entries at each
+        level between the tree and the base.
+
+        Returns: The signature of the tree, or None if the base cannot be reached
+            from the tree anymore.
+        """
+
+        # We compare identity here - This works with mobase since we keep a reference
+        # to all the levels, so the same Python object is returned for the same entry:
+        for parent, level in zip(self.levels, self.levels[1:]):
+            if level.parent() is not parent:
+                return None
+
+        if self.data is not None and self.data.parent() is not self.base:
+            return None
+
+        return tuple(len(level) for level in self.levels)
+
+    def isValidFor(self, tree: FileTree) -> bool:
+        """ Check if this analysis can be used for the given tree.
+
+        Args:
+            tree: The tree to check.
+
+        Returns: True if this analysis was computed for the given tree and the tree
+            has not been modified in a way that would change the analysis.
+        """
+        return tree is self.tree and self._computeSignature() == self._signature
+
+
+class LevelVerdict(enum.Enum):
+
+    """ Verdict of classifyLevel() for a single level of an archive tree. """
+
+    # The level is the top layer of a data-text archive:
+    DATA_TEXT = enum.auto()
+
+    # The level contains a single folder that should be looked into:
+    DESCEND = enum.auto()
+
+    # The level does not match any layout and contains nothing to look into:
+    NONE = enum.auto()
+
+
+def classifyLevel(
+    tree: FileTree, rules: CompiledRules
+) -> Tuple[LevelVerdict, Optional[FileTree]]:
+    """ Classify a single level of an archive tree.
+
+    This walks the entries of the given tree at most once, and stops as soon as
+    the verdict is known. Each entry is evaluated using the lookup tables of the
+    compiled rules.
+
+    A "Data-Text Archive" contains a single folder named "data" or whatever the
+    data directory is called for the current game, together with txt or pdf files.
+
+    Args:
+        tree: The tree to classify.
+        rules: The rules to use.
+
+    Returns: The verdict for the given level, and the folder to look into (for
+        DESCEND) or the data folder (for DATA_TEXT).
+    """
+
+    # A single entry cannot be a data-text archive since we need at least a text
+    # file and the data folder, but we can look into it if it is a folder:
+    if len(tree) == 1:
+        entry = tree[0]
+        if entry.isDir():
+            return LevelVerdict.DESCEND, entry
+        return LevelVerdict.NONE, None
+
+    # We are looking for a single folder and some text files - The name of the folder
+    # is only checked at the end since a single folder with only ignored entries
+    # next to it is not a data-text archive, but we can look into it:
+    folder, text_found = None, False
+
+    text_suffixes = rules.textSuffixes
+    text_endings = tuple("." + suffix for suffix in text_suffixes)
+    has_ignored = rules.hasIgnored()
+
+    # You can iterate a mobase.IFileTree (but should not modify the tree while
+    # iterating it):
+    for e in tree:
+        if e.isDir():
+            if has_ignored and rules.isIgnored(e.name()):
+                continue
+            if folder is not None:
+                return LevelVerdict.NONE, None
+            folder = e
+
+        else:
+            # e.suffix() returns the extension of the file (without the .) - Most
+            # suffixes are already lowercase, so the name is checked against the
+            # endings first, and the suffix is only extracted if they do not match:
+            if e.name().endswith(text_endings) or (
+                e.suffix().casefold() in text_suffixes
+            ):
+                # An ignored text file is skipped, which only matters if no other text
+                # file was found, so the name of the text files is not checked after
+                # the first one:
+                if not text_found and not (has_ignored and rules.isIgnored(e.name())):
+                    text_found = True
+
+            elif not (has_ignored and rules.isIgnored(e.name())):
+                return LevelVerdict.NONE, None
+
+    if folder is None:
+        return LevelVerdict.NONE, None
+
+    if not text_found:
+        return LevelVerdict.DESCEND, folder
+
+    # The folder must be the data folder: the original check (`data_found or
+    # e == data_name`) rejected the level when the folder was named after the data
+    # folder and accepted any other name, and the installation then failed since the
+    # data folder could not be found in the level - Other folders next to text files
+    # are not data-text archives:
+    if rules.isDataName(folder.name()):
+        return LevelVerdict.DATA_TEXT, folder
+
+    return LevelVerdict.NONE, None
+
+
+def findDataFolder(tree: FileTree, rules: CompiledRules) -> Optional[FileTree]:
+    """ Find the data folder directly under the given tree.
+
+    Args:
+        tree: The tree to look the data folder in.
+        rules: The rules to use.
+
+    Returns: The data folder, or None if there is none.
+    """
+    for name in rules.dataNames:
+        # tree.find() is case-insensitive (and does not walk the entries in Python):
+        entry = tree.find(name)
+        if entry is not None and entry.isDir():
+            return entry
+    return None
+
+
+def looksLikeData(tree: FileTree, rules: CompiledRules) -> bool:
+    """ Check if the given tree looks like a data folder according to the rules,
+    i.e., if it contains an entry identifying a data folder. This can be used as a
+    DataChecker when the mod-data-checker is not available (e.g. outside of MO2).
+
+    Args:
+        tree: The tree to check.
+        rules: The rules to use.
+
+    Returns: True if the tree looks like a data folder, False otherwise.
+    """
+    return any(rules.isDataContent(e.name()) for e in tree)
+
+
+class LayoutHint(NamedTuple):
+
+    """ Part of the analysis of an archive that does not depend on the mod-data-checker,
+    e.g., computed from the list of entries of the archive before installing it. """
+
+    # Depth of the deepest level that can be the base of the archive, i.e., the
+    # number of single folders at the top of the archive:
+    maxDepth: int
+
+    # Depth of the top layer of the data-text archive, or None if the archive is
+    # not a data-text archive:
+    dataTextDepth: Optional[int]
+
+
+def scanLayout(tree: FileTree, rules: CompiledRules) -> LayoutHint:
+    """ Compute the part of the analysis of the given tree that does not depend on
+    the mod-data-checker.
+
+    Args:
+        tree: The tree to scan.
+        rules: The rules to use.
+
+    Returns: The layout hint for the given tree.
+    """
+    depth = 0
+    while True:
+        verdict, entry = classifyLevel(tree, rules)
+        if verdict is LevelVerdict.DATA_TEXT:
+            return LayoutHint(depth, depth)
+        elif verdict is LevelVerdict.DESCEND and depth < rules.maxDepth:
+            tree, depth = entry, depth + 1
+        else:
+            return LayoutHint(depth, None)
+
+
+def findArchiveBase(
+    tree: FileTree,
+    rules: CompiledRules,
+    checker: DataChecker,
+    hint: Optional[LayoutHint] = None,
+    stats: Optional[TreeStatsCache] = None,
+) -> Optional[ArchiveAnalysis]:
+    """ Try to find the data folder in the given tree.
+
+    Single folders are descended into first, and if the data folder is not found
+    this way, it is searched in the sub-folders of the last level (see
+    searchArchiveBase()).
+
+    Args:
+        tree: Tree to look the data folder in.
+        rules: The rules to use.
+        checker: Predicate to use to check if a tree is a data folder.
+        hint: Layout hint for the tree, if known. When specified, the levels of the
+            tree are not walked, only the checker is called.
+        stats: Cache of the statistics of the folders, see searchArchiveBase().
+
+    Returns: The analysis of the tree, whose base corresponds to the data-folder, or
+        to a folder containing the data-folder with txt/pdfs files, or None if such
+        folder was not found.
+    """
+
+    levels = [tree]
+    while True:
+        base, depth = levels[-1], len(levels) - 1
+
+        # If the tree is valid, we simple return it:
+        if checker(base):
+            return ArchiveAnalysis(levels, LayoutKind.DATA)
+
+        if hint is not None:
+            verdict, entry = _hintedVerdict(base, rules, hint, depth)
+        else:
+            verdict, entry = classifyLevel(base, rules)
+
+        # If the tree is a data-text archive, also return it:
+        if verdict is LevelVerdict.DATA_TEXT:
+            return ArchiveAnalysis(levels, LayoutKind.DATA_TEXT, entry)
+        # If the tree contains a single folder, recurse into it (this is very useful
+        # since a lot of mod archives contains a useless folder at the root):
+        elif verdict is LevelVerdict.DESCEND and depth < rules.maxDepth:
+            levels.append(entry)
+        # Otherwise, we look for the data folder in the sub-folders:
+        elif verdict is LevelVerdict.NONE:
+            return searchArchiveBase(levels, rules, checker, stats)
+        else:
+            return None
+
+
+class _SearchNode(NamedTuple):
+
+    """ A folder visited by searchArchiveBase(), linked to its parent so that the
+    levels to the folder are only built for the folder that is found. """
+
+    tree: FileTree
+    parent: Optional["_SearchNode"]
+
+    def levels(self) -> List[FileTree]:
+        levels = []
+        node: Optional[_SearchNode] = self
+        while node is not None:
+            levels.append(node.tree)
+            node = node.parent
+        levels.reverse()
+        return levels
+
+
+def _searchedFolders(
+    tree: FileTree, rules: CompiledRules, stats: TreeStatsCache
+) -> Iterator[FileTree]:
+    """ Iterate the sub-folders of the given folder that must be searched, using the
+    statistics of the folder if they were computed, or walking it otherwise. """
+    level = stats.cached(tree)
+    if level is not None:
+        return (e for name, e in level.folders.items() if rules.isSearched(name))
+    return (e for e in tree if e.isDir() and rules.isSearched(e.name()))
+
+
+def searchArchiveBase(
+    levels: Sequence[FileTree],
+    rules: CompiledRules,
+    checker: DataChecker,
+    stats: Optional[TreeStatsCache] = None,
+) -> Optional[ArchiveAnalysis]:
+    """ Search for the data folder in the sub-folders of a tree.
+
+    This is a breadth-first search: all the folders at a given depth are checked
+    before going deeper, and the search stops at the first depth where a data folder
+    is found. If multiple data folders are found at this depth, the archive is
+    ambiguous and the search fails.
+
+    Folders that are skipped by the rules, and folders that only contain text files
+    (e.g. documentation), are not checked nor searched. The search visits at most
+    rules.searchBudget entries (not counting the ones visited by the checker).
+
+    The search only keeps the folders whose sub-folders must be searched at the next
+    depth (not the sub-folders themselves). Each visited folder is walked once, its
+    statistics (see TreeStatsCache) being used both to check it and to enumerate its
+    sub-folders at the next depth, and the statistics are dropped from the cache once
+    the folder cannot be used anymore. The sub-folders of the searched tree itself are
+    enumerated lazily, so the search does not keep all the entries of wide levels.
+
+    Args:
+        levels: The levels of the tree between the original tree and the tree to
+            search in (included).
+        rules: The rules to use.
+        checker: Predicate to use to check if a tree is a data folder.
+        stats: Cache of the statistics of the folders, shared with the caller (e.g.
+            with the mod-data-checker), or None to use a new cache. The cache must
+            ignore the entries ignored by the rules.
+
+    Returns: The analysis of the tree, or None if no data folder was found, or if
+        multiple were found.
+    """
+    budget = rules.searchBudget
+
+    budget -= len(levels[-1])
+    if budget < 0:
+        return None
+
+    if stats is None:
+        stats = TreeStatsCache(rules.isIgnored)
+    text_suffixes = rules.textSuffixes
+
+    root: Optional[_SearchNode] = None
+    for level in levels:
+        root = _SearchNode(level, root)
+
+    # The folders whose searched sub-folders are visited at the current depth:
+    parents = [root]
+
+    for _ in range(rules.searchDepth):
+        found: Optional[ArchiveAnalysis] = None
+        next_parents = []
+
+        for parent in parents:
+            for tree in _searchedFolders(parent.tree, rules, stats):
+                node = _SearchNode(tree, parent)
+
+                budget -= len(tree)
+                if budget < 0:
+                    return None
+
+                level = stats.level(tree)
+                texts = level.countSuffixes(text_suffixes)
+                others = level.files - texts
+
+                # Folders containing only text files are documentation:
+                if not level.folders and not others:
+                    continue
+
+                analysis = None
+                if checker(tree):
+                    analysis = ArchiveAnalysis(node.levels(), LayoutKind.DATA)
+                elif len(level.folders) == 1 and texts > 0 and others == 0:
+                    (data_name, data), = level.folders.items()
+                    if rules.isDataName(data_name):
+                        analysis = ArchiveAnalysis(
+                            node.levels(), LayoutKind.DATA_TEXT, data
+                        )
+
+                if analysis is not None:
+                    # Two data folders at the same depth: the archive is ambiguous.
+                    if found is not None:
+                        return None
+                    found = analysis
+                elif any(rules.isSearched(name) for name in level.folders):
+                    next_parents.append(node)
+                else:
+                    stats.discard(tree)
+
+            if parent is not root:
+                stats.discard(parent.tree)
+
+        if found is not None:
+            return found
+
+        parents = next_parents
+
+    return None
+
+
+def restoreAnalysis(
+    tree: FileTree,
+    rules: CompiledRules,
+    checker: DataChecker,
+    base: str,
+    kind: LayoutKind,
+) -> Optional[ArchiveAnalysis]:
+    """ Restore an analysis of the given tree from a previous verdict, e.g., from the
+    cache of the installer. Only the level found previously is checked.
+
+    Args:
+        tree: The tree to restore the analysis for.
+        rules: The rules to use.
+        checker: Predicate to use to check if a tree is a data folder.
+        base: Path to the base of the archive in the tree ("" for the tree itself).
+        kind: Kind of layout of the archive.
+
+    Returns: The analysis of the tree, or None if the verdict does not match the tree.
+    """
+    entry = tree.find(base) if base else tree
+    if entry is None or not entry.isDir():
+        return None
+
+    # Retrieve the levels between the tree and the base:
+    levels = [entry]
+    while levels[-1] is not tree:
+        parent = levels[-1].parent()
+        if parent is None:
+            return None
+        levels.append(parent)
+    levels.reverse()
+
+    if kind is LayoutKind.DATA:
+        if not checker(entry):
+            return None
+        return ArchiveAnalysis(levels, kind)
+
+    data = findDataFolder(entry, rules)
+    if data is None:
+        return None
+
+    return ArchiveAnalysis(levels, kind, data)
+
+
+def _hintedVerdict(
+    tree: FileTree,
+    rules: CompiledRules,
+    hint: LayoutHint,
+    depth: int,
+) -> Tuple[LevelVerdict, Optional[FileTree]]:
+    """ Retrieve the verdict for a level of a tree from a layout hint. This does not
+    walk the level unless it contains ignored entries.
+
+    Args:
+        tree: The level of the tree.
+        rules: The rules to use.
+        hint: The layout hint for the tree.
+        depth: The depth of the level in the tree.
+
+    Returns: The verdict for the level, as classifyLevel().
+    """
+    if depth == hint.dataTextDepth:
+        data = findDataFolder(tree, rules)
+        if data is not None:
+            return LevelVerdict.DATA_TEXT, data
+    elif depth < hint.maxDepth and len(tree) == 1 and tree[0].isDir():
+        return LevelVerdict.DESCEND, tree[0]
+    elif depth >= hint.maxDepth:
+        return LevelVerdict.NONE, None
+
+    # The hint does not match the tree (or the level contains ignored entries):
+    return classifyLevel(tree, rules)
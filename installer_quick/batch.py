@@ -0,0 +1,341 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains a queue of archives to install without user interaction, and
+the rules used to choose the names of the mods in this case.
+"""
+
+import enum
+import os
+import re
+import time
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from .analysis import FileTree, walkTree
+from .listing import ArchiveEntry
+
+
+class InstallOutcome(enum.Enum):
+
+    """ Outcome of the installation of a single archive from a batch. """
+
+    # The archive has not been installed yet:
+    PENDING = enum.auto()
+
+    # The archive was installed:
+    INSTALLED = enum.auto()
+
+    # The archive cannot be installed by the simple installer and needs a manual
+    # installation:
+    MANUAL_REQUESTED = enum.auto()
+
+    # The archive was not installed since it was already installed (the existing mod
+    # is BatchItem.modName):
+    DUPLICATE = enum.auto()
+
+    # The archive was not installed since a mod with the same name exists (MO2 would
+    # ask to merge or replace it), the existing mod is BatchItem.modName:
+    EXISTS = enum.auto()
+
+    # The batch was stopped before the archive was installed:
+    CANCELED = enum.auto()
+
+    # The installation failed:
+    FAILED = enum.auto()
+
+
+class OtherInstaller(enum.Enum):
+
+    """ Installers with a higher priority than the simple installer that would claim
+    an archive (and show their own dialog), see findOtherInstaller(). """
+
+    # The archive contains a FOMOD installer (fomod/ModuleConfig.xml):
+    FOMOD = enum.auto()
+
+    # The archive contains a scripted installer (fomod/script.cs):
+    SCRIPTED = enum.auto()
+
+    # The archive only contains other archives:
+    BUNDLE = enum.auto()
+
+
+# Extensions (without the .) of the archives that MO2 can install - The bundle
+# installer claims the archives that only contain such archives:
+ARCHIVE_SUFFIXES = frozenset(["7z", "zip", "rar"])
+
+
+def findBatchArchives(folder: str) -> List[str]:
+    """ Find the archives that can be added to a batch queue in the given folder.
+
+    Args:
+        folder: The folder to look archives in (not recursive).
+
+    Returns: The paths to the archives, sorted by name.
+    """
+    try:
+        names = sorted(os.listdir(folder), key=str.casefold)
+    except OSError:
+        return []
+    return [
+        os.path.join(folder, name)
+        for name in names
+        if os.path.splitext(name)[1][1:].lower() in ARCHIVE_SUFFIXES
+        and os.path.isfile(os.path.join(folder, name))
+    ]
+
+
+def findOtherInstaller(entries: Iterable[ArchiveEntry]) -> Optional[OtherInstaller]:
+    """ Find the installer with a higher priority than the simple installer that
+    would claim an archive, from the entries of the archive.
+
+    Args:
+        entries: The entries of the archive.
+
+    Returns: The installer that would claim the archive, or None if the archive would
+        be handed to the simple installer.
+    """
+    files = archives = 0
+    for entry in entries:
+        if entry.isDir:
+            continue
+
+        folder, _, name = entry.path.casefold().rpartition("/")
+        if folder == "fomod" or folder.endswith("/fomod"):
+            if name == "moduleconfig.xml":
+                return OtherInstaller.FOMOD
+            if name == "script.cs":
+                return OtherInstaller.SCRIPTED
+
+        files += 1
+        if os.path.splitext(name)[1][1:] in ARCHIVE_SUFFIXES:
+            archives += 1
+
+    if files and files == archives:
+        return OtherInstaller.BUNDLE
+    return None
+
+
+def findTreeInstaller(tree: FileTree) -> Optional[OtherInstaller]:
+    """ Find the installer with a higher priority than the simple installer that
+    would claim an archive, from the tree of the archive (for the archives that
+    cannot be listed), see findOtherInstaller().
+
+    Args:
+        tree: The tree of the archive.
+
+    Returns: The installer that would claim the archive, or None if the archive would
+        be handed to the simple installer.
+    """
+    return findOtherInstaller(
+        ArchiveEntry(path, entry.isDir(), 0, None) for path, entry in walkTree(tree)
+    )
+
+
+class NameRules:
+
+    """ Table of rules used to find the name of a mod from the name of its archive.
+
+    Each rule is a pair (pattern, name) where the pattern is a regular expression
+    that is searched (case-insensitively) in the name of the archive and the name
+    can contain references to the groups of the pattern (e.g., "\\1"). The first
+    rule that matches is used.
+    """
+
+    _rules: List[Tuple[Pattern[str], str]]
+
+    def __init__(self, rules: Iterable[Tuple[str, str]] = ()):
+        self._rules = []
+        for pattern, name in rules:
+            self.add(pattern, name)
+
+    def add(self, pattern: str, name: str):
+        """ Add a rule at the end of this table.
+
+        Args:
+            pattern: The pattern to search in the name of the archive.
+            name: The name of the mod, possibly with references to groups of the
+                pattern.
+        """
+        self._rules.append((re.compile(pattern, re.IGNORECASE), name))
+
+    def resolve(self, archive: str) -> Optional[str]:
+        """ Find the name of the mod for the given archive.
+
+        Args:
+            archive: Path to the archive.
+
+        Returns: The name of the mod, or None if no rule matches the archive.
+        """
+        filename = os.path.basename(archive)
+        for pattern, name in self._rules:
+            match = pattern.search(filename)
+            if match:
+                return match.expand(name)
+        return None
+
+
+class BatchItem:
+
+    """ A single archive in a batch queue. """
+
+    # Path to the archive:
+    archive: str
+
+    # Name of the mod, or None to use the best name guessed by MO2:
+    name: Optional[str]
+
+    # Outcome of the installation and name of the installed mod:
+    outcome: InstallOutcome
+    modName: Optional[str]
+
+    # Time spent installing this archive (in seconds) and error message, if any:
+    elapsed: float
+    error: Optional[str]
+
+    # Warning for an archive that was installed but needs the attention of the user
+    # (e.g. the free space could not be checked), if any:
+    warning: Optional[str]
+
+    def __init__(self, archive: str, name: Optional[str] = None):
+        self.archive = archive
+        self.name = name
+        self.outcome = InstallOutcome.PENDING
+        self.modName = None
+        self.elapsed = 0.0
+        self.error = None
+        self.warning = None
+
+
+class BatchReport:
+
+    """ Report of the installation of a batch of archives. """
+
+    # The items of the batch and the total time spent (in seconds):
+    items: List[BatchItem]
+    elapsed: float
+
+    def __init__(self, items: List[BatchItem], elapsed: float):
+        self.items = items
+        self.elapsed = elapsed
+
+    def count(self, outcome: InstallOutcome) -> int:
+        """ Retrieve the number of items with the given outcome.
+
+        Args:
+            outcome: The outcome to count.
+
+        Returns: The number of items with the given outcome.
+        """
+        return sum(1 for item in self.items if item.outcome is outcome)
+
+    def counts(self) -> Dict[InstallOutcome, int]:
+        """ Returns: The number of items for each outcome. """
+        return {outcome: self.count(outcome) for outcome in InstallOutcome}
+
+    def throughput(self) -> float:
+        """ Returns: The number of processed archives per minute. """
+        processed = sum(
+            1
+            for item in self.items
+            if item.outcome not in (InstallOutcome.PENDING, InstallOutcome.CANCELED)
+        )
+        if self.elapsed <= 0:
+            return 0.0
+        return processed * 60 / self.elapsed
+
+
+class BatchInstallQueue:
+
+    """ Queue of archives to install without showing any dialog.
+
+    The queue does not install anything by itself, see SimpleInstaller.installBatch().
+    """
+
+    _items: List[BatchItem]
+    _rules: NameRules
+    _stopped: bool
+
+    def __init__(self, rules: Optional[NameRules] = None):
+        self._items = []
+        self._rules = rules if rules is not None else NameRules()
+        self._stopped = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, archive: str, name: Optional[str] = None) -> BatchItem:
+        """ Add an archive to install at the end of the queue.
+
+        Args:
+            archive: Path to the archive.
+            name: Name of the mod. If not specified, the name is taken from the rules
+                of this queue or, if no rule matches, from the best name guessed by MO2.
+
+        Returns: The item corresponding to the archive.
+        """
+        if name is None:
+            name = self._rules.resolve(archive)
+        item = BatchItem(archive, name)
+        self._items.append(item)
+        return item
+
+    def items(self) -> List[BatchItem]:
+        """ Returns: All the items of this queue. """
+        return list(self._items)
+
+    def pending(self) -> List[BatchItem]:
+        """ Returns: The items of this queue that have not been installed yet. """
+        return [item for item in self._items if item.outcome is InstallOutcome.PENDING]
+
+    def stop(self):
+        """ Stop the queue after the current installation. The remaining items are
+        marked as canceled. """
+        self._stopped = True
+
+    def run(
+        self,
+        install: Callable[[BatchItem], Any],
+        progress: Optional[Callable[[int, BatchItem], Any]] = None,
+    ) -> BatchReport:
+        """ Install all the pending items of this queue.
+
+        Args:
+            install: Function used to install a single item. It should return the
+                installed mod (or None if the installation failed) and can set the
+                outcome of the item itself (e.g., if a manual installation is needed).
+            progress: Function called before installing each item with the number of
+                items processed so far and the item. It can stop the queue (e.g., if
+                the user canceled the batch), in which case the item is canceled.
+
+        Returns: The report for the items installed by this run.
+        """
+        self._stopped = False
+        items = self.pending()
+
+        start = time.perf_counter()
+        for index, item in enumerate(items):
+            if progress is not None and not self._stopped:
+                progress(index, item)
+
+            if self._stopped:
+                item.outcome = InstallOutcome.CANCELED
+                continue
+
+            item_start = time.perf_counter()
+            try:
+                mod = install(item)
+            except Exception as e:
+                mod, item.error = None, str(e)
+
+            item.elapsed = time.perf_counter() - item_start
+
+            # The outcome is only set by the installer if it skipped the archive (e.g.
+            # if it needs a manual installation), otherwise we check the installed mod:
+            if mod is not None:
+                item.outcome = InstallOutcome.INSTALLED
+                item.modName = mod.name()
+            elif item.outcome in (InstallOutcome.PENDING, InstallOutcome.INSTALLED):
+                item.outcome = InstallOutcome.FAILED
+
+        return BatchReport(items, time.perf_counter() - start)
@@ -0,0 +1,305 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the tool (in the Tools menu of MO2) that installs a batch of
+archives from the downloads folder with the simple installer, see
+SimpleInstaller.installBatch().
+"""
+
+import os
+
+from typing import List, Optional, Tuple
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import (
+    QApplication,
+    QListWidgetItem,
+    QMessageBox,
+    QProgressDialog,
+    QWidget,
+)
+from PyQt5 import QtWidgets
+
+import mobase
+
+from .ui.batchinstalldialog import Ui_BatchInstallDialog
+from .batch import (
+    BatchInstallQueue,
+    BatchItem,
+    BatchReport,
+    InstallOutcome,
+    findBatchArchives,
+)
+from .installer import SimpleInstaller
+
+
+class BatchInstallDialog(QtWidgets.QDialog):
+
+    """
+    This is the dialog where the user chooses the archives to install from a batch.
+    The archives that the pre-scan found not installable by the simple installer are
+    not checked by default.
+
+    The layout of the dialog is not created here but in the `ui/batchinstalldialog.ui`
+    file, so you need Qt Designer to modify it.
+    """
+
+    def __init__(self, parent: QWidget, archives: List[Tuple[str, Optional[bool]]]):
+        super().__init__(parent)
+
+        self.ui = Ui_BatchInstallDialog()
+        self.ui.setupUi(self)
+
+        self.setWindowFlag(Qt.WindowContextHelpButtonHint, False)
+
+        self.ui.installBtn.clicked.connect(self.accept)
+        self.ui.cancelBtn.clicked.connect(self.reject)
+
+        # The path of the archive is stored in the item, only the name is shown:
+        for archive, quick in archives:
+            item = QListWidgetItem(os.path.basename(archive))
+            item.setData(Qt.UserRole, archive)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked if quick is False else Qt.Checked)
+            if quick is True:
+                item.setToolTip(self.__tr("This archive can be installed directly."))
+            elif quick is False:
+                item.setToolTip(self.__tr("This archive needs a manual installation."))
+            else:
+                item.setToolTip(
+                    self.__tr("This archive will be checked when it is installed.")
+                )
+            self.ui.archiveList.addItem(item)
+
+    def selectedArchives(self) -> List[str]:
+        """
+        Returns: The paths to the archives checked by the user.
+        """
+        archives = []
+        for i in range(self.ui.archiveList.count()):
+            item = self.ui.archiveList.item(i)
+            if item.checkState() == Qt.Checked:
+                archives.append(item.data(Qt.UserRole))
+        return archives
+
+    def __tr(self, str):
+        return QApplication.translate("BatchInstallDialog", str)
+
+
+class BatchInstallTool(mobase.IPluginTool):
+
+    """
+    This tool installs the archives chosen by the user in the downloads folder one
+    after the other, without showing the installation dialog, and shows a report at
+    the end. The installation itself is done by the simple installer, so this tool
+    has no settings of its own.
+    """
+
+    _organizer: mobase.IOrganizer
+    _installer: SimpleInstaller
+    _parent: QWidget
+
+    def __init__(self, installer: SimpleInstaller):
+        super().__init__()
+        self._installer = installer
+
+    def init(self, organizer: mobase.IOrganizer):
+        self._organizer = organizer
+        return True
+
+    def name(self):
+        return "Batch Installer (Python)"
+
+    def author(self):
+        return "Holt59"
+
+    def description(self):
+        return self.__tr(
+            "Install archives from the downloads folder without user interaction."
+        )
+
+    def version(self):
+        return mobase.VersionInfo(0, 1, 0, mobase.ReleaseType.PRE_ALPHA)
+
+    def master(self):
+        # The tool has no settings, it uses the ones of the installer:
+        return self._installer.name()
+
+    def isActive(self):
+        return self._installer.isActive()
+
+    def settings(self):
+        return []
+
+    def displayName(self):
+        return self.__tr("Batch Install (Python)")
+
+    def tooltip(self):
+        return self.__tr("Install archives from the downloads folder")
+
+    def icon(self):
+        return QIcon()
+
+    def setParentWidget(self, widget: QWidget):
+        self._parent = widget
+
+    def display(self):
+        archives = findBatchArchives(self._organizer.downloadsPath())
+        if not archives:
+            QMessageBox.information(
+                self._parent,
+                self.__tr("Batch Install"),
+                self.__tr("There are no archives in the downloads folder."),
+            )
+            return
+
+        # The verdicts of the pre-scan are shown in the dialog, so the archives that
+        # were not scanned yet (e.g. if the pre-scan is disabled) are scanned now:
+        self._waitForScan(archives)
+        dialog = BatchInstallDialog(
+            self._parent,
+            [
+                (archive, self._installer.isQuickInstallable(archive))
+                for archive in archives
+            ],
+        )
+        if not dialog.exec():
+            return
+
+        queue = BatchInstallQueue()
+        for archive in dialog.selectedArchives():
+            queue.add(archive)
+
+        if len(queue):
+            self._showReport(self._installBatch(queue))
+
+    def _waitForScan(self, archives: List[str]):
+        """ Scan the given archives in the background, showing a progress dialog
+        until the scan is finished. The user can skip the scan, in which case the
+        archives that were not scanned yet are checked when they are installed.
+
+        Args:
+            archives: Paths to the archives to scan.
+        """
+        thread = self._installer.scanArchives(archives)
+
+        # The dialog has no maximum, so it only shows that the scan is running:
+        progress = QProgressDialog(
+            self.__tr("Scanning the archives..."),
+            self.__tr("Skip"),
+            0,
+            0,
+            self._parent,
+        )
+        progress.setWindowTitle(self.__tr("Batch Install"))
+        progress.setWindowModality(Qt.WindowModal)
+
+        # The thread cannot notify the user interface, so we check it regularly:
+        def check():
+            if not thread.is_alive():
+                progress.reset()
+
+        timer = QTimer(progress)
+        timer.timeout.connect(check)
+        timer.start(50)
+
+        if thread.is_alive():
+            progress.exec()
+        timer.stop()
+        progress.deleteLater()
+
+    def _installBatch(self, queue: BatchInstallQueue) -> BatchReport:
+        """ Install the given queue, showing the progress of the installation. The
+        user can cancel the remaining installations.
+
+        Args:
+            queue: The queue to install.
+
+        Returns: The report of the installation.
+        """
+        progress = QProgressDialog(
+            self.__tr("Installing..."), self.__tr("Cancel"), 0, len(queue), self._parent
+        )
+        progress.setWindowTitle(self.__tr("Batch Install"))
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.canceled.connect(queue.stop)
+
+        def update(index: int, item: BatchItem):
+            progress.setLabelText(
+                self.__tr("Installing {}...").format(os.path.basename(item.archive))
+            )
+
+            # With a modal dialog, this also processes the events (e.g. a click on the
+            # cancel button):
+            progress.setValue(index)
+
+        try:
+            return self._installer.installBatch(queue, update)
+        finally:
+            progress.close()
+            progress.deleteLater()
+
+    def _showReport(self, report: BatchReport):
+        """ Show the report of a batch to the user.
+
+        Args:
+            report: The report to show.
+        """
+        counts = report.counts()
+        box = QMessageBox(self._parent)
+        box.setWindowTitle(self.__tr("Batch Install"))
+        box.setText(
+            self.__tr(
+                "{} archive(s) installed, {} skipped and {} failed "
+                "({:.1f} archives/min)."
+            ).format(
+                counts[InstallOutcome.INSTALLED],
+                counts[InstallOutcome.MANUAL_REQUESTED]
+                + counts[InstallOutcome.DUPLICATE]
+                + counts[InstallOutcome.EXISTS]
+                + counts[InstallOutcome.CANCELED],
+                counts[InstallOutcome.FAILED],
+                report.throughput(),
+            )
+        )
+
+        # The details list the archives that need the attention of the user:
+        details = []
+        for item in report.items:
+            name = os.path.basename(item.archive)
+            if item.outcome is InstallOutcome.MANUAL_REQUESTED:
+                reason = item.error or self.__tr("not supported by this installer")
+                details.append(
+                    self.__tr("{}: manual installation required ({})").format(
+                        name, reason
+                    )
+                )
+            elif item.outcome is InstallOutcome.DUPLICATE:
+                details.append(
+                    self.__tr("{}: already installed as '{}'").format(
+                        name, item.modName
+                    )
+                )
+            elif item.outcome is InstallOutcome.EXISTS:
+                details.append(
+                    self.__tr("{}: the mod '{}' already exists").format(
+                        name, item.modName
+                    )
+                )
+            elif item.outcome is InstallOutcome.FAILED:
+                details.append(
+                    self.__tr("{}: installation failed ({})").format(name, item.error)
+                )
+            elif item.error:
+                details.append("{}: {}".format(name, item.error))
+            if item.outcome is InstallOutcome.INSTALLED and item.warning:
+                details.append("{}: {}".format(name, item.warning))
+
+        if details:
+            box.setDetailedText("\n".join(details))
+        box.exec()
+
+    def __tr(self, str):
+        return QApplication.translate("BatchInstallTool", str)
@@ -0,0 +1,172 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains a persistent cache of the verdicts of the installer, so that
+archives that are installed again (e.g. when rebuilding an instance) do not need to
+be analyzed again.
+
+Archives are identified by their size, their modification time and a hash of their
+first and last bytes, so renamed or moved archives are still found in the cache.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+from typing import NamedTuple, Optional, Tuple
+
+from .analysis import LayoutKind
+from .store import SQLiteStore
+
+# Number of bytes hashed at the start and at the end of the archives:
+PARTIAL_HASH_SIZE = 64 * 1024
+
+# Identity of an archive: (size, modification time in ns, partial hash):
+ArchiveIdentity = Tuple[int, int, bytes]
+
+
+def archiveIdentity(archive: str) -> ArchiveIdentity:
+    """ Compute the identity of the given archive.
+
+    Args:
+        archive: Path to the archive.
+
+    Returns: The identity of the archive.
+    """
+    stat = os.stat(archive)
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(archive, "rb") as fp:
+        digest.update(fp.read(PARTIAL_HASH_SIZE))
+        if stat.st_size > 2 * PARTIAL_HASH_SIZE:
+            fp.seek(-PARTIAL_HASH_SIZE, os.SEEK_END)
+            digest.update(fp.read(PARTIAL_HASH_SIZE))
+
+    return stat.st_size, stat.st_mtime_ns, digest.digest()
+
+
+class CachedVerdict(NamedTuple):
+
+    """ A verdict of the installer for an archive. """
+
+    # Path to the base of the archive (using "/" as separator, empty for the root),
+    # and its depth in the archive:
+    base: str
+    depth: int
+
+    # Kind of layout of the archive:
+    kind: LayoutKind
+
+    # Name of the mod chosen when the archive was installed:
+    modName: Optional[str]
+
+
+class VerdictCache(SQLiteStore):
+
+    """ Persistent cache of verdicts, stored in a SQLite database.
+
+    The cache contains at most a given number of verdicts, and the least recently
+    used ones are evicted first. The cache is cleared when opened with a different
+    version (e.g. when the rules of the installer change).
+    """
+
+    _version: str
+    _maxEntries: int
+
+    def __init__(self, path: str, version: str, maxEntries: int = 5000):
+        """
+        Args:
+            path: Path to the database. The database is only opened when first used.
+            version: Version of the verdicts.
+            maxEntries: Maximum number of verdicts in the cache.
+        """
+        super().__init__(path)
+        self._version = version
+        self._maxEntries = maxEntries
+
+    def _createTables(self, connection: sqlite3.Connection):
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS verdicts (
+                size INTEGER, mtime INTEGER, hash BLOB,
+                base TEXT, depth INTEGER, kind TEXT, name TEXT,
+                used REAL,
+                PRIMARY KEY (size, mtime, hash)
+            )"""
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS verdicts_used ON verdicts (used)"
+        )
+
+        # Verdicts computed with other rules are discarded:
+        row = connection.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        if row is None or row[0] != self._version:
+            connection.execute("DELETE FROM verdicts")
+            connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                (self._version,),
+            )
+
+    def get(self, identity: ArchiveIdentity) -> Optional[CachedVerdict]:
+        """ Retrieve the verdict for an archive.
+
+        Args:
+            identity: Identity of the archive.
+
+        Returns: The verdict for the archive, or None if the archive is not in the
+            cache.
+        """
+        with self._lock:
+            connection = self._open()
+            with connection:
+                row = connection.execute(
+                    "SELECT base, depth, kind, name FROM verdicts "
+                    "WHERE size = ? AND mtime = ? AND hash = ?",
+                    identity,
+                ).fetchone()
+                if row is None:
+                    return None
+                connection.execute(
+                    "UPDATE verdicts SET used = ? "
+                    "WHERE size = ? AND mtime = ? AND hash = ?",
+                    (time.time(), *identity),
+                )
+
+        base, depth, kind, name = row
+        if kind not in LayoutKind.__members__:
+            return None
+        return CachedVerdict(base, depth, LayoutKind[kind], name)
+
+    def put(self, identity: ArchiveIdentity, verdict: CachedVerdict):
+        """ Add (or replace) the verdict for an archive.
+
+        Args:
+            identity: Identity of the archive.
+            verdict: The verdict for the archive.
+        """
+        with self._lock:
+            connection = self._open()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        *identity,
+                        verdict.base,
+                        verdict.depth,
+                        verdict.kind.name,
+                        verdict.modName,
+                        time.time(),
+                    ),
+                )
+
+                # Evict the least recently used verdicts:
+                connection.execute(
+                    "DELETE FROM verdicts WHERE rowid IN ("
+                    "SELECT rowid FROM verdicts ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                    (self._maxEntries,),
+                )
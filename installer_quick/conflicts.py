@@ -0,0 +1,187 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains an index of the files of the installed mods, used to show the
+conflicts of an archive (i.e., the files of the archive that would overwrite files from
+other mods) before installing it.
+
+The index is built once, in the background, and then updated mod by mod.
+"""
+
+import threading
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .analysis import ArchiveAnalysis, FileTree, LayoutKind, walkTree
+from .folders import MOD_META_FILES, iterFolderFiles
+
+
+def listModFiles(path: str) -> List[str]:
+    """ List the files of a mod.
+
+    Args:
+        path: Path to the folder of the mod.
+
+    Returns: The casefolded paths of the files of the mod, relative to its folder and
+        using "/" as separator.
+    """
+    return [name.casefold() for name, _ in iterFolderFiles(path, MOD_META_FILES)]
+
+
+def iterTreeFiles(tree: FileTree, prefix: str = "") -> Iterator[str]:
+    """ Iterate the files of the given tree.
+
+    Args:
+        tree: The tree to iterate.
+        prefix: Prefix to add to the paths.
+
+    Yields: The casefolded paths of the files in the tree, relative to the tree and
+        using "/" as separator.
+    """
+    for path, entry in walkTree(tree, prefix):
+        if not entry.isDir():
+            yield path.casefold()
+
+
+def iterInstalledFiles(analysis: ArchiveAnalysis) -> Iterator[str]:
+    """ Iterate the files that would be installed for the given analysis, i.e., the
+    files of the data folder and the text files next to it for data-text archives.
+
+    Args:
+        analysis: The analysis of the archive tree.
+
+    Yields: The casefolded paths of the files, relative to the mod folder.
+    """
+    for path, _ in iterInstalledEntries(analysis):
+        yield path.casefold()
+
+
+def iterInstalledEntries(analysis: ArchiveAnalysis) -> Iterator[Tuple[str, FileTree]]:
+    """ Iterate the file entries that would be installed for the given analysis, see
+    iterInstalledFiles().
+
+    Args:
+        analysis: The analysis of the archive tree.
+
+    Yields: The paths of the files, relative to the mod folder and using "/" as
+        separator, with their entry in the archive tree.
+    """
+    for path, entry in walkTree(
+        analysis.base if analysis.data is None else analysis.data
+    ):
+        if not entry.isDir():
+            yield path, entry
+    if analysis.kind == LayoutKind.DATA_TEXT:
+        for entry in analysis.base:
+            if not entry.isDir():
+                yield entry.name(), entry
+
+
+class ConflictReport(NamedTuple):
+
+    """ Conflicts of an archive with the installed mods. """
+
+    # Number of files of the archive that exist in at least one installed mod:
+    count: int
+
+    # Installed mods with conflicting files, and their number of conflicting files,
+    # sorted by decreasing number of files:
+    mods: List[Tuple[str, int]]
+
+
+class ModPathIndex:
+
+    """ Thread-safe index of the files of the installed mods, by casefolded path. """
+
+    _lock: threading.Lock
+
+    # Mods containing each path, and paths of each mod:
+    _owners: Dict[str, List[str]]
+    _paths: Dict[str, List[str]]
+
+    # True when the index was built:
+    _ready: bool
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._owners = {}
+        self._paths = {}
+        self._ready = False
+
+    def isReady(self) -> bool:
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def setMod(self, mod: str, paths: Iterable[str]):
+        """ Add a mod to the index, or update its files.
+
+        Args:
+            mod: Name of the mod.
+            paths: The casefolded paths of the files of the mod.
+        """
+        paths = list(paths)
+        with self._lock:
+            self._removeMod(mod)
+            for path in paths:
+                self._owners.setdefault(path, []).append(mod)
+            self._paths[mod] = paths
+
+    def removeMod(self, mod: str):
+        """ Remove a mod from the index.
+
+        Args:
+            mod: Name of the mod.
+        """
+        with self._lock:
+            self._removeMod(mod)
+
+    def _removeMod(self, mod: str):
+        for path in self._paths.pop(mod, ()):
+            owners = self._owners[path]
+            owners.remove(mod)
+            if not owners:
+                del self._owners[path]
+
+    def conflicts(
+        self, paths: Iterable[str], exclude: Optional[str] = None
+    ) -> ConflictReport:
+        """ Find the conflicts of the given files with the installed mods.
+
+        Args:
+            paths: The casefolded paths of the files.
+            exclude: Name of a mod to ignore (e.g. the mod being reinstalled).
+
+        Returns: The conflicts of the files.
+        """
+        count = 0
+        mods: Counter = Counter()
+        with self._lock:
+            for path in paths:
+                owners = self._owners.get(path)
+                if not owners:
+                    continue
+                owners = [mod for mod in owners if mod != exclude]
+                if owners:
+                    count += 1
+                    mods.update(owners)
+        return ConflictReport(count, mods.most_common())
+
+    def build(self, mods: Iterable[Tuple[str, str]], max_workers: int = 8):
+        """ Index the given mods. The folders are listed in a thread pool since this
+        is mostly I/O.
+
+        Args:
+            mods: The mods to index, as (name, path) pairs.
+            max_workers: Number of threads to use.
+        """
+        mods = list(mods)
+        with ThreadPoolExecutor(max_workers) as executor:
+            for (name, _), paths in zip(
+                mods, executor.map(listModFiles, (path for _, path in mods))
+            ):
+                self.setMod(name, paths)
+        self._ready = True
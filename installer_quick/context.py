@@ -0,0 +1,123 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains a snapshot of the values the installer reads from MO2 on its hot
+paths (the name of the data folder, the mod-data-checker and the settings of the
+installer).
+
+MO2 calls isActive() and priority() of every installer for every archive, and each
+access to the organizer goes through the Python bindings, so these values are read
+once and kept until a setting changes or the managed game changes.
+"""
+
+import threading
+
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+
+class GameContext(NamedTuple):
+
+    """ Snapshot of the values read from MO2. """
+
+    # Name of the data folder of the game (e.g. "data"):
+    dataName: str
+
+    # Mod-data-checker of the game, or None if the game does not have one:
+    checker: Optional[Any]
+
+    # Values of the settings of the installer, by key (e.g. "priority"):
+    settings: Dict[str, Any]
+
+
+# Number of calls through the bindings needed to read each value of the context from
+# MO2, e.g., managedGame().dataDirectory().dirName() for the name of the data folder
+# (reading a setting takes a single call to pluginSetting()):
+CONTEXT_CALLS: Dict[str, int] = {
+    "dataName": 3,
+    "checker": 2,
+}
+
+
+class GameContextCache:
+
+    """ Cache of the GameContext, with counters of the calls it saved. """
+
+    _load: Callable[[], Optional[GameContext]]
+
+    _lock: threading.Lock
+    _context: Optional[GameContext]
+
+    # Number of times the context was loaded, number of reads of values of the
+    # context and number of calls through the bindings saved by the cache:
+    loads: int
+    reads: int
+    savedCalls: int
+
+    def __init__(self, load: Callable[[], Optional[GameContext]]):
+        """
+        Args:
+            load: Function reading the context from MO2. It can return None if the
+                context is not available yet (e.g. the managed game is not known),
+                in which case it is called again on the next read.
+        """
+        self._load = load
+
+        self._lock = threading.Lock()
+        self._context = None
+
+        self.loads = 0
+        self.reads = 0
+        self.savedCalls = 0
+
+    def _read(self, calls: int) -> Optional[GameContext]:
+        """ Retrieve the context for a read, loading it if needed.
+
+        Args:
+            calls: Number of calls through the bindings saved by the read if the
+                context is already loaded.
+
+        Returns: The context, or None if the context is not available.
+        """
+        with self._lock:
+            context = self._context
+            if context is None:
+                context = self._context = self._load()
+                if context is None:
+                    return None
+                self.loads += 1
+            else:
+                self.savedCalls += calls
+            self.reads += 1
+        return context
+
+    def get(self, name: str) -> Any:
+        """ Read a value of the context, loading the context if needed.
+
+        Args:
+            name: Name of the value (a field of GameContext, except settings).
+
+        Returns: The value, or None if the context is not available.
+        """
+        context = self._read(CONTEXT_CALLS[name])
+        return None if context is None else getattr(context, name)
+
+    def setting(self, key: str) -> Any:
+        """ Read a setting of the installer, loading the context if needed.
+
+        Args:
+            key: Key of the setting.
+
+        Returns: The value of the setting, or None if the context is not available.
+        """
+        context = self._read(1)
+        return None if context is None else context.settings.get(key)
+
+    def invalidate(self):
+        """ Drop the context, e.g., when a setting changes. The context is loaded
+        again on the next read. """
+        with self._lock:
+            self._context = None
+
+    def counters(self) -> Dict[str, int]:
+        """ Retrieve the counters of the cache, e.g., for the telemetry. """
+        return {"loads": self.loads, "reads": self.reads, "savedCalls": self.savedCalls}
@@ -0,0 +1,359 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the deduplication of the files of the installed mods: identical
+files in different mods are replaced by hardlinks to a single file.
+
+The files of the mods are stored in a persistent index with their size, modification
+time and hash. Files are grouped by size first, and only files whose size matches the
+size of a file from another mod are hashed, so most files are never hashed. The hashes
+are stored in the index so each file is hashed at most once (unless modified).
+
+Hardlinked files share their content: modifying a deduplicated file in a mod folder
+modifies it in all the mods containing it.
+"""
+
+import os
+import sqlite3
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .folders import MOD_META_FILES, iterFolderFiles
+from .hashing import hashArchive, shutdownExecutor
+from .store import SQLiteStore
+
+# Files smaller than this are not deduplicated since hardlinking them would reclaim
+# (almost) nothing:
+MIN_DEDUP_SIZE = 1 << 12
+
+
+class FileInfo(NamedTuple):
+
+    """ A file of a mod, as stored in the index. """
+
+    path: str
+    size: int
+    mtime: int
+
+    # Hash of the file, or None if it was never hashed:
+    hash: Optional[str]
+
+
+class DedupReport(NamedTuple):
+
+    """ Report of the deduplication of a mod. """
+
+    # Number of files of the mod considered for deduplication:
+    files: int
+
+    # Number of files hashed (from the mod and from other mods):
+    hashedFiles: int
+
+    # Number of files replaced by hardlinks and size of these files:
+    linkedFiles: int
+    reclaimedBytes: int
+
+
+def listFiles(folder: str, min_size: int = MIN_DEDUP_SIZE) -> List[FileInfo]:
+    """ List the files of a mod folder, without hashing them.
+
+    Args:
+        folder: Path to the folder of the mod.
+        min_size: Minimum size of the files to list.
+
+    Returns: The files of the mod, with absolute paths.
+    """
+    files = []
+    for _, entry in iterFolderFiles(folder, MOD_META_FILES):
+        try:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            stat = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        if stat.st_size >= min_size:
+            files.append(FileInfo(entry.path, stat.st_size, stat.st_mtime_ns, None))
+    return files
+
+
+class FileIndex(SQLiteStore):
+
+    """ Persistent index of the files of the mods, in a SQLite database. """
+
+    def _createTables(self, connection: sqlite3.Connection):
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, mod TEXT, size INTEGER, mtime INTEGER,
+                hash TEXT
+            )"""
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS files_size ON files (size, hash)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS files_mod ON files (mod)")
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def isEmpty(self) -> bool:
+        with self._lock:
+            row = self._open().execute("SELECT 1 FROM files LIMIT 1").fetchone()
+        return row is None
+
+    def filesWithSizes(
+        self, sizes: Iterable[int], exclude: str
+    ) -> Dict[int, List[FileInfo]]:
+        """ Retrieve the files with the given sizes.
+
+        Args:
+            sizes: The sizes of the files.
+            exclude: Name of a mod whose files should not be returned.
+
+        Returns: The files with each size, by size.
+        """
+        files: Dict[int, List[FileInfo]] = {}
+        with self._lock:
+            connection = self._open()
+            for size in set(sizes):
+                for path, mtime, hash in connection.execute(
+                    "SELECT path, mtime, hash FROM files WHERE size = ? AND mod != ?",
+                    (size, exclude),
+                ):
+                    files.setdefault(size, []).append(FileInfo(path, size, mtime, hash))
+        return files
+
+    def setMod(self, mod: str, files: Iterable[FileInfo]):
+        """ Set the files of a mod, replacing the previous ones.
+
+        Args:
+            mod: Name of the mod.
+            files: The files of the mod.
+        """
+        with self._lock:
+            connection = self._open()
+            with connection:
+                connection.execute("DELETE FROM files WHERE mod = ?", (mod,))
+                connection.executemany(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                    (
+                        (self._key(f.path), mod, f.size, f.mtime, f.hash)
+                        for f in files
+                    ),
+                )
+
+    def updateFiles(self, files: Iterable[FileInfo]):
+        """ Update the size, modification time and hash of indexed files.
+
+        Args:
+            files: The files to update.
+        """
+        with self._lock:
+            connection = self._open()
+            with connection:
+                connection.executemany(
+                    "UPDATE files SET size = ?, mtime = ?, hash = ? WHERE path = ?",
+                    ((f.size, f.mtime, f.hash, self._key(f.path)) for f in files),
+                )
+
+    def removeFiles(self, paths: Iterable[str]):
+        """ Remove files from the index.
+
+        Args:
+            paths: Paths to the files to remove.
+        """
+        with self._lock:
+            connection = self._open()
+            with connection:
+                connection.executemany(
+                    "DELETE FROM files WHERE path = ?",
+                    ((self._key(path),) for path in paths),
+                )
+
+
+def _isUnchanged(info: FileInfo) -> bool:
+    """ Check if a file still has the size and modification time stored in the
+    index. """
+    try:
+        stat = os.stat(info.path)
+    except OSError:
+        return False
+    return stat.st_size == info.size and stat.st_mtime_ns == info.mtime
+
+
+def _hashFile(info: FileInfo, stop: Optional[threading.Event]) -> Optional[str]:
+    try:
+        return hashArchive(info.path, stop=stop)
+    except OSError:
+        return None
+
+
+def _link(source: str, target: str) -> bool:
+    """ Replace the target file by a hardlink to the source file.
+
+    Returns: True if the file was replaced, False otherwise (e.g. if the files are
+        not on the same volume).
+    """
+    # The link is created next to the target and then moved so that the target is
+    # never lost if the link cannot be created:
+    temporary = target + ".installer_quick-link"
+    try:
+        os.link(source, temporary)
+    except OSError:
+        return False
+    try:
+        os.replace(temporary, target)
+    except OSError:
+        os.remove(temporary)
+        return False
+    return True
+
+
+def deduplicateMod(
+    index: FileIndex,
+    mod: str,
+    folder: str,
+    max_workers: int = 4,
+    stop: Optional[threading.Event] = None,
+) -> DedupReport:
+    """ Replace the files of a mod that are identical to files of other mods by
+    hardlinks, and update the index with the files of the mod.
+
+    Args:
+        index: The index of the files of the mods.
+        mod: Name of the mod.
+        folder: Path to the folder of the mod.
+        max_workers: Number of threads used to hash the files.
+        stop: Event used to interrupt the deduplication, if any. The files that are
+            not hashed yet are then indexed without hash, and no file is linked.
+
+    Returns: The report of the deduplication.
+    """
+    files = listFiles(folder)
+
+    # Files from other mods with the same size as files of the mod - The files that
+    # were modified or removed since they were indexed are dropped:
+    candidates = index.filesWithSizes((f.size for f in files), mod)
+    stale = []
+    for size in list(candidates):
+        valid = []
+        for info in candidates[size]:
+            (valid if _isUnchanged(info) else stale).append(info)
+        if valid:
+            candidates[size] = valid
+        else:
+            del candidates[size]
+    if stale:
+        index.removeFiles(f.path for f in stale)
+
+    # Only the files with the same size as another file need to be hashed:
+    to_hash = [f for f in files if f.size in candidates] + [
+        info for infos in candidates.values() for info in infos if info.hash is None
+    ]
+    with ThreadPoolExecutor(max_workers) as executor:
+        hashes = dict(
+            zip(to_hash, executor.map(lambda f: _hashFile(f, stop), to_hash))
+        )
+
+    # The hashes of the files of other mods are stored for the next installations:
+    index.updateFiles(
+        info._replace(hash=hashes[info])
+        for infos in candidates.values()
+        for info in infos
+        if info.hash is None and hashes.get(info) is not None
+    )
+
+    sources: Dict[Tuple[int, str], FileInfo] = {}
+    for infos in candidates.values():
+        for info in infos:
+            hash = info.hash if info.hash is not None else hashes.get(info)
+            if hash is not None:
+                sources.setdefault((info.size, hash), info)
+
+    linked = 0
+    reclaimed = 0
+    indexed = []
+    for info in files:
+        hash = hashes.get(info)
+        info = info._replace(hash=hash)
+        source = sources.get((info.size, hash)) if hash is not None else None
+        if source is not None and not (stop is not None and stop.is_set()):
+            try:
+                same = os.path.samefile(source.path, info.path)
+            except OSError:
+                same = True
+            if not same and _link(source.path, info.path):
+                linked += 1
+                reclaimed += info.size
+
+                # The hardlink has the modification time of the source:
+                info = info._replace(mtime=source.mtime)
+        indexed.append(info)
+
+    index.setMod(mod, indexed)
+
+    return DedupReport(len(files), len(hashes), linked, reclaimed)
+
+
+class Deduplicator:
+
+    """ Deduplicate mods in a background thread, one mod at a time. """
+
+    _index: FileIndex
+    _executor: ThreadPoolExecutor
+
+    # Futures of the submitted mods that were not deduplicated yet:
+    _futures: List["Future[DedupReport]"]
+
+    # Set when the deduplicator is shut down, to interrupt the running pass:
+    _stop: threading.Event
+
+    def __init__(self, index: FileIndex):
+        """
+        Args:
+            index: The index of the files of the mods.
+        """
+        self._index = index
+
+        # A single worker is used so that two mods are never deduplicated at the same
+        # time (each pass hashes files in its own thread pool):
+        self._executor = ThreadPoolExecutor(
+            1, thread_name_prefix="installer_quick-dedup"
+        )
+        self._futures = []
+        self._stop = threading.Event()
+
+    def submit(
+        self, mod: str, folder: str, others: Optional[List[Tuple[str, str]]] = None
+    ) -> "Future[DedupReport]":
+        """ Deduplicate the given mod in the background.
+
+        Args:
+            mod: Name of the mod.
+            folder: Path to the folder of the mod.
+            others: Other mods to add to the index first if the index is empty, as
+                (name, path) pairs. These mods are only listed, not hashed.
+
+        Returns: A future containing the report of the deduplication.
+        """
+        future = self._executor.submit(self._deduplicate, mod, folder, others)
+        self._futures = [f for f in self._futures if not f.done()] + [future]
+        return future
+
+    def _deduplicate(
+        self, mod: str, folder: str, others: Optional[List[Tuple[str, str]]]
+    ) -> DedupReport:
+        if others and self._index.isEmpty():
+            for name, path in others:
+                if name != mod and not self._stop.is_set():
+                    self._index.setMod(name, listFiles(path))
+        return deduplicateMod(self._index, mod, folder, stop=self._stop)
+
+    def shutdown(self):
+        """ Shut this deduplicator down: the pending mods are not deduplicated and the
+        running pass is interrupted, so that the worker does not delay the exit of
+        MO2. """
+        self._stop.set()
+        shutdownExecutor(self._executor, self._futures)
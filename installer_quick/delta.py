@@ -0,0 +1,210 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the delta installation of mods: when a new version of an
+installed mod is installed, the files that did not change (same size and CRC32 as in
+the archive directory) are not extracted again, and the files installed by the
+previous version that are not in the new version are deleted.
+
+MO2 extracts the tree returned by the installer in the mod folder, after asking the
+user to merge or replace the existing mod. Since the installer cannot know what the
+user will choose, the unchanged files are checked after the installation:
+
+- When the user chose to merge, the unchanged files are still in the folder, so
+  their extraction is skipped, and the files of the previous version that are not in
+  the new version are deleted.
+- When the user chose to replace, MO2 deleted the folder, so the unchanged files are
+  extracted from the archive after the installation and nothing is saved.
+
+The files added to the mod folder by the user (or by tools) are never deleted: only
+the files installed by the previous version of the mod are (see
+journal.InstallJournal.installedFiles()).
+"""
+
+import os
+import zlib
+
+from typing import AbstractSet, Dict, List, NamedTuple, Optional, Tuple
+
+from .folders import MOD_META_FILES, iterFolderFiles
+from .listing import ArchiveEntry, ArchiveExtractor
+
+
+def crc32File(path: str, chunk_size: int = 1 << 20) -> int:
+    """ Compute the CRC32 of a file.
+
+    Args:
+        path: Path to the file.
+        chunk_size: Size of the chunks to read.
+
+    Returns: The CRC32 of the file.
+    """
+    crc = 0
+    with open(path, "rb") as fp:
+        while True:
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+class DeltaPlan(NamedTuple):
+
+    """ Plan of a delta installation. """
+
+    # Path to the archive and to the folder of the mod being upgraded:
+    archive: str
+    folder: str
+
+    # Files of the archive that are already installed, by path in the mod folder
+    # (using "/" as separator), with their entry in the archive:
+    unchanged: Dict[str, ArchiveEntry]
+
+    # Files installed by the previous version that are not in the new version, by
+    # path in the mod folder (using "/" as separator):
+    removed: List[str]
+
+    @property
+    def avoidedBytes(self) -> int:
+        """ Total size of the files that do not need to be extracted. """
+        return sum(entry.size for entry in self.unchanged.values())
+
+
+class DeltaReport(NamedTuple):
+
+    """ Report of a delta installation. """
+
+    # Number and total size of the files that were not extracted:
+    unchangedFiles: int
+    avoidedBytes: int
+
+    # Number of installed files deleted since they are not in the new version (only
+    # when the mod was merged):
+    removedFiles: int
+
+    # Number of unchanged files that had to be extracted after the installation (e.g.
+    # if the user chose to replace the mod):
+    restoredFiles: int
+
+    # True if the mod was replaced, False if the user chose to merge it with the
+    # installed one:
+    replaced: bool
+
+
+def _listFolder(folder: str) -> List[Tuple[str, str]]:
+    """ List the files of a mod folder, as (relative path, absolute path) pairs,
+    the relative path using "/" as separator. """
+    return [
+        (name, entry.path)
+        for name, entry in iterFolderFiles(folder, MOD_META_FILES, ignore_errors=False)
+    ]
+
+
+def planDelta(
+    archive: str,
+    folder: str,
+    files: Dict[str, Tuple[str, ArchiveEntry]],
+    previous: Optional[AbstractSet[str]] = None,
+) -> Optional[DeltaPlan]:
+    """ Compare the files of an archive with the files of an installed mod.
+
+    Args:
+        archive: Path to the archive.
+        folder: Path to the folder of the installed mod.
+        files: The files that would be installed, by casefolded path in the mod folder,
+            with their path in the mod folder (using "/" as separator) and their entry
+            in the archive.
+        previous: The casefolded paths of the files installed by the previous version
+            of the mod, or None if not known. Only these files can be removed.
+
+    Returns: The plan of the delta installation, or None if the archive cannot be
+        compared with the mod (e.g. if the CRC of the entries is not known).
+    """
+    unchanged: Dict[str, ArchiveEntry] = {}
+    removed: List[str] = []
+
+    try:
+        installed = _listFolder(folder)
+    except OSError:
+        return None
+
+    for relpath, path in installed:
+        target = files.get(relpath.casefold())
+
+        # Installed files that are not in the archive are removed, unless they were
+        # not installed by the previous version (e.g. files created by the user):
+        if target is None:
+            if previous is not None and relpath.casefold() in previous:
+                removed.append(relpath)
+            continue
+
+        install_path, entry = target
+        if entry.crc is None:
+            return None
+
+        # The CRC is only computed if the size matches:
+        try:
+            if os.path.getsize(path) == entry.size and crc32File(path) == entry.crc:
+                unchanged[install_path] = entry
+        except OSError:
+            return None
+
+    return DeltaPlan(archive, folder, unchanged, removed)
+
+
+def finishDelta(
+    plan: DeltaPlan, folder: str, extractor: ArchiveExtractor
+) -> DeltaReport:
+    """ Finish a delta installation, after MO2 extracted the changed files.
+
+    The extraction of the unchanged files is only skipped if the user chose to merge
+    the mods: the unchanged files that are missing in the given folder (all of them if
+    the mod was replaced) are extracted from the archive. The removed files are deleted
+    if the mod was merged in the folder of the plan (when the mod is replaced, MO2
+    already deleted them).
+
+    Args:
+        plan: The plan of the delta installation.
+        folder: The folder where the mod was installed.
+        extractor: The extractor to use to extract the missing files.
+
+    Returns: The report of the delta installation.
+    """
+    missing: Dict[str, str] = {}
+    missing_bytes = 0
+    for install_path, entry in plan.unchanged.items():
+        path = os.path.join(folder, *install_path.split("/"))
+        try:
+            if os.path.getsize(path) == entry.size:
+                continue
+        except OSError:
+            pass
+        missing[entry.path] = path
+        missing_bytes += entry.size
+
+    if missing:
+        extractor(plan.archive, missing)
+
+    # MO2 deletes the existing files when the mod is replaced, so all the unchanged
+    # files are missing in this case:
+    replaced = len(missing) == len(plan.unchanged)
+
+    removed = 0
+    if not replaced and os.path.normcase(os.path.abspath(folder)) == os.path.normcase(
+        os.path.abspath(plan.folder)
+    ):
+        for install_path in plan.removed:
+            try:
+                os.remove(os.path.join(folder, *install_path.split("/")))
+                removed += 1
+            except FileNotFoundError:
+                pass
+
+    return DeltaReport(
+        len(plan.unchanged) - len(missing),
+        plan.avoidedBytes - missing_bytes,
+        removed,
+        len(missing),
+        replaced,
+    )
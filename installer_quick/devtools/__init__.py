@@ -0,0 +1,18 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This package contains tools to develop the simple installer outside of MO2, e.g.
+benchmarks. It is not used by the plugin itself.
+
+The tools can be run from the root of the repository:
+
+    python -m installer_quick.devtools.benchmark --help
+
+Since `mobase` is only available inside MO2, a minimal stand-in (see mobase_stub)
+is installed when this package is imported and `mobase` cannot be imported. PyQt5
+is still required since the installer imports it.
+"""
+
+from .mobase_stub import installMobaseStub
+
+installMobaseStub()
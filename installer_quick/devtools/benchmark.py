@@ -0,0 +1,330 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains a benchmark of the simple installer on synthetic archive trees
+(see trees.py), that can be run outside of MO2:
+
+    python -m installer_quick.devtools.benchmark -o results.json
+    python -m installer_quick.devtools.benchmark --compare results.json
+
+The results are written as JSON so that they can be compared across commits.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Any, Callable, Dict, List, Optional
+
+import mobase
+
+from ..filetree import PyFileTree
+from ..installer import SimpleInstaller
+from ..treestats import TreeStatsCache
+from .trees import GENERATORS, TreeGenerator
+
+# Version of the format of the results:
+FORMAT_VERSION = 1
+
+
+class FakeDataChecker:
+
+    """ Mod-data-checker similar to the one of Bethesda games: a tree is valid if it
+    contains a plugin or a well-known folder.
+
+    The checker reads the statistics of the folders shared with the installer when
+    they were already computed (e.g. by the search of the data folder), instead of
+    walking the folders again. The checkers of the game plugins cannot do this since
+    they do not have access to the statistics of the installer. """
+
+    FOLDERS = frozenset(["meshes", "textures", "interface", "scripts", "sound"])
+    SUFFIXES = frozenset(["esp", "esm", "esl", "bsa", "ba2"])
+
+    # Statistics of the folders, shared with the installer (see createInstaller()):
+    stats: Optional[TreeStatsCache] = None
+
+    def dataLooksValid(self, tree: PyFileTree) -> mobase.ModDataChecker.CheckReturn:
+        level = self.stats.cached(tree) if self.stats is not None else None
+        if level is not None:
+            if not self.FOLDERS.isdisjoint(level.folders) or level.countSuffixes(
+                self.SUFFIXES
+            ):
+                return mobase.ModDataChecker.VALID
+            return mobase.ModDataChecker.INVALID
+
+        for e in tree:
+            if e.isDir():
+                if e.name().casefold() in self.FOLDERS:
+                    return mobase.ModDataChecker.VALID
+            elif e.suffix().casefold() in self.SUFFIXES:
+                return mobase.ModDataChecker.VALID
+        return mobase.ModDataChecker.INVALID
+
+
+class FakeGame:
+    class _DataDirectory:
+        def dirName(self) -> str:
+            return "data"
+
+    def __init__(self):
+        self.checker = FakeDataChecker()
+
+    def dataDirectory(self):
+        return FakeGame._DataDirectory()
+
+    def feature(self, feature: type):
+        if feature is mobase.ModDataChecker:
+            return self.checker
+        return None
+
+
+class FakeModList:
+
+    """ Mod list without any mod. """
+
+    def allMods(self) -> List[str]:
+        return []
+
+    def __getattr__(self, name: str):
+        # Registration of callbacks (onModRemoved(), ...):
+        if name.startswith("on"):
+            return lambda *args: None
+        raise AttributeError(name)
+
+
+class FakeOrganizer:
+
+    """ Organizer returning the default value of the settings of the plugins. The
+    verdict cache is disabled since it would make all runs but the first one
+    trivial. """
+
+    _settings: Dict[str, Any]
+
+    # Folder for the data of the plugins (e.g. the journal of the installations):
+    _dataPath: str
+
+    def __init__(self, settings: Dict[str, Any], dataPath: Optional[str] = None):
+        self._settings = settings
+        self._game = FakeGame()
+        self._modList = FakeModList()
+        self._dataPath = (
+            dataPath
+            if dataPath is not None
+            else tempfile.mkdtemp(prefix="installer_quick-")
+        )
+
+    def pluginSetting(self, plugin: str, key: str) -> Any:
+        return self._settings[key]
+
+    def managedGame(self) -> FakeGame:
+        return self._game
+
+    def modsPath(self) -> str:
+        return tempfile.gettempdir()
+
+    def pluginDataPath(self) -> str:
+        return self._dataPath
+
+    def modList(self) -> FakeModList:
+        return self._modList
+
+    def __getattr__(self, name: str):
+        # Registration of callbacks (onUserInterfaceInitialized(), ...):
+        if name.startswith("on"):
+            return lambda *args: None
+        raise AttributeError(name)
+
+
+def createInstaller(dataPath: Optional[str] = None) -> SimpleInstaller:
+    """ Create an installer with the default settings, except for the cache.
+
+    Args:
+        dataPath: Folder for the data of the plugins, or None to use a new temporary
+            folder.
+    """
+    installer = SimpleInstaller()
+    settings = {s.key: s.default_value for s in installer.settings()}
+    settings["cache_size"] = 0
+    organizer = FakeOrganizer(settings, dataPath)
+    installer.init(organizer)
+    organizer.managedGame().checker.stats = installer._stats
+    return installer
+
+
+def _timeit(
+    setup: Callable[[], Any], run: Callable[[Any], Any], repeat: int
+) -> List[float]:
+    """ Time run(setup()) the given number of times, setup() being excluded from the
+    timings. """
+    timings = []
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        run(arg)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def benchmarkCase(
+    installer: SimpleInstaller, generator: TreeGenerator, repeat: int
+) -> Dict[str, List[float]]:
+    """ Benchmark the installer on the trees from the given generator.
+
+    Args:
+        installer: The installer to benchmark.
+        generator: The generator of the archive entries.
+        repeat: Number of runs for each operation.
+
+    Returns: The timings (in seconds) for each operation.
+    """
+    entries = generator()
+
+    def fresh() -> PyFileTree:
+        # Each run is a new archive for the installer:
+        installer._releaseTrees()
+        return PyFileTree.fromEntries(entries)
+
+    def analyzed():
+        tree = fresh()
+        return installer._getSimpleArchiveBase(tree)
+
+    def measured():
+        # The junk entries are found when measuring the footprint, before the tree
+        # is restructured (see SimpleInstaller._install()):
+        analysis = analyzed()
+        installer._measureFootprint(analysis)
+        return analysis
+
+    results = {
+        "isArchiveSupported": _timeit(fresh, installer.isArchiveSupported, repeat),
+        "_getSimpleArchiveBase": _timeit(
+            fresh, installer._getSimpleArchiveBase, repeat
+        ),
+    }
+
+    # The footprint and the restructuring are only computed for supported archives:
+    if analyzed() is not None:
+        results["_measureFootprint"] = _timeit(
+            analyzed, installer._measureFootprint, repeat
+        )
+        results["_restructureTree"] = _timeit(
+            measured, installer._restructureTree, repeat
+        )
+
+    return results
+
+
+def _gitRevision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def runBenchmark(cases: List[str], repeat: int) -> Dict[str, Any]:
+    """ Run the benchmark on the given cases.
+
+    Args:
+        cases: Names of the cases to run (see trees.GENERATORS).
+        repeat: Number of runs for each operation.
+
+    Returns: The results, as a JSON-serializable object.
+    """
+    installer = createInstaller()
+
+    results = []
+    for case in cases:
+        entries = len(GENERATORS[case]())
+        for operation, timings in benchmarkCase(
+            installer, GENERATORS[case], repeat
+        ).items():
+            results.append(
+                {
+                    "case": case,
+                    "operation": operation,
+                    "entries": entries,
+                    "repeat": repeat,
+                    "min": min(timings),
+                    "median": statistics.median(timings),
+                    "mean": statistics.mean(timings),
+                }
+            )
+
+    return {
+        "format": FORMAT_VERSION,
+        "revision": _gitRevision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "results": results,
+    }
+
+
+def compareResults(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """ Compare two results of runBenchmark(), using the median timings.
+
+    Returns: The lines of the comparison, one per (case, operation).
+    """
+    medians = {(r["case"], r["operation"]): r["median"] for r in baseline["results"]}
+
+    lines = []
+    for r in current["results"]:
+        key = (r["case"], r["operation"])
+        line = "{:<22} {:<22} {:>10.3f}ms".format(*key, r["median"] * 1000)
+        if key in medians and medians[key] > 0:
+            line += " {:>10.3f}ms {:>7.2f}x".format(
+                medians[key] * 1000, r["median"] / medians[key]
+            )
+        lines.append(line)
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m installer_quick.devtools.benchmark",
+        description="Benchmark the simple installer on synthetic archive trees.",
+    )
+    parser.add_argument(
+        "cases",
+        nargs="*",
+        help="cases to run, among {} (default: all)".format(", ".join(GENERATORS)),
+    )
+    parser.add_argument(
+        "-n", "--repeat", type=int, default=10, help="number of runs per operation"
+    )
+    parser.add_argument("-o", "--output", help="file to write the results to")
+    parser.add_argument("--compare", help="results to compare against")
+    args = parser.parse_args(argv)
+
+    for case in args.cases:
+        if case not in GENERATORS:
+            parser.error("unknown case: {}".format(case))
+
+    current = runBenchmark(args.cases or list(GENERATORS), args.repeat)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(current, fp, indent=2)
+
+    baseline = {"results": []}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fp:
+            baseline = json.load(fp)
+
+    print("\n".join(compareResults(baseline, current)))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module compares the classification of a level of an archive tree (see
+analysis.classifyLevel()) with the check it replaced, on the base level of the cases
+of the benchmark (the first level that is not a single folder):
+
+    python -m installer_quick.devtools.classify flat-data-text-100k
+
+The classification must not be slower than the original check, with the default rules
+(including the junk patterns): the command fails if it is.
+
+The original check rejected the level when its folder was named after the data folder
+(see classifyLevel()) and stopped at this folder, so the check measured here compares
+the name of the folder at the end, as classifyLevel() does, to walk the same entries.
+"""
+
+import argparse
+import gc
+import sys
+import time
+
+from typing import Callable, List, Optional, Tuple
+
+from ..analysis import classifyLevel
+from ..filetree import PyFileTree
+from .benchmark import createInstaller
+from .trees import GENERATORS
+
+# Cases compared by default (the levels of the other cases are too small for the
+# timings to be meaningful):
+DEFAULT_CASES = ["flat-data-text-100k", "wide-data-text-5k"]
+
+
+def isDataTextArchiveTopLayer(tree: PyFileTree, data_name: str) -> bool:
+    """ The original check of the data-text archives (see the documentation of the
+    module for the check of the name of the data folder). """
+
+    # We are looking for a single folder called `data_name` and some txt/pdf files.
+    data_found = txt_found = False
+    folder = None
+
+    for e in tree:
+        if e.isDir():
+            if data_found:
+                return False
+            data_found = True
+            folder = e
+        if e.isFile():
+            # e.suffix() returns the extension of the file (without the .).
+            if e.suffix().lower() not in ["txt", "pdf"]:
+                return False
+            txt_found = True
+
+    return (
+        folder is not None
+        and folder.name().lower() == data_name.lower()
+        and data_found
+        and txt_found
+    )
+
+
+def baseLevel(tree: PyFileTree) -> PyFileTree:
+    """ Returns: The first level of the given tree that is not a single folder. """
+    while len(tree) == 1 and tree[0].isDir():
+        tree = tree[0]  # type: ignore
+    return tree
+
+
+def _compare(
+    first: Callable[[], object], second: Callable[[], object], repeat: int
+) -> Tuple[float, float]:
+    """ Time the given functions the given number of times, alternating them so that
+    both are equally affected by the noise of the machine, and return the minimum
+    time (in seconds) of each. """
+    timings: Tuple[List[float], List[float]] = ([], [])
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for run, values in zip((first, second), timings):
+                start = time.perf_counter()
+                run()
+                values.append(time.perf_counter() - start)
+    finally:
+        if enabled:
+            gc.enable()
+    return min(timings[0]), min(timings[1])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m installer_quick.devtools.classify",
+        description="Compare the classification of a level with the original check.",
+    )
+    parser.add_argument(
+        "cases",
+        nargs="*",
+        help="cases to run, among {} (default: {})".format(
+            ", ".join(GENERATORS), ", ".join(DEFAULT_CASES)
+        ),
+    )
+    parser.add_argument(
+        "-n", "--repeat", type=int, default=20, help="number of runs per check"
+    )
+    args = parser.parse_args(argv)
+
+    for case in args.cases:
+        if case not in GENERATORS:
+            parser.error("unknown case: {}".format(case))
+
+    installer = createInstaller()
+    rules = installer._compiledRules()
+    data_name = installer._organizer.managedGame().dataDirectory().dirName()
+
+    print("{:<22} {:>12} {:>12} {:>8}".format("case", "original", "classify", ""))
+
+    failed = False
+    for case in args.cases or DEFAULT_CASES:
+        level = baseLevel(PyFileTree.fromEntries(GENERATORS[case]()))
+
+        # Both checks must agree on the level:
+        if (classifyLevel(level, rules)[0].name == "DATA_TEXT") != (
+            isDataTextArchiveTopLayer(level, data_name)
+        ):
+            print("{:<22} the checks do not agree".format(case))
+            failed = True
+            continue
+
+        original, classify = _compare(
+            lambda: isDataTextArchiveTopLayer(level, data_name),
+            lambda: classifyLevel(level, rules),
+            args.repeat,
+        )
+        failed = failed or classify > original
+        print(
+            "{:<22} {:>10.3f}ms {:>10.3f}ms {:>7.2f}x".format(
+                case, original * 1000, classify * 1000, classify / original
+            )
+        )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module measures the time between the request to open the installation dialog
+and its first paint, for the first installation and the following ones:
+
+    python -m installer_quick.devtools.dialog_latency -n 20
+
+The dialog is accepted automatically as soon as it is painted.
+"""
+
+import argparse
+import statistics
+import sys
+
+from typing import List, Optional
+
+import mobase
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from ..filetree import PyFileTree
+from .benchmark import createInstaller
+from .trees import dataArchive
+
+
+def measureLatencies(count: int) -> List[float]:
+    """ Install a simple archive the given number of times and measure the latency of
+    the dialog for each installation.
+
+    Args:
+        count: Number of installations.
+
+    Returns: The latencies (in seconds), the first one being the one of the first
+        installation.
+    """
+    installer = createInstaller()
+    entries = dataArchive()
+
+    # Accept the dialog as soon as it has been painted:
+    def acceptPainted():
+        dialog = installer._dialog
+        if dialog is not None and dialog.isVisible() and dialog.paintedAt():
+            dialog.accept()
+
+    timer = QTimer()
+    timer.timeout.connect(acceptPainted)
+    timer.start(1)
+
+    latencies = []
+    for _ in range(count):
+        installer.install(
+            mobase.GuessedString("My Mod"), PyFileTree.fromEntries(entries), "", 0
+        )
+        if installer.dialogLatency is not None:
+            latencies.append(installer.dialogLatency)
+
+    timer.stop()
+    return latencies
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m installer_quick.devtools.dialog_latency",
+        description="Measure the open-to-paint latency of the installation dialog.",
+    )
+    parser.add_argument(
+        "-n", "--count", type=int, default=20, help="number of installations"
+    )
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841
+
+    latencies = measureLatencies(args.count)
+    if not latencies:
+        print("The dialog was never painted.")
+        return 1
+
+    print("first: {:8.3f}ms".format(latencies[0] * 1000))
+    if len(latencies) > 1:
+        later = statistics.median(latencies[1:])
+        print("later: {:8.3f}ms (median)".format(later * 1000))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
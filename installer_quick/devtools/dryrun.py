@@ -0,0 +1,198 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module runs the layout analysis of the simple installer on a folder of archives,
+without MO2, and writes the result for each archive as JSON lines:
+
+    python -m installer_quick.devtools.dryrun path/to/archives -o report.jsonl
+
+Each line contains the verdict of the installer (the kind of layout, or UNSUPPORTED),
+the base of the archive and the time spent listing and analyzing the archive. The
+archives are analyzed in a process pool using the pure-Python trees and the fake game
+from the benchmark (whose mod-data-checker is similar to the one of Bethesda games).
+
+The records are written as soon as the archives are analyzed and only a bounded
+number of archives are pending at any time, so the memory usage does not depend on
+the number of archives.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from ..filetree import PyFileTree
+from ..installer import SimpleInstaller
+from ..listing import findLister
+from ..telemetry import PhaseTimer
+from .benchmark import createInstaller
+
+# Installer of the current worker process, see _initWorker():
+_installer: Optional[SimpleInstaller] = None
+
+
+def iterArchives(folder: str, recursive: bool = False) -> Iterator[str]:
+    """ Iterate the archives with a registered lister in the given folder.
+
+    Args:
+        folder: The folder to look archives in.
+        recursive: True to also look in the sub-folders.
+
+    Yields: The paths to the archives.
+    """
+    folders = [folder]
+    while folders:
+        with os.scandir(folders.pop()) as it:
+            for entry in it:
+                if entry.is_dir():
+                    if recursive:
+                        folders.append(entry.path)
+                elif findLister(entry.name) is not None:
+                    yield entry.path
+
+
+def _initWorker():
+    global _installer
+    _installer = createInstaller()
+
+
+def analyzeArchive(archive: str) -> Dict[str, Any]:
+    """ Analyze a single archive. This is the function run by the worker processes.
+
+    Args:
+        archive: Path to the archive.
+
+    Returns: The record for the archive.
+    """
+    installer = _installer
+    if installer is None:
+        installer = createInstaller()
+
+    record: Dict[str, Any] = {"archive": archive}
+
+    start = time.perf_counter()
+    try:
+        entries = findLister(archive)(archive)
+    except Exception as e:
+        record.update(verdict="ERROR", error="{}: {}".format(type(e).__name__, e))
+        return record
+    listed = time.perf_counter()
+
+    # The worker processes analyze many archives with the same installer, so the
+    # trees of the previous archive are released as MO2 does between installations:
+    installer._releaseTrees()
+    installer._archive = archive
+    installer._timer = PhaseTimer()
+    analysis = installer._getSimpleArchiveBase(PyFileTree.fromEntries(entries))
+    end = time.perf_counter()
+
+    if analysis is None:
+        record.update(verdict="UNSUPPORTED", base=None, depth=None)
+    else:
+        record.update(
+            verdict=analysis.kind.name,
+            base=analysis.base.path("/"),
+            depth=analysis.depth,
+        )
+    installer._releaseTrees()
+
+    record.update(
+        entries=len(entries),
+        listMs=round((listed - start) * 1000, 4),
+        analysisMs=round((end - listed) * 1000, 4),
+    )
+    return record
+
+
+def dryRun(
+    archives: Iterator[str], output, max_workers: Optional[int] = None
+) -> Counter:
+    """ Analyze the given archives in a process pool and write the records to the
+    given output as they complete (not in the order of the archives).
+
+    Args:
+        archives: Paths to the archives.
+        output: Text file to write the records to.
+        max_workers: Number of processes, or None to use the number of CPUs.
+
+    Returns: The number of archives with each verdict.
+    """
+    verdicts: Counter = Counter()
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers, initializer=_initWorker) as executor:
+        # Only a few archives per worker are submitted at once, so that the archives
+        # are enumerated lazily and the results do not pile up:
+        window = 4 * max_workers
+        pending: Set["Future[Dict[str, Any]]"] = set()
+
+        def flush(done: Set["Future[Dict[str, Any]]"]):
+            for future in done:
+                record = future.result()
+                verdicts[record["verdict"]] += 1
+                output.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+        for archive in archives:
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                flush(done)
+            pending.add(executor.submit(analyzeArchive, archive))
+
+        flush(wait(pending).done)
+
+    return verdicts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m installer_quick.devtools.dryrun",
+        description="Run the layout analysis of the simple installer on archives.",
+    )
+    parser.add_argument("folder", help="folder containing the archives")
+    parser.add_argument(
+        "-r", "--recursive", action="store_true", help="also look in sub-folders"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, help="number of processes (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "-o", "--output", help="file to write the records to (default: stdout)"
+    )
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.folder):
+        parser.error("not a folder: {}".format(args.folder))
+
+    start = time.perf_counter()
+    archives = iterArchives(args.folder, args.recursive)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            verdicts = dryRun(archives, fp, args.jobs)
+    else:
+        verdicts = dryRun(archives, sys.stdout, args.jobs)
+
+    # The summary is written to stderr so that stdout only contains the records:
+    print(
+        "{} archives in {:.1f}s: {}".format(
+            sum(verdicts.values()),
+            time.perf_counter() - start,
+            ", ".join(
+                "{} {}".format(count, verdict)
+                for verdict, count in verdicts.most_common()
+            ),
+        ),
+        file=sys.stderr,
+    )
+
+    return 1 if verdicts["ERROR"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module measures the peak memory allocated by the passes of the installer over
+archive trees (analysis, walk of the installed files, junk scan) for trees of
+increasing size, to check that it does not depend on the number of entries:
+
+    python -m installer_quick.devtools.memory -s 10000 100000 1000000
+
+The memory is measured with tracemalloc, which only traces the allocations made after
+it is started: the tree is built before, so only the memory allocated by the pass
+itself is measured. The peak RSS of the process cannot be used for this since it is
+dominated by the tree and never decreases.
+
+The sorted list of entries of each PyFileTree is built before the measure since it
+is part of the tree (mobase trees keep their entries sorted).
+
+The search of the data folder (the analysis of the "wide" shape) enumerates the
+sub-folders of the searched level lazily, and only keeps the statistics of the folders
+that are searched at the next depth, which are bounded by the search budget (see
+analysis.searchArchiveBase()).
+"""
+
+import argparse
+import collections
+import sys
+import tracemalloc
+
+from typing import Any, Callable, Dict, List, Optional
+
+from ..analysis import walkTree
+from ..conflicts import iterInstalledFiles
+from ..filetree import PyFileTree
+from ..installer import SimpleInstaller
+from ..junk import removeJunk
+from ..listing import ArchiveEntry
+from .benchmark import createInstaller
+
+# Maximum growth of the peak memory between the smallest and the largest trees:
+TOLERANCE = 64 << 10
+
+
+def flatShape(count: int) -> List[ArchiveEntry]:
+    """ A data-text archive whose data folder contains all the files. """
+    return [ArchiveEntry("Mod/readme.txt", False, 1, None)] + [
+        ArchiveEntry("Mod/Data/textures/file{}.dds".format(i), False, 1, None)
+        for i in range(count - 1)
+    ]
+
+
+def nestedShape(count: int) -> List[ArchiveEntry]:
+    """ A data archive with the files spread in nested folders (10 files per
+    folder). """
+    return [ArchiveEntry("Mod/plugin.esp", False, 1, None)] + [
+        ArchiveEntry(
+            "Mod/meshes/{}/{}/file{}.nif".format(i // 1000, i // 10 % 100, i),
+            False,
+            1,
+            None,
+        )
+        for i in range(count - 1)
+    ]
+
+
+def wideShape(count: int) -> List[ArchiveEntry]:
+    """ An archive with no data folder and a lot of folders to search. """
+    return [
+        ArchiveEntry("folder{}/file{}.bin".format(i // 2, i), False, 1, None)
+        for i in range(count)
+    ]
+
+
+SHAPES: Dict[str, Callable[[int], List[ArchiveEntry]]] = {
+    "flat": flatShape,
+    "nested": nestedShape,
+    "wide": wideShape,
+}
+
+
+def _peak(run: Callable[[], Any]) -> int:
+    """ Run the given function and return the peak memory it allocated. """
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measureShape(
+    installer: SimpleInstaller, shape: Callable[[int], List[ArchiveEntry]], count: int
+) -> Dict[str, int]:
+    """ Measure the peak memory of each pass on a tree of the given shape.
+
+    Args:
+        installer: The installer to use.
+        shape: Generator of the entries of the archive.
+        count: Number of entries of the archive.
+
+    Returns: The peak memory (in bytes) of each pass.
+    """
+    tree = PyFileTree.fromEntries(shape(count))
+
+    # Build the sorted lists of entries (see the documentation of the module):
+    collections.deque(walkTree(tree), maxlen=0)
+
+    installer._releaseTrees()
+    results = {"analysis": _peak(lambda: installer._getSimpleArchiveBase(tree))}
+
+    analysis = installer._getSimpleArchiveBase(tree)
+    if analysis is not None:
+        results["installedFiles"] = _peak(
+            lambda: collections.deque(iterInstalledFiles(analysis), maxlen=0)
+        )
+
+        # This modifies the tree, so it must be the last pass:
+        rules = installer._compiledRules()
+        results["junk"] = _peak(lambda: removeJunk(analysis, rules))
+
+    installer._releaseTrees()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m installer_quick.devtools.memory",
+        description="Measure the peak memory of the passes of the installer.",
+    )
+    parser.add_argument(
+        "shapes",
+        nargs="*",
+        help="shapes to measure, among {} (default: all)".format(", ".join(SHAPES)),
+    )
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10000, 100000, 1000000],
+        help="number of entries of the trees",
+    )
+    args = parser.parse_args(argv)
+
+    for shape in args.shapes:
+        if shape not in SHAPES:
+            parser.error("unknown shape: {}".format(shape))
+
+    installer = createInstaller()
+    sizes = sorted(args.sizes)
+
+    print(
+        "{:<8} {:<16}".format("shape", "pass")
+        + "".join(" {:>12}".format(size) for size in sizes)
+    )
+
+    failed = False
+    for name in args.shapes or list(SHAPES):
+        peaks: Dict[str, List[int]] = {}
+        for size in sizes:
+            for operation, peak in measureShape(installer, SHAPES[name], size).items():
+                peaks.setdefault(operation, []).append(peak)
+
+        for operation, values in peaks.items():
+            # The peak is not always reached with the largest tree (e.g. when the
+            # search gives up on it):
+            growth = max(values) - values[0]
+            failed = failed or growth > TOLERANCE
+            print(
+                "{:<8} {:<16}".format(name, operation)
+                + "".join(" {:>10.1f}KB".format(v / 1024) for v in values)
+                + ("  (+{:.1f}KB)".format(growth / 1024) if growth > TOLERANCE else "")
+            )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
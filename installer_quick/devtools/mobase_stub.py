@@ -0,0 +1,146 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains a minimal stand-in for the parts of `mobase` used by the simple
+installer, so that the installer can be imported and exercised outside of MO2.
+
+This is only meant for development tools: the behavior of the classes here is far
+simpler than the one of the real classes.
+"""
+
+import enum
+import sys
+import types
+
+from typing import Dict, List
+
+from ..filetree import PyFileEntry, PyFileTree
+
+
+class ReleaseType(enum.Enum):
+    PRE_ALPHA = enum.auto()
+    ALPHA = enum.auto()
+    BETA = enum.auto()
+    CANDIDATE = enum.auto()
+    FINAL = enum.auto()
+
+
+class VersionInfo:
+    def __init__(self, *args):
+        self.args = args
+
+
+class PluginSetting:
+    def __init__(self, key: str, description: str, default_value: object):
+        self.key = key
+        self.description = description
+        self.default_value = default_value
+
+
+class GuessQuality(enum.IntEnum):
+    INVALID = 0
+    FALLBACK = 1
+    GOOD = 2
+    META = 3
+    PRESET = 4
+    USER = 5
+
+
+class GuessedString:
+
+    """ Stand-in for mobase.GuessedString: str() returns the variant with the best
+    quality (the last one set for equal qualities). """
+
+    _variants: Dict[str, GuessQuality]
+
+    def __init__(self, value: str = "", quality: GuessQuality = GuessQuality.GOOD):
+        self._variants = {}
+        if value:
+            self.update(value, quality)
+
+    def update(self, value: str, quality: GuessQuality = GuessQuality.GOOD):
+        self._variants.pop(value, None)
+        self._variants[value] = quality
+
+    def variants(self) -> List[str]:
+        return list(self._variants)
+
+    def __str__(self) -> str:
+        best = ""
+        quality = GuessQuality.INVALID
+        for value, q in self._variants.items():
+            if q >= quality:
+                best, quality = value, q
+        return best
+
+
+class InstallResult(enum.Enum):
+    SUCCESS = enum.auto()
+    FAILED = enum.auto()
+    CANCELED = enum.auto()
+    MANUAL_REQUESTED = enum.auto()
+    NOT_ATTEMPTED = enum.auto()
+
+
+class ModDataChecker:
+    class CheckReturn(enum.IntEnum):
+        INVALID = 0
+        FIXABLE = 1
+        VALID = 2
+
+    INVALID = CheckReturn.INVALID
+    FIXABLE = CheckReturn.FIXABLE
+    VALID = CheckReturn.VALID
+
+
+class IPlugin:
+    pass
+
+
+class IPluginInstaller(IPlugin):
+
+    _parent = None
+    _installationManager = None
+
+    def _parentWidget(self):
+        return self._parent
+
+    def _manager(self):
+        return self._installationManager
+
+
+class IPluginInstallerSimple(IPluginInstaller):
+    pass
+
+
+class IOrganizer:
+    pass
+
+
+class IModInterface:
+    pass
+
+
+# The trees are the pure-Python ones from this plugin:
+FileTreeEntry = PyFileEntry
+IFileTree = PyFileTree
+
+
+def installMobaseStub():
+    """ Install this module as `mobase` in sys.modules if the real `mobase` cannot be
+    imported. """
+    if "mobase" in sys.modules:
+        return
+
+    try:
+        import mobase  # noqa: F401
+    except ImportError:
+        module = types.ModuleType("mobase")
+        module.__dict__.update(
+            {
+                name: value
+                for name, value in globals().items()
+                if not name.startswith("_") and name != "installMobaseStub"
+            }
+        )
+        sys.modules["mobase"] = module
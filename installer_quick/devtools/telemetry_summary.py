@@ -0,0 +1,64 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module shows a summary of the timing telemetry of the installer, i.e., the 50th
+and 95th percentiles of the time spent in each phase of the installations:
+
+    python -m installer_quick.devtools.telemetry_summary \\
+        path/to/plugins/data/installer_quick/telemetry.jsonl
+
+The rotated log files are read too.
+"""
+
+import argparse
+import sys
+
+from typing import List, Optional
+
+from ..telemetry import readRecords, summarize
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m installer_quick.devtools.telemetry_summary",
+        description="Summarize the timing telemetry of the installer.",
+    )
+    parser.add_argument("path", help="path to the telemetry log")
+    parser.add_argument(
+        "--last", type=int, help="only summarize the given number of installations"
+    )
+    args = parser.parse_args(argv)
+
+    records = readRecords(args.path)
+    if args.last:
+        records = records[-args.last :]
+
+    if not records:
+        print("No installations found in {}.".format(args.path))
+        return 1
+
+    print("{} installations".format(len(records)))
+    print("{:<14} {:>7} {:>12} {:>12}".format("phase", "count", "p50", "p95"))
+    for summary in summarize(records):
+        print(
+            "{:<14} {:>7} {:>10.3f}ms {:>10.3f}ms".format(
+                summary.phase, summary.count, summary.p50, summary.p95
+            )
+        )
+
+    # Disk space reclaimed by the deduplication of the installed mods:
+    dedup = [r["dedup"] for r in records if isinstance(r.get("dedup"), dict)]
+    if dedup:
+        print(
+            "{} mods deduplicated, {} files linked, {:.1f} MiB reclaimed".format(
+                len(dedup),
+                sum(d.get("linkedFiles", 0) for d in dedup),
+                sum(d.get("reclaimedBytes", 0) for d in dedup) / (1 << 20),
+            )
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
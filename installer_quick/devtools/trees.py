@@ -0,0 +1,134 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains generators of synthetic archive trees, both realistic (looking
+like actual mods) and pathological (very deep or very large).
+
+The generators return the list of entries of the archive rather than the tree itself
+since the installer modifies the trees, so benchmarks need to build a fresh tree for
+each run (using PyFileTree.fromEntries()).
+"""
+
+import random
+
+from typing import Callable, Dict, List
+
+from ..listing import ArchiveEntry
+
+# A generator of archive entries:
+TreeGenerator = Callable[[], List[ArchiveEntry]]
+
+
+def _files(paths: List[str], size: int = 1024) -> List[ArchiveEntry]:
+    return [ArchiveEntry(path, False, size, None) for path in paths]
+
+
+def _dataFiles(prefix: str, count: int, seed: int = 0) -> List[str]:
+    """ Generate the paths of the files of a data folder looking like a real mod:
+    a plugin, some meshes and textures in nested folders. """
+    rng = random.Random(seed)
+    paths = [prefix + "Mod.esp"]
+    for i in range(count - 1):
+        kind, suffix = rng.choice([("meshes", "nif"), ("textures", "dds")])
+        folder = "/".join(
+            "f{}".format(rng.randrange(8)) for _ in range(rng.randrange(4))
+        )
+        paths.append(
+            "{}{}/{}{}file{}.{}".format(
+                prefix, kind, folder, "/" if folder else "", i, suffix
+            )
+        )
+    return paths
+
+
+def dataArchive(count: int = 200) -> List[ArchiveEntry]:
+    """ An archive whose root is the data folder. """
+    return _files(_dataFiles("", count))
+
+
+def wrappedArchive(count: int = 200) -> List[ArchiveEntry]:
+    """ An archive with the data folder in a single folder (very common). """
+    return _files(_dataFiles("My Mod 1.0/", count))
+
+
+def dataTextArchive(count: int = 200) -> List[ArchiveEntry]:
+    """ An archive containing a data folder and some text files. """
+    return _files(
+        _dataFiles("Data/", count) + ["readme.txt", "changelog.txt", "manual.pdf"]
+    )
+
+
+def singleFolderChain(depth: int = 32, count: int = 10) -> List[ArchiveEntry]:
+    """ An archive with the data folder at the end of a long chain of single
+    folders. """
+    prefix = "".join("level{}/".format(i) for i in range(depth))
+    return _files(_dataFiles(prefix, count))
+
+
+def flatArchive(count: int = 100000) -> List[ArchiveEntry]:
+    """ An archive with a lot of files at the root, none of them being recognized by
+    the game. """
+    return _files(["file{:06}.bin".format(i) for i in range(count)])
+
+
+def flatDataTextArchive(count: int = 100000) -> List[ArchiveEntry]:
+    """ A data-text archive with a lot of text files next to the data folder. """
+    return _files(
+        ["Data/Mod.esp"] + ["doc{:06}.txt".format(i) for i in range(count)]
+    )
+
+
+def wideDataTextArchive(count: int = 5000) -> List[ArchiveEntry]:
+    """ A data-text archive with thousands of text files next to a small data
+    folder. """
+    return _files(
+        _dataFiles("Data/", 20) + ["doc{:05}.txt".format(i) for i in range(count)]
+    )
+
+
+def wideFoldersArchive(count: int = 5000) -> List[ArchiveEntry]:
+    """ A data-text archive with thousands of text files next to a data folder
+    containing thousands of files, so that all the files of the data folder are
+    looked up in the top layer when restructuring the tree. """
+    return _files(
+        ["Data/file{:05}.bsa".format(i) for i in range(count - 1000)]
+        + ["doc{:05}.txt".format(i) for i in range(count)]
+    )
+
+
+def unicodeArchive(count: int = 1000) -> List[ArchiveEntry]:
+    """ A data-text archive with unicode names, including names whose case-folding
+    differs from their lower-case version. """
+    names = ["Straße", "ΣΊΣΥΦΟΣ", "Ǆemal", "ﬁle", "日本語", "Ünïcödé", "İstanbul"]
+    paths = ["Wrapper/DATA/Mod.esp", "Wrapper/Lisez-moi.txt", "Wrapper/Läsmig.pdf"]
+    for i in range(count):
+        paths.append(
+            "Wrapper/DATA/textures/{}/{}{}.dds".format(
+                names[i % len(names)], names[(i // len(names)) % len(names)], i
+            )
+        )
+    return _files(paths)
+
+
+def nestedDataArchive(count: int = 200) -> List[ArchiveEntry]:
+    """ An archive with the data folder next to documentation folders, found by the
+    search in the sub-folders. """
+    return _files(
+        _dataFiles("Mod/Main Files/", count)
+        + ["Mod/Docs/readme.txt", "Mod/Images/screen.png", "Mod/install.bat"]
+    )
+
+
+# All the generators, by name:
+GENERATORS: Dict[str, TreeGenerator] = {
+    "data": dataArchive,
+    "wrapped": wrappedArchive,
+    "data-text": dataTextArchive,
+    "nested": nestedDataArchive,
+    "chain-32": singleFolderChain,
+    "flat-100k": flatArchive,
+    "flat-data-text-100k": flatDataTextArchive,
+    "wide-data-text-5k": wideDataTextArchive,
+    "wide-folders-5k": wideFoldersArchive,
+    "unicode": unicodeArchive,
+}
@@ -0,0 +1,236 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains a lightweight pure-Python implementation of the parts of
+`mobase.IFileTree` and `mobase.FileTreeEntry` used by this plugin, so that archive
+trees can be analyzed without MO2 (e.g. from the list of entries of an archive).
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from .listing import ArchiveEntry
+
+
+class PyFileEntry:
+
+    """ A file entry, similar to mobase.FileTreeEntry. """
+
+    __slots__ = ("_name", "_parent", "size", "crc")
+
+    _name: str
+    _parent: Optional["PyFileTree"]
+
+    # Uncompressed size and CRC32 of the entry, if known:
+    size: int
+    crc: Optional[int]
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional["PyFileTree"] = None,
+        size: int = 0,
+        crc: Optional[int] = None,
+    ):
+        self._name = name
+        self._parent = parent
+        self.size = size
+        self.crc = crc
+
+    def name(self) -> str:
+        return self._name
+
+    def suffix(self) -> str:
+        index = self._name.rfind(".")
+        return "" if index == -1 else self._name[index + 1 :]
+
+    def isDir(self) -> bool:
+        return False
+
+    def isFile(self) -> bool:
+        return True
+
+    def parent(self) -> Optional["PyFileTree"]:
+        return self._parent
+
+    def detach(self) -> bool:
+        """ Remove this entry from its parent.
+
+        Returns: True if the entry was removed, False if it has no parent.
+        """
+        if self._parent is None:
+            return False
+        del self._parent._entries[self._name.casefold()]
+        self._parent._sorted = None
+        self._parent = None
+        return True
+
+    def path(self, sep: str = "\\") -> str:
+        return self.pathFrom(None, sep)
+
+    def pathFrom(self, tree: Optional["PyFileTree"], sep: str = "\\") -> str:
+        names: List[str] = []
+        entry: Optional[PyFileEntry] = self
+        while entry is not None and entry is not tree and entry._parent is not None:
+            names.append(entry._name)
+            entry = entry._parent
+        return sep.join(reversed(names))
+
+    def __eq__(self, other: object) -> bool:
+        # Like mobase, comparison with a string is case-insensitive:
+        if isinstance(other, str):
+            return self._name.casefold() == other.casefold()
+        return self is other
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __repr__(self) -> str:
+        return "{}({!r})".format(type(self).__name__, self.path("/"))
+
+
+class PyFileTree(PyFileEntry):
+
+    """ A directory entry, similar to mobase.IFileTree.
+
+    Like in MO2, the entries of a tree are sorted with directories first, and then
+    by case-insensitive name. The entries are stored by casefolded name, so looking
+    up or moving a single entry does not depend on the number of entries in the tree,
+    and the sorted list of entries is only computed when needed.
+    """
+
+    __slots__ = ("_entries", "_sorted")
+
+    # Entries by casefolded name, and sorted list of entries (None if the entries
+    # were modified since it was computed):
+    _entries: Dict[str, PyFileEntry]
+    _sorted: Optional[List[PyFileEntry]]
+
+    def __init__(self, name: str = "", parent: Optional["PyFileTree"] = None):
+        super().__init__(name, parent)
+        self._entries = {}
+        self._sorted = None
+
+    def isDir(self) -> bool:
+        return True
+
+    def isFile(self) -> bool:
+        return False
+
+    def _sortedEntries(self) -> List[PyFileEntry]:
+        if self._sorted is None:
+            self._sorted = sorted(
+                self._entries.values(),
+                key=lambda e: (not e.isDir(), e._name.casefold()),
+            )
+        return self._sorted
+
+    def __iter__(self) -> Iterator[PyFileEntry]:
+        return iter(self._sortedEntries())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def __getitem__(self, index: int) -> PyFileEntry:
+        return self._sortedEntries()[index]
+
+    def find(self, path: str) -> Optional[PyFileEntry]:
+        """ Find the entry at the given path (case-insensitive).
+
+        Args:
+            path: Path to the entry, using "/" or "\\" as separator.
+
+        Returns: The entry, or None if there is no entry at the given path.
+        """
+        entry: Union[PyFileEntry, None] = self
+        for part in path.replace("\\", "/").split("/"):
+            if not part:
+                continue
+            if not isinstance(entry, PyFileTree):
+                return None
+            entry = entry._entries.get(part.casefold())
+        return entry
+
+    def _insert(self, entry: PyFileEntry):
+        """ Insert the given entry in this tree, replacing any entry with the same
+        name. The entry must not be in another tree. """
+        entry._parent = self
+        self._entries[entry._name.casefold()] = entry
+        self._sorted = None
+
+    def merge(
+        self, other: "PyFileTree", overwrites: bool = False
+    ) -> Union[Dict[PyFileEntry, PyFileEntry], int]:
+        """ Move all the entries of the given tree into this tree. Directories that
+        exist in both trees are merged, and files from the given tree replace the ones
+        from this tree.
+
+        Args:
+            other: The tree to merge into this one. This tree is empty after the merge
+                but is not detached from its parent.
+            overwrites: If True, return the overwritten entries instead of their
+                number.
+
+        Returns: The number of overwritten entries, or a mapping from the overwritten
+            entries to the entries that replaced them if overwrites is True.
+        """
+        overwritten: Dict[PyFileEntry, PyFileEntry] = {}
+        self._merge(other, overwritten)
+        return overwritten if overwrites else len(overwritten)
+
+    def _merge(self, other: "PyFileTree", overwritten: Dict[PyFileEntry, PyFileEntry]):
+        for key, entry in other._entries.items():
+            current = self._entries.get(key)
+
+            if isinstance(current, PyFileTree) and isinstance(entry, PyFileTree):
+                current._merge(entry, overwritten)
+                continue
+
+            if current is not None:
+                current._parent = None
+                overwritten[current] = entry
+
+            self._insert(entry)
+
+        other._entries = {}
+        other._sorted = None
+
+    @staticmethod
+    def fromEntries(entries: Iterable[ArchiveEntry]) -> "PyFileTree":
+        """ Create a tree from the entries of an archive.
+
+        Args:
+            entries: The entries of the archive. Parent directories do not need to be
+                listed.
+
+        Returns: The root of the tree.
+        """
+        root = PyFileTree()
+
+        # Directories are indexed by their casefolded path while building the tree:
+        folders: Dict[str, PyFileTree] = {"": root}
+
+        def folder(path: str) -> PyFileTree:
+            key = path.casefold()
+            tree = folders.get(key)
+            if tree is None:
+                index = path.rfind("/")
+                parent = folder(path[:index] if index != -1 else "")
+                tree = PyFileTree(path[index + 1 :])
+                parent._insert(tree)
+                folders[key] = tree
+            return tree
+
+        for entry in entries:
+            if entry.isDir:
+                folder(entry.path)
+            else:
+                index = entry.path.rfind("/")
+                parent = folder(entry.path[:index] if index != -1 else "")
+                parent._insert(
+                    PyFileEntry(entry.path[index + 1 :], None, entry.size, entry.crc)
+                )
+
+        return root
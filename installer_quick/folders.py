@@ -0,0 +1,52 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the listing of the files of the folders on the disk (the mods and
+the data directory of the game), shared by the passes that compare the archives with
+the installed files.
+"""
+
+import os
+
+from typing import AbstractSet, Iterator, Tuple
+
+# Files created by MO2 at the root of the mod folders, that are not part of the mods
+# (casefolded):
+MOD_META_FILES = frozenset(["meta.ini"])
+
+
+def iterFolderFiles(
+    folder: str,
+    skip: AbstractSet[str] = frozenset(),
+    follow_symlinks: bool = False,
+    ignore_errors: bool = True,
+) -> Iterator[Tuple[str, "os.DirEntry[str]"]]:
+    """ Iterate the files of the given folder and of its sub-folders. The folders are
+    read with os.scandir() so that the callers can use the information of the entries
+    (e.g. the size of the files) without additional system calls on Windows.
+
+    Args:
+        folder: Path to the folder.
+        skip: Casefolded names of files at the root of the folder to skip, e.g.
+            MOD_META_FILES for mod folders.
+        follow_symlinks: True to follow the symbolic links to folders.
+        ignore_errors: True to skip the folders that cannot be read, False to raise
+            the OSError.
+
+    Yields: The path of each file (i.e., each entry that is not a folder) relative to
+        the given folder, using "/" as separator and keeping the case of the names,
+        and its entry.
+    """
+    folders = [("", folder)]
+    while folders:
+        prefix, current = folders.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        folders.append((prefix + entry.name + "/", entry.path))
+                    elif prefix or entry.name.casefold() not in skip:
+                        yield prefix + entry.name, entry
+        except OSError:
+            if not ignore_errors:
+                raise
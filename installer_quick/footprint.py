@@ -0,0 +1,142 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the disk footprint of an installation, i.e., the uncompressed
+size of the files that would be installed, and the comparison with the free space on
+the volume containing the mods, so that installations that would fill the disk are
+refused before extracting anything.
+
+The uncompressed size of the files is only known when the archive can be listed (see
+listing.findLister()). Otherwise, the size of the archive itself is used as an
+estimate: the files are (almost) never smaller than the archive containing them, so
+an installation that does not fit with the estimate would not fit either way.
+"""
+
+import os
+import shutil
+
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from .analysis import ArchiveAnalysis, FileTree
+from .conflicts import iterInstalledEntries
+from .listing import ArchiveEntry
+
+# Space that must remain free after an installation (MO2 and the game also need some
+# space, e.g. for logs and saves):
+FREE_SPACE_MARGIN = 64 << 20
+
+
+class DiskFootprint(NamedTuple):
+
+    """ Disk footprint of an installation. """
+
+    # Number of files to install, and their total uncompressed size (None if the size
+    # of some of the files is not known):
+    files: int
+    bytes: Optional[int]
+
+    # Free space on the volume containing the mods, or None if not known:
+    free: Optional[int]
+
+    # True if bytes is only a lower bound of the size, i.e., the size of the archive:
+    estimated: bool = False
+
+    @property
+    def checked(self) -> bool:
+        """ True if the free space was compared with the size of the installation,
+        False if the check was skipped because one of them is not known. """
+        return self.bytes is not None and self.free is not None
+
+    @property
+    def fits(self) -> bool:
+        """ False if the installation is known not to fit on the volume, True
+        otherwise. """
+        if not self.checked:
+            return True
+        return self.bytes + FREE_SPACE_MARGIN <= self.free  # type: ignore
+
+
+def freeSpace(path: str) -> Optional[int]:
+    """ Retrieve the free space on the volume containing the given path.
+
+    Args:
+        path: The path. If it does not exist, its closest existing parent is used.
+
+    Returns: The free space (in bytes), or None if it cannot be retrieved.
+    """
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+    try:
+        return shutil.disk_usage(path).free
+    except OSError:
+        return None
+
+
+def measureFootprint(
+    analysis: ArchiveAnalysis,
+    entries: Optional[Dict[str, ArchiveEntry]],
+    folder: Optional[str],
+    installed: Optional[Iterable[Tuple[str, FileTree]]] = None,
+    archiveSize: Optional[int] = None,
+) -> DiskFootprint:
+    """ Compute the disk footprint of the installation of the given analysis in a
+    single pass over the files to install.
+
+    Args:
+        analysis: The analysis of the archive tree.
+        entries: The file entries of the archive, by casefolded path in the archive
+            (using "/" as separator), or None if the archive cannot be listed.
+        folder: Folder where the mod is installed (e.g. the mods folder), or None
+            if not known.
+        installed: The files to install (see conflicts.iterInstalledEntries()), or
+            None to iterate all the installed files of the analysis. This can be used
+            to do other checks during the same pass (see junk.JunkFilter).
+        archiveSize: Size of the archive file, used as an estimate of the size of
+            the installation when the size of some files is not known.
+
+    Returns: The footprint of the installation.
+    """
+    if installed is None:
+        installed = iterInstalledEntries(analysis)
+
+    files = 0
+    size: Optional[int] = 0 if entries is not None else None
+    for _, entry in installed:
+        files += 1
+        if size is not None:
+            # The entries are keyed by their path in the archive, which is also their
+            # path from the root of the archive tree:
+            archive_entry = entries.get(entry.path("/").casefold())  # type: ignore
+            size = None if archive_entry is None else size + archive_entry.size
+
+    estimated = size is None and archiveSize is not None
+    if estimated:
+        size = archiveSize
+
+    return DiskFootprint(
+        files, size, None if folder is None else freeSpace(folder), estimated
+    )
+
+
+def formatSize(size: int) -> str:
+    """ Format the given size for humans, e.g., 1.5 GB.
+
+    Args:
+        size: The size, in bytes.
+
+    Returns: The formatted size.
+    """
+    if size < 1024:
+        return "{} B".format(size)
+
+    value = size / 1024
+    for unit in ("KB", "MB", "GB"):
+        if value < 1024:
+            return "{:.1f} {}".format(value, unit)
+        value /= 1024
+    return "{:.1f} TB".format(value)
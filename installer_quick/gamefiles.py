@@ -0,0 +1,202 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains a manifest of the files of the data directory of the game, used
+to drop the files of archives that are identical to the files of the game (e.g. vanilla
+assets repackaged unchanged).
+
+The manifest contains the size and CRC32 of each file. The CRC32 is used (instead of
+a stronger hash) since the archives contain the CRC32 of their entries, so the files
+of an archive can be compared with the game files without extracting them. The
+manifest is stored in a SQLite database with the modification time of each file, so
+only new or modified files are hashed when the manifest is updated.
+
+Only loose files are in the manifest, the content of the game archives (.bsa, ...)
+is not.
+"""
+
+import os
+import sqlite3
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .analysis import ArchiveAnalysis, FileTree
+from .conflicts import iterInstalledEntries
+from .delta import crc32File
+from .folders import iterFolderFiles
+from .listing import ArchiveEntry
+from .store import SQLiteStore
+
+
+class ManifestReport(NamedTuple):
+
+    """ Report of an update of the manifest. """
+
+    # Number of files in the manifest, and number of files hashed:
+    files: int
+    hashedFiles: int
+
+
+def _listGameFiles(folder: str) -> List[Tuple[str, str, os.stat_result]]:
+    """ List the files of the data directory, as (casefolded relative path, absolute
+    path, stat) tuples, the relative path using "/" as separator. """
+    files = []
+    for name, entry in iterFolderFiles(folder, follow_symlinks=True):
+        try:
+            if entry.is_file():
+                files.append((name.casefold(), entry.path, entry.stat()))
+        except OSError:
+            continue
+    return files
+
+
+class GameManifest(SQLiteStore):
+
+    """ Thread-safe manifest of the files of the data directory of the game. """
+
+    # Size and CRC32 of the files, by casefolded path relative to the data directory
+    # (only available once the manifest was updated):
+    _files: Optional[Dict[str, Tuple[int, int]]]
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path to the database. The database is only opened when first used.
+        """
+        super().__init__(path)
+        self._files = None
+
+    def _createTables(self, connection: sqlite3.Connection):
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, crc INTEGER
+            )"""
+        )
+
+    def isReady(self) -> bool:
+        return self._files is not None
+
+    def update(self, folder: str, max_workers: int = 4) -> ManifestReport:
+        """ Update the manifest from the given data directory. Only the files whose
+        size or modification time changed since the last update are hashed (in a
+        thread pool, zlib releases the GIL while hashing).
+
+        Args:
+            folder: Path to the data directory of the game.
+            max_workers: Number of threads used to hash the files.
+
+        Returns: The report of the update.
+        """
+        with self._lock:
+            stored = {
+                path: (size, mtime, crc)
+                for path, size, mtime, crc in self._open().execute(
+                    "SELECT path, size, mtime, crc FROM files"
+                )
+            }
+
+        files = _listGameFiles(folder)
+
+        to_hash = []
+        rows: Dict[str, Tuple[int, int, int]] = {}
+        for name, path, stat in files:
+            row = stored.get(name)
+            if row is not None and row[:2] == (stat.st_size, stat.st_mtime_ns):
+                rows[name] = row
+            else:
+                to_hash.append((name, path, stat))
+
+        def crc(path: str) -> Optional[int]:
+            try:
+                return crc32File(path)
+            except OSError:
+                return None
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            for (name, _, stat), value in zip(
+                to_hash, executor.map(crc, (path for _, path, _ in to_hash))
+            ):
+                if value is not None:
+                    rows[name] = (stat.st_size, stat.st_mtime_ns, value)
+
+        with self._lock:
+            connection = self._open()
+            with connection:
+                connection.executemany(
+                    "DELETE FROM files WHERE path = ?",
+                    ((path,) for path in stored if path not in rows),
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                    (
+                        (path, size, mtime, value)
+                        for path, (size, mtime, value) in rows.items()
+                        if stored.get(path) != (size, mtime, value)
+                    ),
+                )
+            self._files = {
+                path: (size, value) for path, (size, _, value) in rows.items()
+            }
+
+        return ManifestReport(len(rows), len(to_hash))
+
+    def contains(self, path: str, size: int, crc: Optional[int]) -> bool:
+        """ Check if the given file is identical to a file of the game.
+
+        Args:
+            path: Casefolded path of the file, relative to the data directory and
+                using "/" as separator.
+            size: Size of the file.
+            crc: CRC32 of the file, or None if unknown.
+
+        Returns: True if the game contains the same file, False otherwise (or if the
+            manifest is not ready).
+        """
+        files = self._files
+        if files is None or crc is None:
+            return False
+        return files.get(path) == (size, crc)
+
+
+class VanillaReport(NamedTuple):
+
+    """ Files of an archive dropped since they are identical to the game files. """
+
+    files: int
+    bytes: int
+
+
+def removeVanillaFiles(
+    analysis: ArchiveAnalysis, manifest: GameManifest, entries: Dict[str, ArchiveEntry]
+) -> VanillaReport:
+    """ Remove the files that would be installed for the given analysis and that are
+    identical to files of the game.
+
+    Args:
+        analysis: The analysis of the archive tree.
+        manifest: The manifest of the game files.
+        entries: The file entries of the archive, by casefolded path in the archive
+            (using "/" as separator), for their size and CRC32.
+
+    Returns: The number of files removed and their size.
+    """
+    total = 0
+    matches: List[Tuple[FileTree, int]] = []
+    for path, entry in iterInstalledEntries(analysis):
+        total += 1
+        archive_entry = entries.get(entry.path("/").casefold())
+        if archive_entry is not None and manifest.contains(
+            path.casefold(), archive_entry.size, archive_entry.crc
+        ):
+            matches.append((entry, archive_entry.size))
+
+    # MO2 cannot install empty mods, so nothing is removed if the archive only
+    # contains game files:
+    if not matches or len(matches) == total:
+        return VanillaReport(0, 0)
+
+    for entry, _ in matches:
+        entry.detach()
+
+    return VanillaReport(len(matches), sum(size for _, size in matches))
@@ -0,0 +1,257 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the content hashes of the archives, used to detect archives that
+were already installed under a different name.
+
+Archives are hashed in a thread pool when their download completes, so the check at
+installation time is only a lookup in a persistent table. hashlib releases the GIL
+while hashing large buffers, so archives can be hashed in parallel using threads.
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+
+from .store import SQLiteStore
+
+# Size of the chunks read when hashing archives:
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def hashArchive(
+    path: str,
+    chunk_size: int = HASH_CHUNK_SIZE,
+    stop: Optional[threading.Event] = None,
+) -> str:
+    """ Compute the content hash of an archive, reading it by chunks.
+
+    Args:
+        path: Path to the archive.
+        chunk_size: Size of the chunks to read.
+        stop: Event checked between chunks to interrupt the hash, if any.
+
+    Returns: The hash of the archive, as an hexadecimal string.
+
+    Raises:
+        InterruptedError: If the hash was interrupted (this is an OSError, so the
+            callers handle it as an archive that cannot be read).
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as fp:
+        while True:
+            if stop is not None and stop.is_set():
+                raise InterruptedError("the hash of {} was interrupted".format(path))
+            n = fp.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+def shutdownExecutor(
+    executor: ThreadPoolExecutor, futures: Iterable["Future[Any]"] = ()
+):
+    """ Shut the given executor down without waiting for it, canceling the tasks that
+    are not running yet.
+
+    Args:
+        executor: The executor to shut down.
+        futures: The futures of the pending tasks, canceled manually before Python
+            3.9 (since shutdown() cannot cancel them).
+    """
+    if sys.version_info >= (3, 9):
+        executor.shutdown(wait=False, cancel_futures=True)
+    else:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+class HashStore(SQLiteStore):
+
+    """ Persistent store of the hashes of the downloaded archives, and of the mods
+    installed from each hash, in a SQLite database.
+
+    The hashes of the archives are stored by path, with the size and modification time
+    of the archive so that modified archives are hashed again.
+    """
+
+    def _createTables(self, connection: sqlite3.Connection):
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS archives (
+                path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, hash TEXT
+            )"""
+        )
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS installed (
+                hash TEXT PRIMARY KEY, mod TEXT, time REAL
+            )"""
+        )
+
+    @staticmethod
+    def _key(archive: str) -> str:
+        return os.path.normcase(os.path.abspath(archive))
+
+    def archiveHash(self, archive: str) -> Optional[str]:
+        """ Retrieve the hash of an archive.
+
+        Args:
+            archive: Path to the archive.
+
+        Returns: The hash of the archive, or None if the archive has not been hashed
+            or was modified since it was hashed.
+        """
+        try:
+            stat = os.stat(archive)
+        except OSError:
+            return None
+
+        with self._lock:
+            row = (
+                self._open()
+                .execute(
+                    "SELECT size, mtime, hash FROM archives WHERE path = ?",
+                    (self._key(archive),),
+                )
+                .fetchone()
+            )
+
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            return None
+        return row[2]
+
+    def setArchiveHash(self, archive: str, size: int, mtime: int, hash: str):
+        """ Store the hash of an archive.
+
+        Args:
+            archive: Path to the archive.
+            size: Size of the archive when it was hashed.
+            mtime: Modification time (in ns) of the archive when it was hashed.
+            hash: Hash of the archive.
+        """
+        with self._lock:
+            connection = self._open()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO archives VALUES (?, ?, ?, ?)",
+                    (self._key(archive), size, mtime, hash),
+                )
+
+    def installedMod(self, hash: str) -> Optional[str]:
+        """ Retrieve the mod installed from an archive with the given hash.
+
+        Args:
+            hash: Hash of the archive.
+
+        Returns: The name of the mod, or None if no archive with this hash was
+            installed.
+        """
+        with self._lock:
+            row = (
+                self._open()
+                .execute("SELECT mod FROM installed WHERE hash = ?", (hash,))
+                .fetchone()
+            )
+        return None if row is None else row[0]
+
+    def setInstalledMod(self, hash: str, mod: str):
+        """ Store the mod installed from an archive with the given hash.
+
+        Args:
+            hash: Hash of the archive.
+            mod: Name of the mod.
+        """
+        with self._lock:
+            connection = self._open()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO installed VALUES (?, ?, ?)",
+                    (hash, mod, time.time()),
+                )
+
+
+class ArchiveHasher:
+
+    """ Hash archives in a thread pool and store the hashes in a HashStore. """
+
+    _store: HashStore
+    _executor: ThreadPoolExecutor
+
+    # Pending hashes, by archive:
+    _lock: threading.Lock
+    _pending: Dict[str, "Future[Optional[str]]"]
+
+    # Set when the hasher is shut down, to interrupt the running hashes:
+    _stop: threading.Event
+
+    def __init__(self, store: HashStore, max_workers: int = 2):
+        """
+        Args:
+            store: The store to store the hashes in.
+            max_workers: Maximum number of archives hashed at the same time.
+        """
+        self._store = store
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="installer_quick-hash"
+        )
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._stop = threading.Event()
+
+    def submit(self, archive: str) -> "Future[Optional[str]]":
+        """ Hash the given archive in the background, unless it is already being
+        hashed.
+
+        Args:
+            archive: Path to the archive.
+
+        Returns: A future containing the hash of the archive, or None if the archive
+            could not be read.
+        """
+        key = HashStore._key(archive)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._hash, archive)
+                self._pending[key] = future
+                future.add_done_callback(lambda _: self._done(key))
+        return future
+
+    def _done(self, key: str):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def _hash(self, archive: str) -> Optional[str]:
+        # The hash is only stored if the archive was not modified while hashing it:
+        try:
+            before = os.stat(archive)
+            hash = hashArchive(archive, stop=self._stop)
+            after = os.stat(archive)
+        except OSError:
+            return None
+
+        if (before.st_size, before.st_mtime_ns) != (after.st_size, after.st_mtime_ns):
+            return None
+
+        try:
+            self._store.setArchiveHash(archive, after.st_size, after.st_mtime_ns, hash)
+        except sqlite3.Error:
+            pass
+        return hash
+
+    def shutdown(self):
+        """ Shut this hasher down: the pending hashes are canceled and the running
+        ones are interrupted, so that the workers do not delay the exit of MO2. """
+        self._stop.set()
+        with self._lock:
+            pending = list(self._pending.values())
+        shutdownExecutor(self._executor, pending)
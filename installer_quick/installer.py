@@ -1,10 +1,18 @@
 # -*- encoding: utf-8 -*-
 
-from typing import Optional, Union
+import configparser
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 # MO2 ships with PyQt5, so you can use it in your plugins:
 from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QApplication, QWidget
+from PyQt5.QtWidgets import QApplication, QMessageBox, QWidget
 from PyQt5 import QtWidgets
 
 # You need to import mobase to access it.
@@ -15,6 +23,43 @@ import mobase
 
 # Note: Use relative import for anything in submodules.
 from .ui.simpleinstalldialog import Ui_SimpleInstallDialog
+from .analysis import ArchiveAnalysis, LayoutKind, findArchiveBase, restoreAnalysis
+from .batch import (
+    BatchInstallQueue,
+    BatchItem,
+    BatchReport,
+    InstallOutcome,
+    OtherInstaller,
+    findOtherInstaller,
+    findTreeInstaller,
+)
+from .cache import ArchiveIdentity, CachedVerdict, VerdictCache, archiveIdentity
+from .conflicts import (
+    ConflictReport,
+    ModPathIndex,
+    iterInstalledEntries,
+    iterInstalledFiles,
+    listModFiles,
+)
+from .context import GameContext, GameContextCache
+from .hashing import ArchiveHasher, HashStore
+from .dedup import DedupReport, Deduplicator, FileIndex
+from .delta import DeltaPlan, DeltaReport, finishDelta, planDelta
+from .footprint import DiskFootprint, formatSize, measureFootprint
+from .gamefiles import GameManifest, VanillaReport, removeVanillaFiles
+from .journal import InstallJournal, JournalEntry, filesDigest, planResume
+from .junk import JunkFilter, JunkReport, removeJunk
+from .listing import ArchiveEntry, findExtractor, findLister
+from .prescan import (
+    ScanVerdict,
+    SupportIndex,
+    scanArchiveInBackground,
+    scanArchivesInBackground,
+    scanDownloadsInBackground,
+)
+from .rules import CompiledRules, LayoutRules
+from .telemetry import PhaseTimer, TelemetryLog
+from .treestats import TreeStatsCache
 
 
 class SimpleInstallDialog(QtWidgets.QDialog):
@@ -28,9 +73,13 @@ class SimpleInstallDialog(QtWidgets.QDialog):
     """
 
     # Flag to indicate if the user chose to do a manual installation:
-    _manual: bool = False
+    _manual: bool
+
+    # Time (from time.perf_counter()) of the first paint of the dialog since the last
+    # call to reset(), or None if the dialog was not painted yet:
+    _paintedAt: Optional[float]
 
-    def __init__(self, name: mobase.GuessedString, parent: QWidget):
+    def __init__(self, parent: QWidget):
         super().__init__(parent)
 
         # Set the ui file:
@@ -38,14 +87,7 @@ class SimpleInstallDialog(QtWidgets.QDialog):
         self.ui.setupUi(self)
 
         self.setWindowFlag(Qt.WindowContextHelpButtonHint, False)
-
-        # mobase.GuessedString contains multiple names with various level of
-        # "guess". Using .variants() returns the list of names, and doing str(name)
-        # will return the most-likely value.
-        for value in name.variants():
-            self.ui.nameCombo.addItem(value)
         self.ui.nameCombo.completer().setCaseSensitivity(Qt.CaseSensitive)
-        self.ui.nameCombo.setCurrentIndex(self.ui.nameCombo.findText(str(name)))
 
         # We need to connect the Ok / Cancel / Manual buttons. We can of course use
         # PyQt5 signal/slot syntax:
@@ -58,6 +100,111 @@ class SimpleInstallDialog(QtWidgets.QDialog):
 
         self.ui.manualBtn.clicked.connect(manualClicked)
 
+        self._manual = False
+        self._paintedAt = None
+
+    def reset(
+        self,
+        name: mobase.GuessedString,
+        conflicts: Optional[ConflictReport] = None,
+        footprint: Optional[DiskFootprint] = None,
+    ):
+        """ Reset the dialog for a new installation. The dialog is created once and
+        re-used for all installations since creating it is quite slow.
+
+        Args:
+            name: The name of the mod to install.
+            conflicts: The conflicts of the archive with the installed mods, or None
+                if they are not known.
+            footprint: The disk footprint of the installation, or None if it is not
+                known.
+        """
+        self._manual = False
+        self._paintedAt = None
+
+        # mobase.GuessedString contains multiple names with various level of
+        # "guess". Using .variants() returns the list of names, and doing str(name)
+        # will return the most-likely value.
+        combo = self.ui.nameCombo
+        combo.clear()
+        combo.addItems(name.variants())
+        combo.setCurrentIndex(combo.findText(str(name)))
+
+        self._setConflicts(conflicts)
+        self._setFootprint(footprint)
+
+    def _setConflicts(self, conflicts: Optional[ConflictReport], top: int = 3):
+        """ Show the given conflicts in the dialog (only the mods with the most
+        conflicting files are named).
+
+        Args:
+            conflicts: The conflicts to show, or None to hide the conflicts.
+            top: Maximum number of mods to name.
+        """
+        label = self.ui.conflictLabel
+        if conflicts is None:
+            label.setVisible(False)
+            return
+
+        if conflicts.count == 0:
+            text = self.tr("No file from installed mods would be overwritten.")
+        else:
+            mods = ", ".join(
+                "{} ({})".format(mod, count) for mod, count in conflicts.mods[:top]
+            )
+            if len(conflicts.mods) > top:
+                mods += ", ..."
+            text = self.tr("{} file(s) would overwrite files from {} mod(s): {}")
+            text = text.format(conflicts.count, len(conflicts.mods), mods)
+
+        label.setText(text)
+        label.setVisible(True)
+
+    def _setFootprint(self, footprint: Optional[DiskFootprint]):
+        """ Show the size of the installation in the dialog, and prevent the user from
+        installing if there is not enough free space.
+
+        Args:
+            footprint: The footprint to show, or None to hide it.
+        """
+        label = self.ui.spaceLabel
+        self.ui.okBtn.setEnabled(footprint is None or footprint.fits)
+
+        if footprint is None:
+            label.setVisible(False)
+            return
+
+        # The size of the archive is only a lower bound of the size of the files:
+        if footprint.bytes is None:
+            size = None
+        elif footprint.estimated:
+            size = self.tr("at least {}").format(formatSize(footprint.bytes))
+        else:
+            size = formatSize(footprint.bytes)
+
+        if size is None:
+            text = self.tr("The free space could not be checked (unknown size).")
+        elif footprint.free is None:
+            text = self.tr("Size: {} (the free space could not be checked)")
+            text = text.format(size)
+        elif footprint.fits:
+            text = self.tr("Size: {} ({} free)")
+            text = text.format(size, formatSize(footprint.free))
+        else:
+            text = self.tr("Not enough space to install this mod: {} needed, {} free.")
+            text = text.format(size, formatSize(footprint.free))
+
+        label.setText(text)
+        label.setVisible(True)
+
+    def paintEvent(self, event):
+        if self._paintedAt is None:
+            self._paintedAt = time.perf_counter()
+        super().paintEvent(event)
+
+    def paintedAt(self) -> Optional[float]:
+        return self._paintedAt
+
     def getName(self):
         return self.ui.nameCombo.currentText()
 
@@ -76,6 +223,108 @@ class SimpleInstaller(mobase.IPluginInstallerSimple):
 
     _organizer: mobase.IOrganizer
 
+    # Rules describing the layouts accepted by this installer, and the compiled
+    # version of the rules (see _compiledRules()):
+    _rules: LayoutRules
+    _compiled: Optional[CompiledRules] = None
+
+    # Last analysis computed by _getSimpleArchiveBase():
+    _analysis: Optional[ArchiveAnalysis] = None
+
+    # Item of the batch queue currently being installed, if any, and priority of the
+    # installer meanwhile (higher than the priority of the other installers, so that
+    # MO2 asks this installer first, see isArchiveSupported()):
+    _batchItem: Optional[BatchItem] = None
+    _batchPriority: int = 1000
+
+    # Archive currently being installed, if any (see onInstallationStart()):
+    _archive: Optional[str] = None
+
+    # Results of the pre-scan of the downloads folder:
+    _index: SupportIndex
+
+    # Values read from MO2 on the hot paths, see GameContext:
+    _context: GameContextCache
+
+    # Statistics of the folders of the tree being installed (shared with the
+    # analysis):
+    _stats: TreeStatsCache
+
+    # Executor analyzing the downloaded archives (created when first used):
+    _speculator: Optional[ThreadPoolExecutor] = None
+
+    # Persistent cache of verdicts (opened when first used), and identity and cached
+    # verdict of the archive being installed:
+    _cache: Optional[VerdictCache] = None
+    _identity: Optional[ArchiveIdentity] = None
+    _verdict: Optional[CachedVerdict] = None
+
+    # Verdict to store in the cache if the installation succeeds:
+    _pendingVerdict: Optional[CachedVerdict] = None
+
+    # The installation dialog (created when first needed, see _installDialog()), and
+    # the time between the last request to open it and its first paint (in seconds):
+    _dialog: Optional[SimpleInstallDialog] = None
+    dialogLatency: Optional[float] = None
+
+    # Index of the files of the installed mods (built in the background once the
+    # user interface is initialized), and name of the mod being reinstalled:
+    _modPaths: ModPathIndex
+    _currentMod: Optional[str] = None
+
+    # Hashes of the downloaded archives and of the installed ones (created when first
+    # used), hash of the archive being installed (or the future computing it), and
+    # existing mod installed from the same archive:
+    _hashes: Optional[HashStore] = None
+    _hasher: Optional[ArchiveHasher] = None
+    _archiveHash: Optional[str] = None
+    _archiveHashFuture: Optional["Future[Optional[str]]"] = None
+    _duplicateOf: Optional[str] = None
+
+    # Junk entries found in the tree of the current installation (when computing its
+    # footprint), and junk entries removed from the tree:
+    _junkFilter: Optional[JunkFilter] = None
+    _junkReport: Optional[JunkReport] = None
+
+    # File entries of the current archive, see _listArchive():
+    _archiveEntries: Optional[Dict[str, ArchiveEntry]] = None
+    _archiveListed: bool = False
+
+    # Manifest of the game files (created when first used) and files of the current
+    # archive dropped since they are identical to game files:
+    _gameFiles: Optional[GameManifest] = None
+    _vanillaReport: Optional[VanillaReport] = None
+
+    # Disk footprint of the current installation, see _measureFootprint():
+    _footprint: Optional[DiskFootprint] = None
+
+    # ID of the mod being installed, and plan and report of the delta installation
+    # if the installation is an upgrade:
+    _modId: int = 0
+    _delta: Optional[DeltaPlan] = None
+    _deltaReport: Optional[DeltaReport] = None
+
+    # Journal of the installations (opened when first used), interrupted installation
+    # of the current archive found in the journal, whether the current installation
+    # is in the journal, files installed by the current installation (recorded in the
+    # journal for the delta installations) and whether the current installation
+    # resumed the interrupted one:
+    _journal: Optional[InstallJournal] = None
+    _interrupted: Optional[JournalEntry] = None
+    _journalStarted: bool = False
+    _journalFiles: Optional[List[str]]
+    _resumed: bool = False
+
+    # Index of the files of the mods and deduplicator of the installed mods (created
+    # when first used):
+    _files: Optional[FileIndex] = None
+    _deduplicator: Optional[Deduplicator] = None
+
+    # Timer for the phases of the current installation, and log of the timings
+    # (created when first used):
+    _timer: PhaseTimer
+    _telemetry: Optional[TelemetryLog] = None
+
     def __init__(self):
         super().__init__()
 
@@ -84,8 +333,134 @@ class SimpleInstaller(mobase.IPluginInstallerSimple):
 
     def init(self, organizer: mobase.IOrganizer):
         self._organizer = organizer
+        self._context = GameContextCache(self._loadContext)
+        self._index = SupportIndex()
+        self._stats = TreeStatsCache()
+        self._timer = PhaseTimer()
+        self._modPaths = ModPathIndex()
+        self._journalFiles = None
+
+        # These are the default rules, and they correspond to the layouts accepted by
+        # the official installer:
+        self._rules = LayoutRules()
+
+        # We can only start the pre-scan and index the mods once the managed game is
+        # known:
+        self._organizer.onUserInterfaceInitialized(lambda window: self._prescan())
+        self._organizer.onUserInterfaceInitialized(lambda window: self._indexMods())
+        self._organizer.onUserInterfaceInitialized(
+            lambda window: self._updateGameFiles()
+        )
+
+        # The files of the mods are removed from the journal with the mods - MO2 < 2.4
+        # does not notify plugins when mods are removed, so the journal may contain
+        # removed mods:
+        self._organizer.onUserInterfaceInitialized(
+            lambda window: self._watchRemovedMods()
+        )
+
+        # Archives are hashed as soon as they are downloaded:
+        self._organizer.onUserInterfaceInitialized(
+            lambda window: self._organizer.downloadManager().onDownloadComplete(
+                self._onDownloadComplete
+            )
+        )
+
+        # The background work is stopped when the main window is destroyed, so that
+        # the workers do not delay the exit of MO2:
+        self._organizer.onUserInterfaceInitialized(
+            lambda window: window.destroyed.connect(self._onUserInterfaceClosed)
+        )
+
+        # The compiled rules (and the cache, whose version depends on them) must be
+        # updated when the settings of the search change:
+        self._organizer.onPluginSettingChanged(self._onPluginSettingChanged)
+
+        # The data folder and the mod-data-checker depend on the game - MO2 < 2.4 does
+        # not notify plugins when the managed game changes, but it is restarted in this
+        # case anyway:
+        if hasattr(self._organizer, "onManagedGameChanged"):
+            self._organizer.onManagedGameChanged(lambda game: self._onGameChanged())
+
         return True
 
+    def _loadContext(self) -> Optional[GameContext]:
+        """ Read the values of the context from MO2, see GameContext.
+
+        Returns: The context, or None if the managed game is not known yet.
+        """
+        game = self._organizer.managedGame()
+        if game is None:
+            return None
+        return GameContext(
+            game.dataDirectory().dirName(),
+            game.feature(mobase.ModDataChecker),
+            {
+                setting.key: self._organizer.pluginSetting(self.name(), setting.key)
+                for setting in self.settings()
+            },
+        )
+
+    def _setting(self, key: str) -> Any:
+        """ Read a setting of this installer from the context (see GameContext), or
+        from MO2 if the context is not available yet.
+
+        Args:
+            key: Key of the setting.
+
+        Returns: The value of the setting.
+        """
+        value = self._context.setting(key)
+        if value is None:
+            value = self._organizer.pluginSetting(self.name(), key)
+        return value
+
+    def _onUserInterfaceClosed(self):
+        """ Stop the work done in the background, when MO2 is closed. """
+        if self._hasher is not None:
+            self._hasher.shutdown()
+        if self._deduplicator is not None:
+            self._deduplicator.shutdown()
+
+    def _onGameChanged(self):
+        # The compiled rules and the cache depend on the name of the data folder:
+        self._context.invalidate()
+        self._compiled = None
+        self._index.clear()
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    def _onPluginSettingChanged(
+        self, plugin: str, setting: str, old: object, new: object
+    ):
+        # The manifest of the game files is only built when needed:
+        if plugin == self.name() and setting == "vanilla" and new:
+            self._updateGameFiles()
+
+        # The context contains the values of all the settings:
+        if plugin == self.name():
+            self._context.invalidate()
+
+        if plugin != self.name() or setting not in (
+            "search_depth",
+            "search_budget",
+            "junk",
+            "data_contents",
+            "cache_size",
+        ):
+            return
+
+        self._compiled = None
+
+        # The results of the pre-scan depend on the rules too:
+        if setting != "cache_size":
+            self._index.clear()
+
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
     def name(self):
         return "Simple Installer (Python)"
 
@@ -93,13 +468,13 @@ class SimpleInstaller(mobase.IPluginInstallerSimple):
         return "Holt59"
 
     def description(self):
-        return self._tr("Installer for very simple archives... In python!")
+        return self.__tr("Installer for very simple archives... In python!")
 
     def version(self):
         return mobase.VersionInfo(0, 1, 0, mobase.ReleaseType.PRE_ALPHA)
 
     def isActive(self):
-        return self._organizer.pluginSetting(self.name(), "enabled")
+        return self._setting("enabled")
 
     def settings(self):
         return [
@@ -110,86 +485,625 @@ class SimpleInstaller(mobase.IPluginInstallerSimple):
             # MO2 quick installer has a priority of 50, so using 55 our python
             # installer will be used instead of the official one.
             mobase.PluginSetting("priority", "priority of this installer", 55),
+            mobase.PluginSetting(
+                "prescan", "scan the downloads folder in the background", False
+            ),
+            mobase.PluginSetting(
+                "speculative",
+                "analyze archives as soon as they are downloaded",
+                True,
+            ),
+            mobase.PluginSetting(
+                "cache_size",
+                "maximum number of archives in the cache (0 to disable the cache)",
+                5000,
+            ),
+            mobase.PluginSetting(
+                "conflicts", "show the conflicts with installed mods", True
+            ),
+            mobase.PluginSetting(
+                "duplicates", "detect archives that were already installed", True
+            ),
+            mobase.PluginSetting(
+                "delta",
+                "only extract the files that changed when upgrading a mod",
+                False,
+            ),
+            mobase.PluginSetting(
+                "resume",
+                "resume the installations interrupted by a crash instead of "
+                "extracting the whole archive again",
+                True,
+            ),
+            mobase.PluginSetting(
+                "vanilla",
+                "do not install files that are identical to the files of the game",
+                False,
+            ),
+            mobase.PluginSetting(
+                "dedup",
+                "replace files identical to files of other mods by hardlinks after "
+                "installing a mod (modifying a linked file modifies it in all mods)",
+                False,
+            ),
+            mobase.PluginSetting(
+                "telemetry", "log the time spent in each phase of installations", True
+            ),
+            mobase.PluginSetting(
+                "junk",
+                "patterns (separated by ;) of the files and folders not installed,"
+                " patterns starting with / only match at the root of the mod",
+                ";".join(LayoutRules().junk),
+            ),
+            mobase.PluginSetting(
+                "data_contents",
+                "patterns (separated by ;) of the files and folders that identify a"
+                " data folder of the game (e.g. textures;*.esp), used by the pre-scan"
+                " of the downloads folder",
+                "",
+            ),
+            mobase.PluginSetting(
+                "search_depth",
+                "maximum depth of the search for the data folder in the sub-folders"
+                " of an archive (0 to disable the search)",
+                2,
+            ),
+            mobase.PluginSetting(
+                "search_budget",
+                "maximum number of entries visited when searching for the data folder",
+                10000,
+            ),
         ]
 
     # Method for IPluginInstallerSimple:
 
     def priority(self):
-        return self._organizer.pluginSetting(self.name(), "priority")
+        # MO2 sorts the installers by priority for each installation:
+        if self._batchItem is not None:
+            return self._batchPriority
+        return self._setting("priority")
 
     def isManualInstaller(self) -> bool:
         # This method should usually return False. Only the official MO2 manual
         # installer returns True for this.
         return False
 
-    def _isDataTextArchiveTopLayer(
-        self, tree: mobase.IFileTree, data_name: str
-    ) -> bool:
-        """ Check if the given tree corresponds to a "data-text archive".
+    def onInstallationStart(
+        self, archive: str, reinstallation: bool, current_mod: mobase.IModInterface
+    ):
+        # This is called before isArchiveSupported() and install(), and is the only
+        # way to know which archive is being installed:
+        self._archive = archive
+        self._timer = PhaseTimer()
+        self.dialogLatency = None
+        self._junkReport = self._deltaReport = self._vanillaReport = None
+        self._footprint = self._junkFilter = None
+        self._archiveEntries, self._archiveListed = None, False
+        self._releaseTrees()
+
+        # Files from the mod being reinstalled are not conflicts:
+        self._currentMod = None
+        if reinstallation and current_mod is not None:
+            self._currentMod = current_mod.name()
+
+        # Look for a previous verdict for the same archive:
+        self._identity = self._verdict = self._pendingVerdict = None
+        cache = self._verdictCache()
+        if cache is not None:
+            try:
+                self._identity = archiveIdentity(archive)
+                self._verdict = cache.get(self._identity)
+            except (OSError, sqlite3.Error):
+                pass
+
+        # Look for an interrupted installation of the same archive:
+        self._interrupted = self._findInterrupted(archive)
+
+        # Look for a mod installed from the same archive:
+        self._findDuplicate(archive)
+
+    def onInstallationEnd(
+        self, result: mobase.InstallResult, new_mod: mobase.IModInterface
+    ):
+        # Store the verdict for the archive if it was installed:
+        if (
+            result == mobase.InstallResult.SUCCESS
+            and self._cache is not None
+            and self._identity is not None
+            and self._pendingVerdict is not None
+        ):
+            try:
+                self._cache.put(self._identity, self._pendingVerdict)
+            except sqlite3.Error:
+                pass
+
+        # Extract the unchanged files that are missing and delete the old files if
+        # this was a delta installation (the plan is dropped otherwise):
+        if result == mobase.InstallResult.SUCCESS and new_mod is not None:
+            with self._timer.phase("delta"):
+                self._finishDelta(new_mod)
+
+        # The entry of the journal is kept if the installation failed since some
+        # files may have been extracted - This must be done after the delta
+        # installation since it records the installed files:
+        self._finishJournal(result, new_mod)
+
+        # Log the timings if this installer was used:
+        if "install" in self._timer:
+            self._logTimings(result)
+
+        # Update the files of the new mod in the index and remember which archive
+        # it was installed from (whatever the installer):
+        if result == mobase.InstallResult.SUCCESS and new_mod is not None:
+            self._indexMod(new_mod)
+            self._setInstalledHash(new_mod.name())
+            self._deduplicate(new_mod)
+
+        self._archive = self._identity = self._verdict = self._pendingVerdict = None
+        self._currentMod = self._duplicateOf = self._delta = None
+        self._interrupted = self._journalFiles = self._junkFilter = None
+        self._journalStarted = False
+        self._resumed = False
+        self._releaseTrees()
+        self._archiveHash = self._archiveHashFuture = None
+
+    def _releaseTrees(self):
+        """ Drop everything that refers to the trees of the current archive (the
+        memoized analysis and the statistics), so that the trees can be released and
+        are not mixed with the trees of the next archive. """
+        self._analysis = None
+        self._stats.clear()
+
+    def _archiveHasher(self) -> Optional[ArchiveHasher]:
+        """ Retrieve the archive hasher, creating it if needed.
+
+        Returns: The archive hasher, or None if the detection of duplicates is
+            disabled.
+        """
+        if not self._setting("duplicates"):
+            return None
+
+        if self._hasher is None:
+            self._hashes = HashStore(
+                os.path.join(
+                    self._organizer.pluginDataPath(), "installer_quick", "hashes.sqlite"
+                )
+            )
+            self._hasher = ArchiveHasher(self._hashes)
+        return self._hasher
+
+    def _onDownloadComplete(self, index: int):
+        archive = self._organizer.downloadManager().downloadPath(index)
+
+        hasher = self._archiveHasher()
+        if hasher is not None:
+            hasher.submit(archive)
 
-        A "Data-Text Archive" contains a single folder named "data" or whatever the
-        data directory is called for the current game, together with txt or pdf files.
+        self._analyzeDownload(archive)
+
+    def _analyzeDownload(self, archive: str):
+        """ Analyze the given archive in the background, if enabled, so that its
+        layout and the possible names of the mod are known when it is installed.
 
         Args:
-            tree: The tree to check.
-            data_name: Name of the data folder (e.g., "data" for Bethesda games).
-
-        Returns: True if the given tree is a data-text archive, False otherwise.
-        """
-
-        # We are looking for a single folder called `data_name` and some txt/pdf files.
-        data_found = txt_found = False
-
-        # You can iterate a mobase.IFileTree (but should not modify the tree while
-        # iterating it):
-        for e in tree:
-            if e.isDir():
-                # You can compare a tree entry with a string using ==. It is recommended
-                # instead of doing e.name() == data_name because e == data_name is case
-                # insensitive.
-                if data_found or e == data_name:
-                    return False
-                data_found = True
-            if e.isFile():
-                # e.suffix() returns the extension of the file (without the .).
-                if e.suffix().lower() not in ["txt", "pdf"]:
-                    return False
-                txt_found = True
-
-        # The tree corresponds to a data-text archive if it contains a "data" folder and
-        # some txt/pdf files:
-        return data_found and txt_found
+            archive: Path to the archive.
+        """
+        if not self._setting("speculative"):
+            return
+
+        # A single thread is enough since downloads complete one at a time:
+        if self._speculator is None:
+            self._speculator = ThreadPoolExecutor(
+                1, thread_name_prefix="installer_quick-speculative"
+            )
+
+        scanArchiveInBackground(
+            archive, self._compiledRules(), self._index, self._speculator
+        )
+
+    def _findDuplicate(self, archive: str):
+        """ Find the mod installed from an archive identical to the given one. This
+        only uses the hashes computed in the background, the archive is hashed now
+        only if it has not been hashed yet, and this hash is only used to remember
+        the mod installed from the archive.
+
+        Args:
+            archive: Path to the archive being installed.
+        """
+        hasher = self._archiveHasher()
+        if hasher is None or self._hashes is None:
+            return
+
+        try:
+            self._archiveHash = self._hashes.archiveHash(archive)
+            if self._archiveHash is None:
+                self._archiveHashFuture = hasher.submit(archive)
+                return
+            mod = self._hashes.installedMod(self._archiveHash)
+        except sqlite3.Error:
+            return
+
+        # The mod may have been removed, and reinstalling a mod from the same archive
+        # is not a duplicate:
+        if (
+            mod is not None
+            and mod != self._currentMod
+            and mod in self._organizer.modList().allMods()
+        ):
+            self._duplicateOf = mod
+
+    def _setInstalledHash(self, mod: str):
+        """ Remember that the given mod was installed from the current archive.
+
+        Args:
+            mod: Name of the installed mod.
+        """
+        store = self._hashes
+
+        def setInstalledMod(hash: Optional[str]):
+            if store is not None and hash is not None:
+                try:
+                    store.setInstalledMod(hash, mod)
+                except sqlite3.Error:
+                    pass
+
+        # If the hash is still being computed, we do not wait for it:
+        future = self._archiveHashFuture
+        if future is not None:
+            future.add_done_callback(lambda f: setInstalledMod(f.result()))
+        else:
+            setInstalledMod(self._archiveHash)
+
+    def _deduplicate(self, mod: mobase.IModInterface):
+        """ Replace the files of the given mod that are identical to files of other
+        mods by hardlinks, in the background, if enabled.
+
+        Args:
+            mod: The installed mod.
+        """
+        if not self._setting("dedup"):
+            return
+
+        if self._deduplicator is None:
+            self._files = FileIndex(
+                os.path.join(
+                    self._organizer.pluginDataPath(), "installer_quick", "files.sqlite"
+                )
+            )
+            self._deduplicator = Deduplicator(self._files)
+
+        # The first time, the other mods are added to the index - The mod list can only
+        # be used from the main thread, so we retrieve the paths of the mods here:
+        others = None
+        try:
+            if self._files.isEmpty():
+                modlist = self._organizer.modList()
+                others = [
+                    (name, modlist.getMod(name).absolutePath())
+                    for name in modlist.allMods()
+                ]
+        except sqlite3.Error:
+            return
+
+        name, start = mod.name(), time.perf_counter()
+        future = self._deduplicator.submit(name, mod.absolutePath(), others)
+
+        # The report is logged when the deduplication ends, as a separate record - The
+        # log is retrieved here since the settings should only be read from the main
+        # thread:
+        telemetry = self._telemetryLog()
+        if telemetry is None:
+            return
+
+        def logReport(future: "Future[DedupReport]"):
+            try:
+                report = future.result()
+            except (OSError, sqlite3.Error):
+                return
+            timer = PhaseTimer()
+            timer.add("dedup", time.perf_counter() - start)
+            try:
+                telemetry.append(timer.toRecord(mod=name, dedup=report._asdict()))
+            except OSError:
+                pass
+
+        future.add_done_callback(logReport)
+
+    def _telemetryLog(self) -> Optional[TelemetryLog]:
+        """ Retrieve the telemetry log, creating it if needed.
+
+        Returns: The telemetry log, or None if the telemetry is disabled.
+        """
+        if not self._setting("telemetry"):
+            return None
+
+        if self._telemetry is None:
+            self._telemetry = TelemetryLog(
+                os.path.join(
+                    self._organizer.pluginDataPath(),
+                    "installer_quick",
+                    "telemetry.jsonl",
+                )
+            )
+        return self._telemetry
+
+    def _logTimings(self, result: mobase.InstallResult):
+        """ Append the timings of the current installation to the telemetry log, if
+        enabled.
+
+        Args:
+            result: The result of the installation.
+        """
+        telemetry = self._telemetryLog()
+        if telemetry is None:
+            return
+
+        verdict = self._pendingVerdict
+        junk, delta, vanilla = self._junkReport, self._deltaReport, self._vanillaReport
+        footprint = self._footprint
+        record = self._timer.toRecord(
+            archive=os.path.basename(self._archive) if self._archive else None,
+            result=result.name,
+            kind=verdict.kind.name if verdict is not None else None,
+            depth=verdict.depth if verdict is not None else None,
+            dialogLatency=None
+            if self.dialogLatency is None
+            else round(self.dialogLatency * 1000, 4),
+            junkFiles=junk.files if junk is not None else None,
+            junkBytes=junk.bytes if junk is not None else None,
+            vanillaFiles=vanilla.files if vanilla is not None else None,
+            vanillaBytes=vanilla.bytes if vanilla is not None else None,
+            installFiles=footprint.files if footprint is not None else None,
+            installBytes=footprint.bytes if footprint is not None else None,
+            installEstimated=footprint.estimated if footprint is not None else None,
+            spaceChecked=footprint.checked if footprint is not None else None,
+            delta=delta._asdict() if delta is not None else None,
+            resumed=self._resumed,
+            context=self._context.counters(),
+            stats=self._stats.counters(),
+        )
+
+        try:
+            telemetry.append(record)
+        except OSError:
+            pass
+
+    def _verdictCache(self) -> Optional[VerdictCache]:
+        """ Retrieve the cache of verdicts, opening it if needed.
+
+        Returns: The cache of verdicts, or None if the cache is disabled.
+        """
+        cache_size = self._setting("cache_size")
+        if not cache_size or cache_size <= 0:
+            return None
+
+        if self._cache is None:
+            self._cache = VerdictCache(
+                os.path.join(
+                    self._organizer.pluginDataPath(), "installer_quick", "cache.sqlite"
+                ),
+                self._compiledRules().version,
+                cache_size,
+            )
+        return self._cache
+
+    def _prescan(self):
+        """ Start the pre-scan of the downloads folder, if enabled. """
+        if not self._setting("prescan"):
+            return
+
+        scanDownloadsInBackground(
+            self._organizer.downloadsPath(), self._compiledRules(), self._index
+        )
+
+    def _indexMods(self):
+        """ Start building the index of the files of the installed mods, if the
+        conflicts are enabled. """
+        if not self._setting("conflicts"):
+            return
+
+        # The mod list can only be used from the main thread, so we retrieve the
+        # paths of the mods here and only list the folders in the background:
+        modlist = self._organizer.modList()
+        mods = [
+            (name, modlist.getMod(name).absolutePath()) for name in modlist.allMods()
+        ]
+
+        threading.Thread(
+            target=lambda: self._modPaths.build(mods),
+            name="installer_quick-conflicts",
+            daemon=True,
+        ).start()
+
+        # Removed mods are removed from the index - MO2 < 2.4 does not notify plugins
+        # when mods are removed, so the index may contain removed mods:
+        if hasattr(modlist, "onModRemoved"):
+            modlist.onModRemoved(self._modPaths.removeMod)
+
+    def _indexMod(self, mod: mobase.IModInterface):
+        """ Update the files of the given mod in the index, in the background.
+
+        Args:
+            mod: The mod to update.
+        """
+        if not self._modPaths.isReady():
+            return
+
+        name, path = mod.name(), mod.absolutePath()
+        threading.Thread(
+            target=lambda: self._modPaths.setMod(name, listModFiles(path)),
+            name="installer_quick-conflicts",
+            daemon=True,
+        ).start()
+
+    def _findConflicts(self, analysis: ArchiveAnalysis) -> Optional[ConflictReport]:
+        """ Find the conflicts of the files to install with the installed mods.
+
+        Args:
+            analysis: The analysis of the archive tree.
+
+        Returns: The conflicts, or None if the index of the installed mods is not
+            ready yet.
+        """
+        if not self._modPaths.isReady():
+            return None
+        with self._timer.phase("conflicts"):
+            return self._modPaths.conflicts(
+                iterInstalledFiles(analysis), exclude=self._currentMod
+            )
+
+    def _compiledRules(self) -> CompiledRules:
+        """ Retrieve the compiled rules of this installer, compiling them if needed.
+
+        The rules cannot be compiled in init() since they depend on the name of the
+        data folder, and the managed game is not known yet at this point.
+
+        Returns: The compiled rules.
+        """
+        if self._compiled is None:
+            # Retrieve the name of the "data" folder:
+            data_name = self._context.get("dataName")
+            self._compiled = CompiledRules(
+                self._rules._replace(
+                    searchDepth=self._setting("search_depth"),
+                    searchBudget=self._setting("search_budget"),
+                    junk=tuple(
+                        pattern.strip()
+                        for pattern in self._setting("junk").split(";")
+                        if pattern.strip()
+                    ),
+                    dataContents=tuple(
+                        pattern.strip()
+                        for pattern in self._setting("data_contents").split(";")
+                        if pattern.strip()
+                    ),
+                ),
+                data_name,
+            )
+
+            # The statistics do not count the entries ignored by the rules:
+            self._stats.reset(self._compiled.isIgnored)
+        return self._compiled
+
+    def scanArchives(self, archives: List[str]) -> threading.Thread:
+        """ Pre-scan the given archives (the ones already scanned are skipped) in a
+        background thread, so that isQuickInstallable() can answer for them. This does
+        not depend on the prescan setting.
+
+        Args:
+            archives: Paths to the archives to scan.
+
+        Returns: The (started) thread scanning the archives.
+        """
+        return scanArchivesInBackground(archives, self._compiledRules(), self._index)
+
+    def isQuickInstallable(self, archive: str) -> Optional[bool]:
+        """ Check if the given archive can be installed by this installer, using the
+        results of the pre-scan of the downloads folder (or of scanArchives()).
+
+        Args:
+            archive: Path to the archive.
+
+        Returns: True if the archive can be installed, False if it cannot, or None if
+            the archive has not been scanned or its support depends on the game.
+        """
+        result = self._index.get(archive)
+        if result is None or result.verdict is ScanVerdict.UNKNOWN:
+            return None
+        return result.verdict is ScanVerdict.SUPPORTED
 
     def _getSimpleArchiveBase(
-        self, tree: mobase.IFileTree, data_name: str, checker: mobase.ModDataChecker
-    ) -> Optional[mobase.IFileTree]:
+        self, tree: mobase.IFileTree
+    ) -> Optional[ArchiveAnalysis]:
         """ Try to find the data folder in the given tree.
 
+        MO2 calls isArchiveSupported() and then install() with the same tree, so the
+        analysis is memoized and reused if the tree has not been modified between
+        the two calls.
+
         Args:
             tree: Tree to look the data folder in.
-            data_name: Name of the data folder (e.g., "data" for Bethesda games).
-            checker: Checker to use to check if a tree is a data folder.
 
-        Returns: A tree corresponding to the data-folder, or to a folder containing the
-            data-folder with txt/pdfs files, or None if such folder was not found.
+        Returns: The analysis of the tree, or None if the data folder was not found.
         """
 
+        # Re-use the last analysis if it was computed for this tree:
+        if self._analysis is not None and self._analysis.isValidFor(tree):
+            return self._analysis
+
+        timer = self._timer
+
+        with timer.phase("lookup"):
+            rules = self._compiledRules()
+
+            # Retrieve the mod-data-checker:
+            checker: Optional[mobase.ModDataChecker] = self._context.get("checker")
+
         if checker is None:
             return None
 
-        while True:
-            # If the tree is valid, we simple return it:
-            if checker.dataLooksValid(tree) == mobase.ModDataChecker.VALID:
-                return tree
-            # If the tree is a data-text archive, also return it:
-            elif self._isDataTextArchiveTopLayer(tree, data_name):
-                return tree
-            # If the tree contains a single folder, recurse into it (this is very useful
-            # since a lot of mod archives contains a useless folder at the root):
-            elif len(tree) == 1 and tree[0].isDir():
-                tree = tree[0]  # type: ignore
-            else:
-                return None
+        # The analysis only needs a predicate to check if a tree is valid - Each call
+        # to the checker is timed since this is where most of the time is spent for
+        # some games:
+        def isValid(tree: mobase.IFileTree) -> bool:
+            start = time.perf_counter()
+            valid = checker.dataLooksValid(tree) == mobase.ModDataChecker.VALID
+            timer.sample("checker", time.perf_counter() - start)
+            return valid
+
+        # The time spent in the analysis outside of the checker is the time spent
+        # walking the tree (single folders, data-text archives, ...):
+        start = time.perf_counter()
+        checked = timer.phases.get("checker", 0.0)
+
+        # We only keep the last analysis since MO2 installs archives one at a time:
+        self._analysis = self._analyzeTree(tree, rules, isValid)
+
+        timer.add(
+            "layout",
+            time.perf_counter() - start - (timer.phases.get("checker", 0.0) - checked),
+        )
+
+        return self._analysis
+
+    def _analyzeTree(
+        self,
+        tree: mobase.IFileTree,
+        rules: CompiledRules,
+        isValid: Callable[[mobase.IFileTree], bool],
+    ) -> Optional[ArchiveAnalysis]:
+        """ Analyze the given tree, using the cached verdict or the results of the
+        pre-scan if possible.
+
+        Args:
+            tree: The tree to analyze.
+            rules: The rules to use.
+            isValid: Predicate to use to check if a tree is a data folder.
+
+        Returns: The analysis of the tree, or None if the data folder was not found.
+        """
+
+        # If the archive was installed before, we only need to check the base that
+        # was found previously:
+        if self._verdict is not None:
+            analysis = restoreAnalysis(
+                tree,
+                rules,
+                isValid,
+                self._verdict.base,
+                self._verdict.kind,
+            )
+            if analysis is not None:
+                return analysis
+
+        # If the archive was pre-scanned, we do not need to walk the tree again:
+        hint = None
+        if self._archive is not None:
+            result = self._index.get(self._archive)
+            if result is not None:
+                hint = result.hint
+
+        return findArchiveBase(tree, rules, isValid, hint, self._stats)
 
     def isArchiveSupported(self, tree: mobase.IFileTree) -> bool:
         """ Check if the given file-tree (from the archive) can be installed by this
@@ -201,17 +1115,22 @@ class SimpleInstaller(mobase.IPluginInstallerSimple):
         Returns: True if the file-tree can be installed, false otherwise.
         """
 
-        # Retrieve the name of the "data" folder:
-        data_name = self._organizer.managedGame().dataDirectory().dirName()
-
-        # Retrieve the mod-data-checker:
-        checker: mobase.ModDataChecker = self._organizer.managedGame().feature(
-            mobase.ModDataChecker
-        )
+        # When installing from a batch queue, we accept every archive so that the
+        # other installers (e.g. the manual installer) do not open dialogs -
+        # Unsupported archives are reported as requiring a manual installation by
+        # install(), and the archives that the other installers would claim are
+        # skipped before if they can be listed (see _installBatchItem()), or here:
+        if self._batchItem is not None:
+            if findLister(self._batchItem.archive) is None:
+                reason = self._otherInstallerReason(findTreeInstaller(tree))
+                if reason is not None:
+                    self._batchItem.outcome = InstallOutcome.MANUAL_REQUESTED
+                    self._batchItem.error = reason
+            return True
 
         # Do the actual check - Convert to bool or do `is not None` to avoid
         # issue with Python > C++ conversion:
-        return bool(self._getSimpleArchiveBase(tree, data_name, checker))
+        return bool(self._getSimpleArchiveBase(tree))
 
     def install(
         self,
@@ -237,53 +1156,87 @@ class SimpleInstaller(mobase.IPluginInstallerSimple):
             of the mod, in case those were updated by the installer.
         """
 
-        # Retrieve the name of the "data" folder:
-        data_name = self._organizer.managedGame().dataDirectory().dirName()
+        # The ID of the mod is used to find the mod to upgrade (see _planDelta()):
+        self._modId = modId
 
-        # Retrieve the mod-data-checker:
-        checker: mobase.ModDataChecker = self._organizer.managedGame().feature(
-            mobase.ModDataChecker
-        )
+        with self._timer.phase("install"):
+            return self._install(name, otree)
 
-        # Retrieve the archive base:
-        tree = self._getSimpleArchiveBase(otree, data_name, checker)
+    def _install(
+        self, name: mobase.GuessedString, otree: mobase.IFileTree
+    ) -> Union[mobase.InstallResult, mobase.IFileTree]:
+        """ Perform the actual installation, see install(). """
 
-        # This should never happen, but better safe than sorry!
-        if tree is None:
-            return mobase.InstallResult.FAILED
+        # Retrieve the archive base (this re-uses the analysis from
+        # isArchiveSupported()):
+        analysis = self._getSimpleArchiveBase(otree)
 
-        # We create the dialog and show it to the user:
-        dialog = SimpleInstallDialog(name, self._parentWidget())
+        # The tree is going to be modified, so we drop the memoized analysis (this
+        # also releases the reference to the archive tree):
+        self._analysis = None
 
-        # Note: Unlike the official installer, we do not have a "silent" setting,
-        # but it is really simple to add it.
-        if dialog.exec() == QtWidgets.QDialog.Accepted:
+        # The size of the installation is checked before anything is extracted, so
+        # that installations that would fill the disk are refused early:
+        if analysis is not None:
+            self._footprint = self._measureFootprint(analysis)
 
-            # We update the name with the user specified one:
-            name.update(dialog.getName(), mobase.GuessQuality.USER)
+        # When installing from a batch queue, we never show the dialog:
+        if self._batchItem is not None:
+            return self._installBatchTree(self._batchItem, name, analysis)
+
+        # This should never happen, but better safe than sorry!
+        if analysis is None:
+            return mobase.InstallResult.FAILED
 
-            # If the archive is a "data-text archive", we set the root to the
-            # data folder and move everything in it (using detach() and merge()):
-            if self._isDataTextArchiveTopLayer(tree, data_name):
+        # The names found by the pre-scan (or the analysis of the download) are only
+        # added as variants, MO2 usually has better guesses (e.g. from Nexus):
+        result = self._index.get(self._archive) if self._archive else None
+        if result is not None:
+            for variant in result.names:
+                name.update(variant, mobase.GuessQuality.FALLBACK)
+
+        # If the archive was installed before, we propose the same name:
+        if self._verdict is not None and self._verdict.modName:
+            name.update(self._verdict.modName, mobase.GuessQuality.PRESET)
+
+        # If the installation of the archive was interrupted, we propose the name
+        # used at the time so that it can be resumed:
+        if self._interrupted is not None:
+            name.update(self._interrupted.name, mobase.GuessQuality.PRESET)
+
+        # If the same archive was already installed, the user can skip it or install
+        # it in the existing mod:
+        if self._duplicateOf is not None:
+            choice = self._askDuplicate(self._duplicateOf)
+            if choice is None:
+                return mobase.InstallResult.CANCELED
+            elif choice:
+                name.update(self._duplicateOf, mobase.GuessQuality.USER)
+
+        # We retrieve the dialog and show it to the user:
+        opened_at = time.perf_counter()
+        dialog = self._installDialog(
+            name, self._findConflicts(analysis), self._footprint
+        )
 
-                # We get the "data" folder:
-                ntree: mobase.IFileTree = tree.find(data_name)  # type: ignore
+        # Note: Unlike the official installer, we do not have a "silent" setting,
+        # but it is really simple to add it (see installBatch() for an example).
+        with self._timer.phase("dialog"):
+            accepted = dialog.exec() == QtWidgets.QDialog.Accepted
 
-                # .detach() remove the entry from its parent, so the "data" tree is
-                # removed from the original tree:
-                ntree.detach()
+        painted_at = dialog.paintedAt()
+        self.dialogLatency = None if painted_at is None else painted_at - opened_at
 
-                # .merge() will move everything from the original tree in the "data"
-                # folder:
-                ntree.merge(tree)
+        if accepted:
 
-                # The tree is now the "data" folder:
-                tree = ntree
+            # We update the name with the user specified one:
+            name.update(dialog.getName(), mobase.GuessQuality.USER)
+            self._setPendingVerdict(analysis, dialog.getName())
 
             # We return the modified tree to the installation manager.
             # Note: Unlike the C++ version, we need to return the new tree since
             # assigning `tree = ...` is not sufficient in Python.
-            return tree
+            return self._restructureTree(analysis, dialog.getName())
 
         # If user requested a manual installation, we update the name (to keep it
         # in the manual installation dialog) and just notify the installation manager:
@@ -295,7 +1248,784 @@ class SimpleInstaller(mobase.IPluginInstallerSimple):
         else:
             return mobase.InstallResult.CANCELED
 
-    def _tr(self, str):
+    def _askDuplicate(self, mod: str) -> Optional[bool]:
+        """ Ask the user what to do with an archive that was already installed.
+
+        Args:
+            mod: Name of the mod installed from the same archive.
+
+        Returns: None to skip the archive, True to install it in the existing mod, or
+            False to install it normally.
+        """
+        box = QMessageBox(
+            QMessageBox.Question,
+            self.__tr("Archive already installed"),
+            self.__tr(
+                "An identical archive was already installed as '{}'. Do you want to "
+                "install it again?"
+            ).format(mod),
+            parent=self._parentWidget(),
+        )
+        skip = box.addButton(self.__tr("Skip"), QMessageBox.RejectRole)
+        reuse = box.addButton(self.__tr("Use existing mod"), QMessageBox.AcceptRole)
+        box.addButton(self.__tr("Install anyway"), QMessageBox.AcceptRole)
+        box.setDefaultButton(skip)
+        box.exec()
+
+        clicked = box.clickedButton()
+        if clicked is skip or clicked is None:
+            return None
+        return clicked is reuse
+
+    def _installDialog(
+        self,
+        name: mobase.GuessedString,
+        conflicts: Optional[ConflictReport],
+        footprint: Optional[DiskFootprint],
+    ) -> SimpleInstallDialog:
+        """ Retrieve the installation dialog, ready for a new installation.
+
+        Args:
+            name: The name of the mod to install.
+            conflicts: The conflicts of the archive with the installed mods.
+            footprint: The disk footprint of the installation.
+
+        Returns: The dialog, created if needed.
+        """
+        parent = self._parentWidget()
+
+        # The dialog is re-created if the main window changed (this should not happen
+        # in practice):
+        if self._dialog is None or self._dialog.parentWidget() is not parent:
+            self._dialog = SimpleInstallDialog(parent)
+
+        self._dialog.reset(name, conflicts, footprint)
+        return self._dialog
+
+    def _setPendingVerdict(self, analysis: ArchiveAnalysis, modName: str):
+        """ Set the verdict to store in the cache if the installation succeeds. This
+        must be called before the tree is modified.
+
+        Args:
+            analysis: The analysis of the archive tree.
+            modName: The name chosen for the mod.
+        """
+        base = ""
+        if analysis.depth > 0:
+            base = analysis.base.pathFrom(analysis.tree, "/")
+        self._pendingVerdict = CachedVerdict(
+            base, analysis.depth, analysis.kind, modName
+        )
+
+    def _restructureTree(
+        self, analysis: ArchiveAnalysis, modName: Optional[str] = None
+    ) -> mobase.IFileTree:
+        """ Create the tree to install from the given analysis.
+
+        Args:
+            analysis: The analysis of the archive tree.
+            modName: Name of the mod to install, if known. This is used to upgrade
+                existing mods (see _planDelta()).
+
+        Returns: The tree to install, i.e., the data folder of the archive.
+        """
+
+        # Junk entries are removed first so that they are not moved around:
+        self._junkReport = self._removeJunk(analysis)
+
+        # Files identical to the game files are not installed:
+        self._vanillaReport = self._removeVanilla(analysis)
+
+        # The unchanged files of an upgraded mod (or the files extracted before an
+        # interruption) are removed from the tree - This must be done before
+        # restructuring the tree since we need the path of the entries in the
+        # archive:
+        if modName is not None:
+            with self._timer.phase("delta"):
+                # The files to install are only collected for the delta installations
+                # and the resumption of interrupted installations:
+                files = None
+                if self._setting("delta") or self._interrupted is not None:
+                    files = self._installedArchiveEntries(analysis)
+                self._delta = self._planDelta(analysis, modName, files)
+                if self._delta is None:
+                    self._delta = self._planResume(analysis, modName, files)
+                    self._resumed = self._delta is not None
+                self._beginJournal(analysis, modName, files)
+
+        start = time.perf_counter()
+
+        tree = analysis.base
+
+        # If the archive is a "data-text archive", we need to move everything in the
+        # data folder and use it as the root:
+        if analysis.kind == LayoutKind.DATA_TEXT:
+
+            # We get the "data" folder (found during the analysis):
+            ntree: mobase.IFileTree = analysis.data
+
+            # .detach() remove the entry from its parent, so the "data" tree is
+            # removed from the original tree:
+            ntree.detach()
+
+            # .merge() moves the entries of a tree one at a time, so we want to move
+            # the smallest set of entries. Archives often contain a lot of text files
+            # next to a small data folder, in which case it is faster to move the
+            # content of the data folder up and keep the current tree as the root.
+            # This is only possible if no entry of the data folder has the same name
+            # as one of the text files since the ones from the data folder should be
+            # overwritten:
+            if len(ntree) < len(tree) and not any(
+                tree.find(e.name()) is not None for e in ntree
+            ):
+                tree.merge(ntree)
+
+            # .merge() will move everything from the original tree in the "data"
+            # folder:
+            else:
+                ntree.merge(tree)
+
+                # The tree is now the "data" folder:
+                tree = ntree
+
+        # The trees are modified and handed to MO2, so the statistics are dropped:
+        self._releaseTrees()
+
+        self._timer.add("restructure", time.perf_counter() - start)
+
+        return tree
+
+    def _removeJunk(self, analysis: ArchiveAnalysis) -> JunkReport:
+        """ Remove the junk entries from the base of the given analysis.
+
+        Args:
+            analysis: The analysis of the archive tree.
+
+        Returns: The number of files removed and their size (if known).
+        """
+
+        # IFileTree does not contain the size of the files, so we need to read them
+        # from the archive (the archive is only listed if there are junk entries) -
+        # The junk entries are usually found when computing the footprint, otherwise
+        # we need to walk the installed files:
+        junk, self._junkFilter = self._junkFilter, None
+        with self._timer.phase("junk"):
+            if junk is None:
+                return removeJunk(analysis, self._compiledRules(), self._listArchive)
+            return junk.remove(self._listArchive)
+
+    def _measureFootprint(self, analysis: ArchiveAnalysis) -> DiskFootprint:
+        """ Compute the disk footprint of the installation of the given analysis.
+
+        The junk entries are found during the same pass (see _removeJunk()) and
+        are not counted, but the footprint is computed before the vanilla files are
+        removed, so it slightly over-estimates the size of the installation.
+
+        Args:
+            analysis: The analysis of the archive tree.
+
+        Returns: The footprint of the installation.
+        """
+        # The size of the archive is used when the archive cannot be listed:
+        archive_size = None
+        if self._archive:
+            try:
+                archive_size = os.path.getsize(self._archive)
+            except OSError:
+                pass
+
+        self._junkFilter = JunkFilter(self._compiledRules())
+        with self._timer.phase("footprint"):
+            return measureFootprint(
+                analysis,
+                self._listArchive(),
+                self._organizer.modsPath(),
+                self._junkFilter.iterInstalledEntries(analysis),
+                archive_size,
+            )
+
+    def _listArchive(self) -> Optional[Dict[str, ArchiveEntry]]:
+        """ List the file entries of the current archive, without extracting it. The
+        entries are only listed once per installation.
+
+        Returns: The file entries of the archive, by casefolded path in the archive
+            (using "/" as separator), or None if the archive cannot be listed.
+        """
+        if self._archiveListed:
+            return self._archiveEntries
+        self._archiveListed = True
+
+        archive = self._archive
+        lister = findLister(archive) if archive else None
+        if lister is None:
+            return None
+
+        try:
+            self._archiveEntries = {
+                entry.path.casefold(): entry
+                for entry in lister(archive)
+                if not entry.isDir
+            }
+        except Exception:
+            # The listers can fail in many ways (corrupted archives, ...), in which
+            # case we simply do not use the entries:
+            pass
+        return self._archiveEntries
+
+    def _removeVanilla(self, analysis: ArchiveAnalysis) -> Optional[VanillaReport]:
+        """ Remove the files identical to the files of the game from the given
+        analysis, if enabled.
+
+        Args:
+            analysis: The analysis of the archive tree.
+
+        Returns: The number of files removed and their size, or None if the files
+            were not compared with the game files.
+        """
+        manifest = self._gameFiles
+        if (
+            manifest is None
+            or not manifest.isReady()
+            or not self._setting("vanilla")
+        ):
+            return None
+
+        entries = self._listArchive()
+        if entries is None:
+            return None
+
+        with self._timer.phase("vanilla"):
+            return removeVanillaFiles(analysis, manifest, entries)
+
+    def _updateGameFiles(self):
+        """ Update the manifest of the game files in the background, if enabled. """
+        if not self._setting("vanilla"):
+            return
+
+        # The manifest is stored per data directory since the plugin data are shared
+        # between the instances of MO2:
+        folder = self._organizer.managedGame().dataDirectory().absolutePath()
+        key = hashlib.blake2b(
+            os.path.normcase(folder).encode("utf-8"), digest_size=8
+        ).hexdigest()
+
+        if self._gameFiles is None:
+            self._gameFiles = GameManifest(
+                os.path.join(
+                    self._organizer.pluginDataPath(),
+                    "installer_quick",
+                    "gamefiles-{}.sqlite".format(key),
+                )
+            )
+
+        manifest = self._gameFiles
+
+        def update():
+            try:
+                manifest.update(folder)
+            except sqlite3.Error:
+                pass
+
+        threading.Thread(
+            target=update, name="installer_quick-gamefiles", daemon=True
+        ).start()
+
+    def _installedArchiveEntries(
+        self, analysis: ArchiveAnalysis
+    ) -> Optional[Dict[str, Tuple[str, ArchiveEntry]]]:
+        """ Retrieve the archive entries of the files that would be installed for the
+        given analysis.
+
+        Args:
+            analysis: The analysis of the archive tree.
+
+        Returns: The files to install, by casefolded path in the mod folder, with
+            their path in the mod folder and their entry in the archive, or None if
+            the archive cannot be listed.
+        """
+        installed = self._iterInstalledArchiveEntries(analysis)
+        if installed is None:
+            return None
+
+        files = {}
+        for path, archive_entry in installed:
+            if archive_entry is None:
+                return None
+            files[path.casefold()] = (path, archive_entry)
+        return files
+
+    def _iterInstalledArchiveEntries(
+        self, analysis: ArchiveAnalysis
+    ) -> Optional[Iterator[Tuple[str, Optional[ArchiveEntry]]]]:
+        """ Iterate the archive entries of the files that would be installed for the
+        given analysis.
+
+        Args:
+            analysis: The analysis of the archive tree.
+
+        Returns: The files to install, with their path in the mod folder and their
+            entry in the archive (None if the file is not in the listing), or None if
+            the archive cannot be listed.
+        """
+        entries = self._listArchive()
+        if entries is None:
+            return None
+
+        return (
+            (path, entries.get(entry.path("/").casefold()))
+            for path, entry in iterInstalledEntries(analysis)
+        )
+
+    def _detachUnchanged(self, analysis: ArchiveAnalysis, plan: DeltaPlan):
+        """ Remove the unchanged files of the given plan from the tree.
+
+        Args:
+            analysis: The analysis of the archive tree.
+            plan: The plan of the delta installation.
+        """
+        unchanged = {path.casefold() for path in plan.unchanged}
+        for path, entry in list(iterInstalledEntries(analysis)):
+            if path.casefold() in unchanged:
+                entry.detach()
+
+    def _planDelta(
+        self,
+        analysis: ArchiveAnalysis,
+        modName: str,
+        files: Optional[Dict[str, Tuple[str, ArchiveEntry]]],
+    ) -> Optional[DeltaPlan]:
+        """ Plan the delta installation of the archive if it is a new version of an
+        installed mod, and remove the unchanged files from the tree.
+
+        The delta installation is only used if the delta setting is enabled, if a mod
+        with the given name and the same ID is installed, and if the archive can be
+        listed (for the CRC of the files) and extracted (to restore the files if the
+        user replaces the mod). In any other case, the whole archive is installed.
+
+        Args:
+            analysis: The analysis of the archive tree.
+            modName: Name of the mod to install.
+            files: The files to install, see _installedArchiveEntries().
+
+        Returns: The plan of the delta installation, or None for a full installation.
+        """
+        archive = self._archive
+        if (
+            not self._setting("delta")
+            or archive is None
+            or files is None
+            or self._modId <= 0
+            or findExtractor(archive) is None
+            or modName not in self._organizer.modList().allMods()
+        ):
+            return None
+
+        # MO2 stores the ID of the mod in meta.ini:
+        folder = os.path.join(self._organizer.modsPath(), modName)
+        meta = configparser.ConfigParser(interpolation=None)
+        try:
+            meta.read(os.path.join(folder, "meta.ini"), encoding="utf-8")
+            if meta.getint("General", "modid", fallback=0) != self._modId:
+                return None
+        except (configparser.Error, ValueError):
+            return None
+
+        # Only the files installed by the previous version can be removed, the other
+        # ones were added by the user (the journal is always opened here):
+        try:
+            previous = self._installJournal().installedFiles(folder)  # type: ignore
+        except sqlite3.Error:
+            previous = None
+
+        plan = planDelta(archive, folder, files, previous)
+
+        # Nothing to gain, or nothing to install (MO2 cannot install empty trees):
+        if plan is None or not plan.unchanged or len(plan.unchanged) == len(files):
+            return None
+
+        self._detachUnchanged(analysis, plan)
+        return plan
+
+    def _installJournal(self) -> Optional[InstallJournal]:
+        """ Retrieve the journal of the installations, opening it if needed.
+
+        Returns: The journal, or None if both the resumption of installations and the
+            delta installations (that use the installed files recorded in the journal)
+            are disabled.
+        """
+        if not self._setting("resume") and not self._setting("delta"):
+            return None
+
+        if self._journal is None:
+            path = os.path.join(
+                self._organizer.pluginDataPath(), "installer_quick", "journal.sqlite"
+            )
+            self._journal = InstallJournal(path)
+        return self._journal
+
+    def _findInterrupted(self, archive: str) -> Optional[JournalEntry]:
+        """ Find the last interrupted installation of the given archive.
+
+        Args:
+            archive: Path to the archive.
+
+        Returns: The entry of the installation in the journal, or None if there is
+            none (or if the resumption of installations is disabled).
+        """
+        journal = self._installJournal()
+        if journal is None or not self._setting("resume"):
+            return None
+
+        try:
+            if self._identity is None:
+                self._identity = archiveIdentity(archive)
+            return journal.find(self._identity)
+        except (OSError, sqlite3.Error):
+            return None
+
+    def _beginJournal(
+        self,
+        analysis: ArchiveAnalysis,
+        modName: str,
+        files: Optional[Dict[str, Tuple[str, ArchiveEntry]]],
+    ):
+        """ Record the installation of the given analysis in the journal, before MO2
+        extracts the files, and remember the files to install for _finishJournal().
+
+        Args:
+            analysis: The analysis of the archive tree.
+            modName: Name of the mod to install.
+            files: The files to install, see _installedArchiveEntries(), or None if
+                they were not collected.
+        """
+        journal = self._installJournal()
+        if journal is None or self._archive is None:
+            return
+
+        # The installed files are only needed for the next delta installation:
+        if files is not None and self._setting("delta"):
+            self._journalFiles = [path for path, _ in files.values()]
+
+        if not self._setting("resume"):
+            return
+
+        # The files can only be resumed if their CRC is known - They are hashed while
+        # they are walked if they were not collected for the delta installation:
+        installed = (
+            files.values()
+            if files is not None
+            else self._iterInstalledArchiveEntries(analysis)
+        )
+        digest = filesDigest(installed) if installed is not None else None
+        if digest is None:
+            return
+
+        base = ""
+        if analysis.depth > 0:
+            base = analysis.base.pathFrom(analysis.tree, "/")
+
+        try:
+            if self._identity is None:
+                self._identity = archiveIdentity(self._archive)
+            journal.begin(self._identity, JournalEntry(modName, base, digest))
+            self._journalStarted = True
+        except (OSError, sqlite3.Error):
+            pass
+
+    def _finishJournal(
+        self, result: mobase.InstallResult, mod: Optional[mobase.IModInterface]
+    ):
+        """ Remove the current installation from the journal, and record the files
+        installed in the mod if the installation succeeded.
+
+        Args:
+            result: The result of the installation. The entry of the installation is
+                kept if the installation failed since some files may have been
+                extracted.
+            mod: The installed mod, if any. The files are recorded for the folder of
+                this mod since it can differ from the name chosen in the dialog (e.g.
+                if the user renamed the mod when MO2 asked to merge or replace it).
+        """
+        journal = self._journal
+        if journal is None:
+            return
+
+        try:
+            if self._journalStarted and result != mobase.InstallResult.FAILED:
+                journal.finish(self._identity)  # type: ignore
+
+            files = self._journalFiles
+            if result == mobase.InstallResult.SUCCESS and mod is not None and files:
+                journal.setInstalledFiles(mod.absolutePath(), files)
+        except sqlite3.Error:
+            pass
+
+    def _watchRemovedMods(self):
+        """ Remove the files of the removed mods from the journal. """
+        modlist = self._organizer.modList()
+        if hasattr(modlist, "onModRemoved"):
+            modlist.onModRemoved(self._onModRemoved)
+
+    def _onModRemoved(self, name: str):
+        journal = self._installJournal()
+        if journal is None:
+            return
+        try:
+            journal.removeMod(os.path.join(self._organizer.modsPath(), name))
+        except sqlite3.Error:
+            pass
+
+    def _planResume(
+        self,
+        analysis: ArchiveAnalysis,
+        modName: str,
+        files: Optional[Dict[str, Tuple[str, ArchiveEntry]]],
+    ) -> Optional[DeltaPlan]:
+        """ Plan the resumption of the interrupted installation of the archive, and
+        remove the files that were completely extracted from the tree.
+
+        The installation is only resumed if it is installed with the same name and
+        from the same base as the interrupted one, and if the archive can be extracted
+        (to restore the files if the user replaces the mod).
+
+        Args:
+            analysis: The analysis of the archive tree.
+            modName: Name of the mod to install.
+            files: The files to install, see _installedArchiveEntries().
+
+        Returns: The plan of the installation, or None for a full installation.
+        """
+        interrupted, archive = self._interrupted, self._archive
+        if (
+            interrupted is None
+            or archive is None
+            or files is None
+            or interrupted.name != modName
+            or findExtractor(archive) is None
+        ):
+            return None
+
+        base = ""
+        if analysis.depth > 0:
+            base = analysis.base.pathFrom(analysis.tree, "/")
+        if base != interrupted.base:
+            return None
+
+        folder = os.path.join(self._organizer.modsPath(), modName)
+        plan = planResume(archive, folder, interrupted, files)
+
+        # Nothing extracted, or nothing to install (MO2 cannot install empty trees):
+        if plan is None or not plan.unchanged or len(plan.unchanged) == len(files):
+            return None
+
+        self._detachUnchanged(analysis, plan)
+        return plan
+
+    def _finishDelta(self, mod: mobase.IModInterface):
+        """ Finish the delta installation of the given mod, see finishDelta().
+
+        Args:
+            mod: The installed mod.
+        """
+        plan = self._delta
+        if plan is None:
+            return
+
+        extractor = findExtractor(plan.archive)
+        try:
+            self._deltaReport = finishDelta(plan, mod.absolutePath(), extractor)
+        except Exception as e:
+            message = self.__tr(
+                "Some files of '{}' could not be extracted, you should reinstall "
+                "this mod: {}"
+            ).format(mod.name(), e)
+
+            # The batch queue reports the errors at the end instead:
+            if self._batchItem is not None:
+                self._batchItem.error = message
+            else:
+                QMessageBox.warning(
+                    self._parentWidget(),
+                    self.__tr("Incomplete installation"),
+                    message,
+                )
+
+    def installBatch(
+        self,
+        queue: BatchInstallQueue,
+        progress: Optional[Callable[[int, BatchItem], Any]] = None,
+    ) -> BatchReport:
+        """ Install all the pending archives of the given queue without showing any
+        dialog (see batchtool.BatchInstallTool for the user interface).
+
+        The archives that would need a choice from the user are not installed but
+        reported in the outcome of their item:
+          - archives that cannot be installed by this installer are not forwarded to
+            the installers with a lower priority (e.g. the manual installer), and
+            are reported as requiring a manual installation,
+          - archives that would be claimed by an installer with a higher priority
+            (e.g. FOMOD installers) are reported the same way - This installer is
+            asked first while installing from the queue, so the archives without a
+            lister are checked from their tree,
+          - archives whose mod already exists are skipped since MO2 would ask to
+            merge or replace the existing mod.
+
+        Args:
+            queue: The queue containing the archives to install.
+            progress: Function called before installing each archive, see
+                BatchInstallQueue.run().
+
+        Returns: A report containing the outcome for each archive.
+        """
+        return queue.run(self._installBatchItem, progress)
+
+    def _installBatchItem(self, item: BatchItem) -> Optional[mobase.IModInterface]:
+        """ Install a single item from a batch queue.
+
+        Args:
+            item: The item to install.
+
+        Returns: The installed mod, or None if the installation failed or the archive
+            was skipped.
+        """
+
+        # The archives that the other installers would claim are skipped without
+        # being opened by MO2 when they can be listed (see isArchiveSupported()):
+        reason = self._findBatchConflict(item.archive)
+        if reason is not None:
+            item.outcome = InstallOutcome.MANUAL_REQUESTED
+            item.error = reason
+            return None
+
+        # When the name is known, existing mods are skipped without opening the
+        # archive (see also _installBatchTree()):
+        if item.name and self._modExists(item.name):
+            item.outcome = InstallOutcome.EXISTS
+            item.modName = item.name
+            return None
+
+        # The item is used by isArchiveSupported() and install() - We can install the
+        # archive using the organizer, which will call our installer:
+        self._batchItem = item
+        try:
+            return self._organizer.installMod(item.archive, item.name or "")
+        finally:
+            self._batchItem = None
+
+    def _findBatchConflict(self, archive: str) -> Optional[str]:
+        """ Check if the given archive would be claimed by an installer with a higher
+        priority than this one (that would show a dialog).
+
+        Args:
+            archive: Path to the archive.
+
+        Returns: The reason why the archive cannot be installed from a batch queue, or
+            None if it can (or if the archive cannot be listed, see
+            isArchiveSupported()).
+        """
+        lister = findLister(archive)
+        if lister is None:
+            return None
+
+        try:
+            other = findOtherInstaller(lister(archive))
+        except Exception as e:
+            return self.__tr("This archive cannot be read: {}").format(e)
+
+        return self._otherInstallerReason(other)
+
+    def _otherInstallerReason(self, other: Optional[OtherInstaller]) -> Optional[str]:
+        """ Retrieve the reason to report for an archive claimed by another installer.
+
+        Args:
+            other: The installer that would claim the archive, if any.
+
+        Returns: The reason why the archive cannot be installed from a batch queue, or
+            None if no other installer would claim it.
+        """
+        if other is OtherInstaller.FOMOD:
+            return self.__tr("This archive contains a FOMOD installer.")
+        elif other is OtherInstaller.SCRIPTED:
+            return self.__tr("This archive contains a scripted installer.")
+        elif other is OtherInstaller.BUNDLE:
+            return self.__tr("This archive only contains other archives.")
+        return None
+
+    def _modExists(self, name: str) -> bool:
+        """ Check if a mod with the given name exists, i.e., if MO2 would ask the user
+        to merge or replace it when installing a mod with this name.
+
+        Args:
+            name: Name of the mod.
+
+        Returns: True if the mod exists, False otherwise.
+        """
+        # MO2 checks the folder of the mod (whose name is case-insensitive on
+        # Windows), not the mod list:
+        return os.path.isdir(os.path.join(self._organizer.modsPath(), name))
+
+    def _installBatchTree(
+        self,
+        item: BatchItem,
+        name: mobase.GuessedString,
+        analysis: Optional[ArchiveAnalysis],
+    ) -> Union[mobase.InstallResult, mobase.IFileTree]:
+        """ Install the tree of an archive from a batch queue.
+
+        Args:
+            item: The item of the batch queue being installed.
+            name: The "name" of the mod.
+            analysis: The analysis of the archive tree, if it could be installed.
+
+        Returns: The tree to install or an InstallResult.
+        """
+
+        # Returning MANUAL_REQUESTED would open the manual installer, so we only
+        # record the outcome for this archive and cancel the installation (the outcome
+        # may already be set by isArchiveSupported()):
+        if analysis is None or item.outcome is InstallOutcome.MANUAL_REQUESTED:
+            item.outcome = InstallOutcome.MANUAL_REQUESTED
+            return mobase.InstallResult.CANCELED
+
+        # Archives that were already installed are not installed again:
+        if self._duplicateOf is not None:
+            item.outcome = InstallOutcome.DUPLICATE
+            item.modName = self._duplicateOf
+            return mobase.InstallResult.CANCELED
+
+        # There is nobody to free some space, so the archive is simply skipped:
+        footprint = self._footprint
+        if footprint is not None and not footprint.fits:
+            size = formatSize(footprint.bytes)
+            if footprint.estimated:
+                size = self.__tr("at least {}").format(size)
+            item.outcome = InstallOutcome.FAILED
+            item.error = self.__tr(
+                "Not enough space to install this mod: {} needed, {} free."
+            ).format(size, formatSize(footprint.free))
+            return mobase.InstallResult.CANCELED
+
+        # The archive is installed anyway, but the user should know that nothing
+        # prevented it from filling the disk:
+        if footprint is not None and not footprint.checked:
+            item.warning = self.__tr("the free space could not be checked")
+
+        # Use the name from the queue if there is one, otherwise keep the best guess
+        # from MO2:
+        if item.name:
+            name.update(item.name, mobase.GuessQuality.USER)
+
+        # MO2 would ask to merge or replace the existing mod:
+        if self._modExists(str(name)):
+            item.outcome = InstallOutcome.EXISTS
+            item.modName = str(name)
+            return mobase.InstallResult.CANCELED
+
+        item.outcome = InstallOutcome.INSTALLED
+        self._setPendingVerdict(analysis, str(name))
+        return self._restructureTree(analysis, str(name))
+
+    def __tr(self, str):
         # We need this to translate string in Python. Check the common documentation
         # for more details:
-        return QApplication.translate("SimpleInstallerPython", str)
+        return QApplication.translate("SimpleInstaller", str)
@@ -0,0 +1,267 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the journal of the installations, so that an installation that
+was interrupted (e.g. if MO2 crashed or was killed while extracting a large archive)
+can be resumed instead of starting again from zero.
+
+MO2 extracts the tree returned by the installer itself, so the installer cannot know
+which files were extracted before the crash. Instead, the journal contains a digest
+of the files that should be extracted (with their size and CRC32 in the archive), and
+when the same archive is installed again with the same files, the files already in
+the mod folder are verified: the files that are complete are not extracted again (see
+delta.planDelta()).
+
+An entry is written to the journal before MO2 extracts the files and removed when
+the installation ends, so the entries only remain for interrupted installations.
+
+The journal also records the files installed in the folder of each mod, so that the
+delta installation of the next version of the mod only deletes files installed by the
+installer (see delta.planDelta()). The files are stored in a single compressed row
+per mod, which is removed with the mod.
+"""
+
+import array
+import hashlib
+import itertools
+import os
+import sqlite3
+import time
+import zlib
+
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Tuple
+
+from .cache import ArchiveIdentity
+from .delta import DeltaPlan, planDelta
+from .listing import ArchiveEntry
+from .store import SQLiteStore
+
+
+class JournalEntry(NamedTuple):
+
+    """ Entry of the journal for an installation. """
+
+    # Name of the mod:
+    name: str
+
+    # Path to the base of the archive (using "/" as separator, empty for the root):
+    base: str
+
+    # Digest of the files to extract, see filesDigest():
+    digest: bytes
+
+
+# Number of files hashed at once by filesDigest():
+DIGEST_CHUNK = 4096
+
+
+def filesDigest(
+    files: Iterable[Tuple[str, Optional[ArchiveEntry]]]
+) -> Optional[bytes]:
+    """ Compute the digest of the given files, to check that an installation installs
+    the same files as an interrupted one.
+
+    Args:
+        files: The files to install, with their path in the mod folder (using "/" as
+            separator) and their entry in the archive (None if the file is not in
+            the listing of the archive). The files are listed in the order of the
+            archive tree, so the order is the same for the same archive.
+
+    Returns: The digest of the files, or None if the CRC of some files is not known
+        (the files cannot be verified in this case).
+    """
+    # The fields are hashed column by column, which is much faster than formatting
+    # each file, by chunks so that the columns are not built for all the files:
+    digests = [hashlib.blake2b(digest_size=16) for _ in range(4)]
+    iterator = iter(files)
+    while True:
+        chunk = list(itertools.islice(iterator, DIGEST_CHUNK))
+        if not chunk:
+            break
+        if any(entry is None or entry.crc is None for _, entry in chunk):
+            return None
+
+        for digest, texts in zip(
+            digests,
+            (
+                (path for path, _ in chunk),
+                (entry.path for _, entry in chunk),  # type: ignore
+            ),
+        ):
+            digest.update("\0".join(texts).encode("utf-8", "surrogatepass") + b"\0")
+        for digest, numbers in zip(
+            digests[2:],
+            (
+                (entry.size for _, entry in chunk),  # type: ignore
+                (entry.crc for _, entry in chunk),  # type: ignore
+            ),
+        ):
+            digest.update(array.array("Q", numbers).tobytes())  # type: ignore
+
+    return hashlib.blake2b(
+        b"".join(digest.digest() for digest in digests), digest_size=16
+    ).digest()
+
+
+class InstallJournal(SQLiteStore):
+
+    """ Persistent journal of the installations, in a SQLite database. """
+
+    def _createTables(self, connection: sqlite3.Connection):
+        # The tables of the first version of the journal stored one row per file:
+        for table in ("installs", "files", "installed"):
+            connection.execute("DROP TABLE IF EXISTS {}".format(table))
+
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS interrupted (
+                size INTEGER, mtime INTEGER, hash BLOB,
+                name TEXT, base TEXT, digest BLOB, started REAL,
+                PRIMARY KEY (size, mtime, hash)
+            )"""
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS mods (folder TEXT PRIMARY KEY, files BLOB)"
+        )
+
+    @staticmethod
+    def _key(folder: str) -> str:
+        return os.path.normcase(os.path.abspath(folder))
+
+    def begin(self, identity: ArchiveIdentity, entry: JournalEntry):
+        """ Record the start of an installation, replacing the previous entry for the
+        same archive.
+
+        Args:
+            identity: Identity of the archive being installed.
+            entry: The entry for the installation.
+        """
+        with self._lock:
+            connection = self._open()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO interrupted VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (*identity, entry.name, entry.base, entry.digest, time.time()),
+                )
+
+    def find(self, identity: ArchiveIdentity) -> Optional[JournalEntry]:
+        """ Find the interrupted installation of the given archive.
+
+        Args:
+            identity: Identity of the archive.
+
+        Returns: The entry for the installation, or None if there is none.
+        """
+        with self._lock:
+            row = (
+                self._open()
+                .execute(
+                    """SELECT name, base, digest FROM interrupted
+                        WHERE size = ? AND mtime = ? AND hash = ?""",
+                    identity,
+                )
+                .fetchone()
+            )
+        return None if row is None else JournalEntry(*row)
+
+    def finish(self, identity: ArchiveIdentity):
+        """ Remove the entry of the installation of the given archive.
+
+        Args:
+            identity: Identity of the archive.
+        """
+        with self._lock:
+            connection = self._open()
+            with connection:
+                connection.execute(
+                    "DELETE FROM interrupted WHERE size = ? AND mtime = ? AND hash = ?",
+                    identity,
+                )
+
+    def setInstalledFiles(self, folder: str, files: Iterable[str]):
+        """ Record the files installed in the given mod folder, replacing the ones
+        recorded for the previous installation.
+
+        Args:
+            folder: Folder of the mod.
+            files: The installed files, by path in the folder (using "/" as
+                separator).
+        """
+        data = zlib.compress(
+            "\n".join(path.casefold() for path in files).encode(
+                "utf-8", "surrogatepass"
+            )
+        )
+        with self._lock:
+            connection = self._open()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO mods VALUES (?, ?)",
+                    (self._key(folder), data),
+                )
+
+    def installedFiles(self, folder: str) -> Optional[FrozenSet[str]]:
+        """ Retrieve the files installed in the given mod folder by the last
+        successful installation.
+
+        Args:
+            folder: Folder of the mod.
+
+        Returns: The casefolded paths of the files in the folder (using "/" as
+            separator), or None if the mod was not installed by this installer.
+        """
+        key = self._key(folder)
+        with self._lock:
+            row = (
+                self._open()
+                .execute("SELECT files FROM mods WHERE folder = ?", (key,))
+                .fetchone()
+            )
+        if row is None:
+            return None
+        text = zlib.decompress(row[0]).decode("utf-8", "surrogatepass")
+        return frozenset(text.split("\n") if text else ())
+
+    def removeMod(self, folder: str):
+        """ Forget the files installed in the given mod folder, e.g., when the mod is
+        removed.
+
+        Args:
+            folder: Folder of the mod.
+        """
+        with self._lock:
+            connection = self._open()
+            with connection:
+                connection.execute(
+                    "DELETE FROM mods WHERE folder = ?", (self._key(folder),)
+                )
+
+
+def planResume(
+    archive: str,
+    folder: str,
+    entry: JournalEntry,
+    files: Dict[str, Tuple[str, ArchiveEntry]],
+) -> Optional[DeltaPlan]:
+    """ Plan the resumption of an interrupted installation, i.e., find the files of
+    the mod folder that were completely extracted before the interruption.
+
+    Args:
+        archive: Path to the archive.
+        folder: Folder of the mod being installed.
+        entry: The entry of the interrupted installation.
+        files: The files that would be installed, by casefolded path in the mod folder,
+            with their path in the mod folder (using "/" as separator) and their entry
+            in the archive.
+
+    Returns: The plan of the installation, as a delta installation that does not
+        remove any file, or None if the installation cannot be resumed (e.g. if the
+        files to install changed since the interruption).
+    """
+    # The files must be the same as the ones of the interrupted installation (this
+    # also checks that the CRC of all of them is known to verify them):
+    if filesDigest(files.values()) != entry.digest:
+        return None
+
+    # The other files of the folder are left alone (the folder may contain files
+    # from a previous installation if the user chose to merge):
+    return planDelta(archive, folder, files)
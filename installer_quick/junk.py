@@ -0,0 +1,192 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the filter removing the junk entries (e.g. Thumbs.db or
+__MACOSX folders) from archive trees before they are installed, so that they are not
+extracted.
+
+The junk entries can be anywhere in the tree, so finding them requires a walk of all
+the installed files. The installer already walks them to compute the footprint of the
+installation (see footprint.measureFootprint()), so the junk entries are found during
+this walk by JunkFilter and only removed when the tree is restructured.
+"""
+
+import itertools
+
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .analysis import ArchiveAnalysis, FileTree, LayoutKind, walkTree
+from .listing import ArchiveEntry
+from .rules import CompiledRules
+
+# Function returning the file entries of the archive, by casefolded path in the archive
+# (using "/" as separator), or None if they are not known:
+EntriesGetter = Callable[[], Optional[Dict[str, ArchiveEntry]]]
+
+
+class JunkReport(NamedTuple):
+
+    """ Report of the entries removed by JunkFilter.remove(). """
+
+    # Number of files removed (including the ones in removed folders):
+    files: int
+
+    # Total size of the files removed, or None if the size of the entries is not
+    # known:
+    bytes: Optional[int]
+
+
+def _countFiles(tree: FileTree, paths: List[str]):
+    for _, entry in walkTree(tree):
+        if not entry.isDir():
+            paths.append(entry.path("/").casefold())
+
+
+class JunkFilter:
+
+    """ Filter of the files installed for an analysis, that finds the junk entries
+    while the files are iterated and removes them afterwards.
+
+    The patterns of the rules starting with "/" are only checked on the entries at
+    the root of the mod, i.e., the entries of the data folder and the entries next
+    to it for data-text archives.
+    """
+
+    _rules: CompiledRules
+
+    # Junk entries found by the last iteration, and trees that must be kept even if
+    # they are empty after the junk entries are removed (the roots of the mod):
+    _junk: List[FileTree]
+    _roots: Tuple[FileTree, ...]
+
+    def __init__(self, rules: CompiledRules):
+        """
+        Args:
+            rules: The rules to use.
+        """
+        self._rules = rules
+        self._junk = []
+        self._roots = ()
+
+    def iterInstalledEntries(
+        self, analysis: ArchiveAnalysis
+    ) -> Iterator[Tuple[str, FileTree]]:
+        """ Iterate the file entries that would be installed for the given analysis
+        (see conflicts.iterInstalledEntries()), except the junk ones. The junk entries
+        are recorded and can be removed with remove() once the iteration is done.
+
+        Args:
+            analysis: The analysis of the archive tree.
+
+        Yields: The paths of the files, relative to the mod folder and using "/" as
+            separator, with their entry in the archive tree.
+        """
+        rules = self._rules
+        top = analysis.base if analysis.data is None else analysis.data
+        self._junk = []
+        self._roots = (analysis.tree, analysis.base, top)
+
+        # The entries next to the data folder are installed at the root of the mod
+        # too:
+        entries = iter(top)
+        if analysis.kind == LayoutKind.DATA_TEXT:
+            entries = itertools.chain(
+                entries, (e for e in analysis.base if e is not analysis.data)
+            )
+
+        # Junk folders are recorded but not walked:
+        def descend(entry: FileTree) -> bool:
+            if rules.isJunk(entry.name()):
+                self._junk.append(entry)
+                return False
+            return True
+
+        # When there are only patterns for the root of the mod, we do not need to
+        # check the names of the entries of the sub-folders:
+        nested = rules.hasNestedJunk()
+
+        for entry in entries:
+            name = entry.name()
+            if rules.isJunk(name, root=True):
+                self._junk.append(entry)
+            elif not entry.isDir():
+                yield name, entry
+            else:
+                for path, sub in walkTree(
+                    entry, name + "/", descend if nested else None
+                ):
+                    if sub.isDir():
+                        continue
+                    if nested and rules.isJunk(sub.name()):
+                        self._junk.append(sub)
+                    else:
+                        yield path, sub
+
+    def remove(self, entries: Optional[EntriesGetter] = None) -> JunkReport:
+        """ Remove the junk entries found by the last iteration from their tree. The
+        folders left empty are removed too, except the roots of the mod.
+
+        Args:
+            entries: Function returning the file entries of the archive, used for the
+                size of the removed files. This is only called if junk entries were
+                found.
+
+        Returns: The number of files removed and their total size.
+        """
+        junk, self._junk = self._junk, []
+        if not junk:
+            return JunkReport(0, 0)
+
+        # The paths must be computed before the entries are detached:
+        paths: List[str] = []
+        for entry in junk:
+            if entry.isDir():
+                _countFiles(entry, paths)
+            else:
+                paths.append(entry.path("/").casefold())
+
+        for entry in junk:
+            parent = entry.parent()
+            entry.detach()
+            while (
+                parent is not None
+                and len(parent) == 0
+                and not any(parent is root for root in self._roots)
+            ):
+                entry, parent = parent, parent.parent()
+                entry.detach()
+
+        size = None
+        table = entries() if entries is not None else None
+        if table is not None:
+            size = 0
+            for path in paths:
+                entry = table.get(path)
+                if entry is not None:
+                    size += entry.size
+
+        return JunkReport(len(paths), size)
+
+
+def removeJunk(
+    analysis: ArchiveAnalysis,
+    rules: CompiledRules,
+    entries: Optional[EntriesGetter] = None,
+) -> JunkReport:
+    """ Remove the junk entries from the files installed for the given analysis.
+
+    This walks all the installed files, prefer JunkFilter when the files are already
+    walked for something else.
+
+    Args:
+        analysis: The analysis of the archive tree.
+        rules: The rules to use.
+        entries: See JunkFilter.remove().
+
+    Returns: The number of files removed and their total size.
+    """
+    junk = JunkFilter(rules)
+    if rules.hasJunk():
+        for _ in junk.iterInstalledEntries(analysis):
+            pass
+    return junk.remove(entries)
@@ -0,0 +1,140 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains functions to list the content of archives without extracting
+them (and without MO2), and to extract some entries of archives.
+
+Zip archives are listed natively from their central directory. Listers and extractors
+for other formats can be registered with registerLister() and registerExtractor().
+"""
+
+import os
+import shutil
+import zipfile
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+
+class ArchiveEntry(NamedTuple):
+
+    """ An entry of an archive, as found in the directory of the archive. """
+
+    # Path of the entry, using "/" as separator:
+    path: str
+
+    # True if the entry is a directory:
+    isDir: bool
+
+    # Uncompressed size of the entry (0 for directories):
+    size: int
+
+    # CRC32 of the entry, or None if not available (or for directories):
+    crc: Optional[int]
+
+
+# A lister takes the path to an archive and returns the list of entries in it. It
+# should raise an exception if the archive cannot be read. Listers are sent to
+# worker processes, so they must be picklable (e.g. module-level functions):
+ArchiveLister = Callable[[str], List[ArchiveEntry]]
+
+
+def listZip(path: str) -> List[ArchiveEntry]:
+    """ List the entries of a zip archive. This only reads the central directory
+    of the archive.
+
+    Args:
+        path: Path to the archive.
+
+    Returns: The list of entries in the archive.
+    """
+    with zipfile.ZipFile(path) as archive:
+        return [
+            ArchiveEntry(
+                # Some tools write zip archives with Windows separators:
+                info.filename.replace("\\", "/").rstrip("/"),
+                info.is_dir(),
+                info.file_size,
+                None if info.is_dir() else info.CRC,
+            )
+            for info in archive.infolist()
+        ]
+
+
+# Registered listers, by lower-case extension (without the .):
+_listers: Dict[str, ArchiveLister] = {"zip": listZip}
+
+
+def registerLister(suffixes: Iterable[str], lister: ArchiveLister):
+    """ Register a lister for archives with the given extensions.
+
+    Args:
+        suffixes: Extensions of the archives (without the .), e.g., ["7z"].
+        lister: The lister to use for these archives.
+    """
+    for suffix in suffixes:
+        _listers[suffix.lower()] = lister
+
+
+def findLister(path: str) -> Optional[ArchiveLister]:
+    """ Find the lister to use for the given archive.
+
+    Args:
+        path: Path to the archive.
+
+    Returns: The lister for the archive, or None if there is no lister for it.
+    """
+    return _listers.get(os.path.splitext(path)[1][1:].lower())
+
+
+# An extractor takes the path to an archive and a mapping from the paths of entries
+# (as returned by the lister) to destination paths, and extracts the entries. It
+# should raise an exception if an entry cannot be extracted:
+ArchiveExtractor = Callable[[str, Dict[str, str]], None]
+
+
+def extractZip(path: str, entries: Dict[str, str]):
+    """ Extract some entries of a zip archive.
+
+    Args:
+        path: Path to the archive.
+        entries: Destination of each entry to extract, by path of the entry (as
+            returned by listZip()).
+    """
+    with zipfile.ZipFile(path) as archive:
+        infos = {
+            info.filename.replace("\\", "/").rstrip("/"): info
+            for info in archive.infolist()
+        }
+        for name, destination in entries.items():
+            info = infos.get(name)
+            if info is None or info.is_dir():
+                raise KeyError(name)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            with archive.open(info) as src, open(destination, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+
+
+# Registered extractors, by lower-case extension (without the .):
+_extractors: Dict[str, ArchiveExtractor] = {"zip": extractZip}
+
+
+def registerExtractor(suffixes: Iterable[str], extractor: ArchiveExtractor):
+    """ Register an extractor for archives with the given extensions.
+
+    Args:
+        suffixes: Extensions of the archives (without the .), e.g., ["7z"].
+        extractor: The extractor to use for these archives.
+    """
+    for suffix in suffixes:
+        _extractors[suffix.lower()] = extractor
+
+
+def findExtractor(path: str) -> Optional[ArchiveExtractor]:
+    """ Find the extractor to use for the given archive.
+
+    Args:
+        path: Path to the archive.
+
+    Returns: The extractor for the archive, or None if there is no extractor for it.
+    """
+    return _extractors.get(os.path.splitext(path)[1][1:].lower())
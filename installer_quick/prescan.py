@@ -0,0 +1,367 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the pre-scan of the downloads folder: the archives are listed
+in worker processes and the layout rules of the installer are applied to them, so
+that we know if an archive can be installed before the user tries to install it.
+
+This module must not import mobase since it is imported by the worker processes.
+"""
+
+import enum
+import os
+import re
+import sys
+import threading
+
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .analysis import (
+    LayoutHint,
+    classifyLevel,
+    findArchiveBase,
+    looksLikeData,
+    scanLayout,
+)
+from .filetree import PyFileTree
+from .listing import ArchiveLister, findLister
+from .rules import CompiledRules
+
+
+class ScanVerdict(enum.Enum):
+
+    """ Verdict of the pre-scan for an archive. """
+
+    # The archive is a data-text archive, or contains a folder that looks like a data
+    # folder (see LayoutRules.dataContents), so it will be accepted by the installer:
+    SUPPORTED = enum.auto()
+
+    # The archive will be accepted only if the mod-data-checker of the game accepts
+    # one of its folders (this cannot be checked without MO2):
+    UNKNOWN = enum.auto()
+
+    # The archive is empty, so it will not be accepted by the installer:
+    UNSUPPORTED = enum.auto()
+
+
+class ScanResult(NamedTuple):
+
+    """ Result of the pre-scan of an archive. """
+
+    # Path to the archive, with its size and modification time when it was scanned:
+    archive: str
+    size: int
+    mtime: float
+
+    # Verdict and layout hint for the archive:
+    verdict: ScanVerdict
+    hint: LayoutHint
+
+    # Path of the base of the archive, using "/" as separator (empty for the root):
+    base: str
+
+    # Possible names for the mod, from the name of the archive and of its base:
+    names: Tuple[str, ...] = ()
+
+
+# Name of the archives downloaded from Nexus Mods: name-modid-version-timestamp, with
+# the dots of the version replaced by dashes:
+_NEXUS_NAME = re.compile(r"^(.+?)-[1-9][0-9]*-(?:[\w-]*?-)?[0-9]{9,}$")
+
+
+def nameVariants(archive: str, base: str = "") -> Tuple[str, ...]:
+    """ Compute possible names for the mod in the given archive.
+
+    Args:
+        archive: Path to the archive.
+        base: Path of the base of the archive, using "/" as separator (empty for the
+            root).
+
+    Returns: The possible names, from the most to the least likely.
+    """
+    stem = os.path.splitext(os.path.basename(archive))[0]
+    candidates = []
+
+    match = _NEXUS_NAME.match(stem)
+    if match:
+        candidates.append(match.group(1))
+    candidates.append(stem)
+
+    # The base is often a folder named after the mod:
+    if base:
+        candidates.append(base.rsplit("/", 1)[-1])
+
+    # Nexus Mods replaces spaces by underscores:
+    candidates.append(candidates[0].replace("_", " "))
+
+    names: List[str] = []
+    for name in candidates:
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    return tuple(names)
+
+
+def scanArchive(
+    archive: str, lister: ArchiveLister, rules: CompiledRules
+) -> ScanResult:
+    """ Scan a single archive. This is the function run by the worker processes.
+
+    Args:
+        archive: Path to the archive.
+        lister: Lister to use to list the entries of the archive.
+        rules: The layout rules to use.
+
+    Returns: The result of the scan.
+    """
+    stat = os.stat(archive)
+    tree = PyFileTree.fromEntries(lister(archive))
+    hint = scanLayout(tree, rules)
+
+    # The archive is analyzed as by the installer (including the search in the
+    # sub-folders), except that the mod-data-checker of the game is replaced by the
+    # entries identifying a data folder, if the rules have some:
+    has_contents = rules.hasDataContents()
+    analysis = findArchiveBase(
+        tree, rules, lambda t: has_contents and looksLikeData(t, rules), hint
+    )
+
+    if analysis is not None:
+        base, verdict = analysis.base, ScanVerdict.SUPPORTED
+    else:
+        # Otherwise, the base is the last single folder (e.g. for the names):
+        base = tree
+        for _ in range(hint.maxDepth):
+            base = classifyLevel(base, rules)[1]
+        verdict = ScanVerdict.UNKNOWN if base else ScanVerdict.UNSUPPORTED
+
+    return ScanResult(
+        archive,
+        stat.st_size,
+        stat.st_mtime,
+        verdict,
+        hint,
+        base.path("/"),
+        nameVariants(archive, base.path("/")),
+    )
+
+
+def _archiveKey(archive: str) -> str:
+    return os.path.normcase(os.path.abspath(archive))
+
+
+class SupportIndex:
+
+    """ Thread-safe index of the results of the pre-scan, by archive. """
+
+    _lock: threading.Lock
+    _results: Dict[str, ScanResult]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results = {}
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def add(self, result: ScanResult):
+        """ Add (or replace) the result for an archive.
+
+        Args:
+            result: The result to add.
+        """
+        with self._lock:
+            self._results[_archiveKey(result.archive)] = result
+
+    def get(self, archive: str) -> Optional[ScanResult]:
+        """ Retrieve the result for the given archive.
+
+        Args:
+            archive: Path to the archive.
+
+        Returns: The result for the archive, or None if the archive was not scanned or
+            was modified since it was scanned.
+        """
+        with self._lock:
+            result = self._results.get(_archiveKey(archive))
+        if result is None:
+            return None
+
+        try:
+            stat = os.stat(archive)
+        except OSError:
+            return None
+
+        if stat.st_size != result.size or stat.st_mtime != result.mtime:
+            return None
+
+        return result
+
+    def isUpToDate(self, archive: str) -> bool:
+        """ Check if the given archive has an up-to-date result in this index. """
+        return self.get(archive) is not None
+
+    def clear(self):
+        """ Remove all the results, e.g. when the layout rules change. """
+        with self._lock:
+            self._results.clear()
+
+
+def createExecutor(max_workers: Optional[int] = None) -> Executor:
+    """ Create the executor used to scan archives.
+
+    Inside MO2, sys.executable is ModOrganizer.exe and cannot be used to start worker
+    processes, so we fall back to threads in this case.
+
+    Args:
+        max_workers: Maximum number of workers, or None to use the default.
+
+    Returns: A process pool if possible, otherwise a thread pool.
+    """
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return ProcessPoolExecutor(max_workers)
+    return ThreadPoolExecutor(max_workers)
+
+
+def findArchives(folder: str) -> List[str]:
+    """ Find the archives that can be scanned in the given folder.
+
+    Args:
+        folder: The folder to look archives in (not recursive).
+
+    Returns: The paths to the archives with a registered lister.
+    """
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return []
+    return [
+        os.path.join(folder, name)
+        for name in names
+        if findLister(name) is not None and os.path.isfile(os.path.join(folder, name))
+    ]
+
+
+def scanArchives(
+    archives: Iterable[str],
+    rules: CompiledRules,
+    index: SupportIndex,
+    executor: Optional[Executor] = None,
+) -> int:
+    """ Scan the given archives and store the results in the given index. Archives
+    that are already up-to-date in the index, or that cannot be read, are skipped.
+
+    Args:
+        archives: Paths to the archives to scan.
+        rules: The layout rules to use.
+        index: The index to store the results in.
+        executor: The executor to use, or None to use one from createExecutor().
+
+    Returns: The number of archives scanned.
+    """
+    own_executor = executor is None
+    if executor is None:
+        executor = createExecutor()
+
+    try:
+        futures = []
+        for archive in archives:
+            lister = findLister(archive)
+            if lister is None or index.isUpToDate(archive):
+                continue
+            futures.append(executor.submit(scanArchive, archive, lister, rules))
+
+        count = 0
+        for future in as_completed(futures):
+            try:
+                index.add(future.result())
+            except Exception:
+                # Archives that cannot be read are simply not indexed, the installer
+                # will analyze them when they are installed:
+                continue
+            count += 1
+
+        return count
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+def scanDownloadsInBackground(
+    folder: str, rules: CompiledRules, index: SupportIndex
+) -> threading.Thread:
+    """ Scan the archives in the given folder in a background thread.
+
+    Args:
+        folder: The downloads folder.
+        rules: The layout rules to use.
+        index: The index to store the results in.
+
+    Returns: The (started) thread scanning the folder.
+    """
+    thread = threading.Thread(
+        target=lambda: scanArchives(findArchives(folder), rules, index),
+        name="installer_quick-prescan",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def scanArchivesInBackground(
+    archives: List[str], rules: CompiledRules, index: SupportIndex
+) -> threading.Thread:
+    """ Scan the given archives in a background thread, see scanArchives().
+
+    Args:
+        archives: Paths to the archives to scan.
+        rules: The layout rules to use.
+        index: The index to store the results in.
+
+    Returns: The (started) thread scanning the archives.
+    """
+    thread = threading.Thread(
+        target=lambda: scanArchives(archives, rules, index),
+        name="installer_quick-prescan",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def scanArchiveInBackground(
+    archive: str, rules: CompiledRules, index: SupportIndex, executor: Executor
+) -> "Optional[Future[Optional[ScanResult]]]":
+    """ Scan a single archive (e.g. a new download) with the given executor, and store
+    the result in the given index.
+
+    Args:
+        archive: Path to the archive.
+        rules: The layout rules to use.
+        index: The index to store the result in.
+        executor: The executor to use.
+
+    Returns: A future containing the result of the scan (None if the archive cannot be
+        read), or None if the archive cannot be scanned or is already up-to-date.
+    """
+    lister = findLister(archive)
+    if lister is None or index.isUpToDate(archive):
+        return None
+
+    def scan() -> Optional[ScanResult]:
+        try:
+            result = scanArchive(archive, lister, rules)
+        except Exception:
+            # See scanArchives():
+            return None
+        index.add(result)
+        return result
+
+    return executor.submit(scan)
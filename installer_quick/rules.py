@@ -0,0 +1,334 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the declarative rules describing the layouts of archives
+accepted by the simple installer.
+
+The rules are written as a LayoutRules object and compiled into lookup tables
+(CompiledRules) that are used to evaluate each level of an archive tree in a single
+pass (see analysis.classifyLevel()).
+"""
+
+import fnmatch
+import hashlib
+import re
+
+from typing import (
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+)
+
+# Version of the code evaluating the rules - This must be increased when the way
+# rules are evaluated changes since it is part of the version of the compiled rules:
+RULES_VERSION = 3
+
+
+class LayoutRules(NamedTuple):
+
+    """ Declarative description of the layouts accepted by the installer. """
+
+    # Suffixes (without the .) of the files allowed next to the data folder in a
+    # data-text archive:
+    textSuffixes: Tuple[str, ...] = ("txt", "pdf")
+
+    # Names of the folders accepted as the data folder in a data-text archive, in
+    # addition to the data folder of the game:
+    dataNames: Tuple[str, ...] = ()
+
+    # Maximum number of single folders to descend into to find the data folder:
+    maxDepth: int = 32
+
+    # Glob patterns of the entries that are ignored when evaluating the rules (e.g.
+    # "Thumbs.db" or "*.url"):
+    ignored: Tuple[str, ...] = ()
+
+    # When the data folder is not found by descending into single folders, the
+    # installer searches for it in the sub-folders of the last level, up to the
+    # given depth and visiting at most the given number of entries (a depth of 0
+    # disables the search):
+    searchDepth: int = 2
+    searchBudget: int = 10000
+
+    # Names of the folders that are never searched for the data folder:
+    skippedFolders: Tuple[str, ...] = (
+        "doc",
+        "docs",
+        "documentation",
+        "fomod",
+        "images",
+        "screenshots",
+    )
+
+    # Glob patterns of the junk entries, i.e., entries that are not installed - These
+    # are also ignored when evaluating the rules. Patterns starting with "/" only
+    # match the entries at the root of the mod (e.g. a "Screenshots" folder next to
+    # the plugins, but not "textures/screenshots"):
+    junk: Tuple[str, ...] = (
+        "thumbs.db",
+        "desktop.ini",
+        ".ds_store",
+        "._*",
+        "/__macosx",
+        "/screenshots",
+    )
+
+    # Glob patterns of the entries that identify a data folder of the game (e.g.
+    # "textures" or "*.esp") - The mod-data-checker of the game cannot be used outside
+    # of MO2, so these are used instead by the pre-scan, which only recognizes the
+    # data-text archives without patterns:
+    dataContents: Tuple[str, ...] = ()
+
+
+class _Patterns(NamedTuple):
+
+    """ Compiled glob patterns. """
+
+    # Casefolded names (patterns without wildcards):
+    names: FrozenSet[str]
+
+    # Regular expression for the patterns with wildcards, or None if there are none:
+    pattern: Optional[Pattern[str]]
+
+    # Casefolded first characters of the patterns with wildcards, or None if one of
+    # them starts with a wildcard - The regular expression is only tried for the
+    # names starting with one of these (e.g. "." for "._*"), so most names are
+    # checked with a single lookup:
+    starts: Optional[FrozenSet[str]]
+
+    def matches(self, name: str) -> bool:
+        key = name.casefold()
+        if key in self.names:
+            return True
+        if self.pattern is None:
+            return False
+        if self.starts is not None and key[:1] not in self.starts:
+            return False
+        return self.pattern.match(key) is not None
+
+    def isEmpty(self) -> bool:
+        return not self.names and self.pattern is None
+
+
+def _compilePatterns(patterns: Iterable[str]) -> Tuple[_Patterns, List[str]]:
+    """ Compile the given glob patterns.
+
+    Args:
+        patterns: The patterns to compile.
+
+    Returns: The compiled patterns and the list of the translated patterns with
+        wildcards.
+    """
+    names, translated = set(), []
+    starts: Optional[Set[str]] = set()
+    for pattern in patterns:
+        key = pattern.casefold()
+        if any(c in key for c in "*?["):
+            translated.append(fnmatch.translate(key))
+            if starts is not None and key[0] not in "*?[":
+                starts.add(key[0])
+            else:
+                starts = None
+        else:
+            names.add(key)
+
+    regex = re.compile("|".join(translated)) if translated else None
+    return (
+        _Patterns(
+            frozenset(names),
+            regex,
+            frozenset(starts) if starts is not None else None,
+        ),
+        translated,
+    )
+
+
+class CompiledRules:
+
+    """ Compiled version of LayoutRules.
+
+    All names are compared case-insensitively using lookup tables, except for the
+    ignored entries that contain wildcards, which are compiled into a single regular
+    expression (only tried for the names that can match it).
+    """
+
+    __slots__ = (
+        "textSuffixes",
+        "dataNames",
+        "maxDepth",
+        "searchDepth",
+        "searchBudget",
+        "skippedFolders",
+        "version",
+        "_ignored",
+        "_junk",
+        "_rootJunk",
+        "_dataContents",
+    )
+
+    # Casefolded suffixes of text files and names of data folders:
+    textSuffixes: FrozenSet[str]
+    dataNames: FrozenSet[str]
+
+    # Maximum depth of the base of an archive:
+    maxDepth: int
+
+    # Depth and budget of the search for the data folder, and casefolded names of the
+    # folders not searched:
+    searchDepth: int
+    searchBudget: int
+    skippedFolders: FrozenSet[str]
+
+    # Version of these rules, used to invalidate verdicts computed with other rules:
+    version: str
+
+    # Patterns of the ignored entries:
+    _ignored: _Patterns
+
+    # Same for the junk entries, and for the junk entries at the root of the mod:
+    _junk: _Patterns
+    _rootJunk: _Patterns
+
+    # Patterns of the entries identifying a data folder:
+    _dataContents: _Patterns
+
+    def __init__(self, rules: LayoutRules, data_name: str):
+        """
+        Args:
+            rules: The rules to compile.
+            data_name: Name of the data folder (e.g., "data" for Bethesda games).
+        """
+        self.textSuffixes = frozenset(s.casefold() for s in rules.textSuffixes)
+        self.dataNames = frozenset(
+            name.casefold() for name in (data_name,) + rules.dataNames
+        )
+        self.maxDepth = rules.maxDepth
+        self.searchDepth = rules.searchDepth
+        self.searchBudget = rules.searchBudget
+        self.skippedFolders = frozenset(
+            name.casefold() for name in rules.skippedFolders
+        )
+
+        # Junk entries are also ignored (at any level, since the analysis does not
+        # know where the root of the mod is):
+        anchored = tuple(p[1:] for p in rules.junk if p.startswith("/"))
+        nested = tuple(p for p in rules.junk if not p.startswith("/"))
+        self._junk, junk = _compilePatterns(nested)
+        self._rootJunk, root_junk = _compilePatterns(anchored)
+        self._ignored, patterns = _compilePatterns(rules.ignored + nested + anchored)
+
+        # The entries identifying a data folder are not part of the version since
+        # they are only used by the pre-scan, whose results are not cached:
+        self._dataContents, _ = _compilePatterns(rules.dataContents)
+
+        self.version = hashlib.blake2b(
+            repr(
+                (
+                    RULES_VERSION,
+                    sorted(self.textSuffixes),
+                    sorted(self.dataNames),
+                    self.maxDepth,
+                    self.searchDepth,
+                    self.searchBudget,
+                    sorted(self.skippedFolders),
+                    sorted(self._ignored.names),
+                    sorted(patterns),
+                    sorted(self._junk.names),
+                    sorted(junk),
+                    sorted(self._rootJunk.names),
+                    sorted(root_junk),
+                )
+            ).encode("utf-8"),
+            digest_size=8,
+        ).hexdigest()
+
+    def isIgnored(self, name: str) -> bool:
+        """ Check if the entry with the given name should be ignored.
+
+        Args:
+            name: Name of the entry.
+
+        Returns: True if the entry should be ignored, False otherwise.
+        """
+        return self._ignored.matches(name)
+
+    def hasIgnored(self) -> bool:
+        """ Returns: True if these rules ignore some entries, False otherwise. """
+        return not self._ignored.isEmpty()
+
+    def isJunk(self, name: str, root: bool = False) -> bool:
+        """ Check if the entry with the given name is junk and should not be
+        installed.
+
+        Args:
+            name: Name of the entry.
+            root: True if the entry is at the root of the mod, in which case the
+                patterns starting with "/" are also checked.
+
+        Returns: True if the entry is junk, False otherwise.
+        """
+        if root and self._rootJunk.matches(name):
+            return True
+        return self._junk.matches(name)
+
+    def hasJunk(self) -> bool:
+        """ Returns: True if these rules consider some entries as junk, False
+        otherwise. """
+        return self.hasNestedJunk() or not self._rootJunk.isEmpty()
+
+    def hasNestedJunk(self) -> bool:
+        """ Returns: True if these rules consider some entries below the root of the
+        mod as junk, False if only the root of the mod needs to be checked. """
+        return not self._junk.isEmpty()
+
+    def isDataContent(self, name: str) -> bool:
+        """ Check if an entry with the given name identifies a data folder of the
+        game, see LayoutRules.dataContents.
+
+        Args:
+            name: Name of the entry.
+
+        Returns: True if the entry identifies a data folder, False otherwise.
+        """
+        return self._dataContents.matches(name)
+
+    def hasDataContents(self) -> bool:
+        """ Returns: True if these rules can identify a data folder, False
+        otherwise. """
+        return not self._dataContents.isEmpty()
+
+    def isSearched(self, name: str) -> bool:
+        """ Check if the folder with the given name should be searched for the data
+        folder.
+
+        Args:
+            name: Name of the folder.
+
+        Returns: True if the folder should be searched, False otherwise.
+        """
+        return name.casefold() not in self.skippedFolders and not self.isIgnored(name)
+
+    def isDataName(self, name: str) -> bool:
+        """ Check if a folder with the given name can be the data folder.
+
+        Args:
+            name: Name of the folder.
+
+        Returns: True if the folder can be the data folder, False otherwise.
+        """
+        return name.casefold() in self.dataNames
+
+    def isTextSuffix(self, suffix: str) -> bool:
+        """ Check if a file with the given suffix is allowed next to the data folder.
+
+        Args:
+            suffix: Suffix of the file (without the .).
+
+        Returns: True if the file is allowed next to the data folder.
+        """
+        return suffix.casefold() in self.textSuffixes
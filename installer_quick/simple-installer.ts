@@ -1,44 +1,271 @@
 <?xml version="1.0" encoding="utf-8"?>
-<!DOCTYPE TS><TS version="2.0">
+<!DOCTYPE TS>
+<TS version="2.1">
+<context>
+    <name>BatchInstallDialog</name>
+    <message>
+        <location filename="batchtool.py" line="66"/>
+        <source>This archive can be installed directly.</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="68"/>
+        <source>This archive needs a manual installation.</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="70"/>
+        <source>This archive will be checked when it is installed.</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="ui/batchinstalldialog.py" line="46"/>
+        <source>Batch Install - Python</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="ui/batchinstalldialog.py" line="47"/>
+        <source>The selected archives are installed one after the other, without showing any dialog. Archives that need a choice from you are skipped and listed at the end.</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="ui/batchinstalldialog.py" line="48"/>
+        <source>Install</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="ui/batchinstalldialog.py" line="49"/>
+        <source>Cancel</source>
+        <translation type="unfinished"></translation>
+    </message>
+</context>
+<context>
+    <name>BatchInstallTool</name>
+    <message>
+        <location filename="batchtool.py" line="118"/>
+        <source>Install archives from the downloads folder without user interaction.</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="136"/>
+        <source>Batch Install (Python)</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="139"/>
+        <source>Install archives from the downloads folder</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="252"/>
+        <source>Batch Install</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="150"/>
+        <source>There are no archives in the downloads folder.</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="253"/>
+        <source>{} archive(s) installed, {} skipped and {} failed ({:.1f} archives/min).</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="273"/>
+        <source>not supported by this installer</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="274"/>
+        <source>{}: manual installation required ({})</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="280"/>
+        <source>{}: already installed as &apos;{}&apos;</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="286"/>
+        <source>{}: the mod &apos;{}&apos; already exists</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="292"/>
+        <source>{}: installation failed ({})</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="188"/>
+        <source>Scanning the archives...</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="188"/>
+        <source>Skip</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="221"/>
+        <source>Installing...</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="221"/>
+        <source>Cancel</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="batchtool.py" line="230"/>
+        <source>Installing {}...</source>
+        <translation type="unfinished"></translation>
+    </message>
+</context>
 <context>
     <name>SimpleInstallDialog</name>
     <message>
-        <location filename="ui/simpleinstalldialog.py" line="51"/>
+        <location filename="ui/simpleinstalldialog.py" line="61"/>
         <source>Quick Install - Python</source>
         <translation type="unfinished"></translation>
     </message>
     <message>
-        <location filename="ui/simpleinstalldialog.py" line="52"/>
+        <location filename="ui/simpleinstalldialog.py" line="62"/>
         <source>Name</source>
         <translation type="unfinished"></translation>
     </message>
     <message>
-        <location filename="ui/simpleinstalldialog.py" line="54"/>
+        <location filename="ui/simpleinstalldialog.py" line="64"/>
         <source>Opens a Dialog that allows custom modifications.</source>
         <translation type="unfinished"></translation>
     </message>
     <message>
-        <location filename="ui/simpleinstalldialog.py" line="55"/>
+        <location filename="ui/simpleinstalldialog.py" line="65"/>
         <source>Manual</source>
         <translation type="unfinished"></translation>
     </message>
     <message>
-        <location filename="ui/simpleinstalldialog.py" line="56"/>
+        <location filename="ui/simpleinstalldialog.py" line="66"/>
         <source>OK</source>
         <translation type="unfinished"></translation>
     </message>
     <message>
-        <location filename="ui/simpleinstalldialog.py" line="57"/>
+        <location filename="ui/simpleinstalldialog.py" line="67"/>
         <source>Cancel</source>
         <translation type="unfinished"></translation>
     </message>
+    <message>
+        <location filename="installer.py" line="150"/>
+        <source>No file from installed mods would be overwritten.</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="157"/>
+        <source>{} file(s) would overwrite files from {} mod(s): {}</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="181"/>
+        <source>at least {}</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="186"/>
+        <source>The free space could not be checked (unknown size).</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="188"/>
+        <source>Size: {} (the free space could not be checked)</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="191"/>
+        <source>Size: {} ({} free)</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="194"/>
+        <source>Not enough space to install this mod: {} needed, {} free.</source>
+        <translation type="unfinished"></translation>
+    </message>
 </context>
 <context>
     <name>SimpleInstaller</name>
     <message>
-        <location filename="installer.py" line="106"/>
+        <location filename="installer.py" line="457"/>
         <source>Installer for very simple archives... In python!</source>
         <translation type="unfinished"></translation>
     </message>
+    <message>
+        <location filename="installer.py" line="1234"/>
+        <source>Archive already installed</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1234"/>
+        <source>An identical archive was already installed as &apos;{}&apos;. Do you want to install it again?</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1243"/>
+        <source>Skip</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1244"/>
+        <source>Use existing mod</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1245"/>
+        <source>Install anyway</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1812"/>
+        <source>Some files of &apos;{}&apos; could not be extracted, you should reinstall this mod: {}</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1821"/>
+        <source>Incomplete installation</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1907"/>
+        <source>This archive cannot be read: {}</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1921"/>
+        <source>This archive contains a FOMOD installer.</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1923"/>
+        <source>This archive contains a scripted installer.</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1925"/>
+        <source>This archive only contains other archives.</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1975"/>
+        <source>at least {}</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1977"/>
+        <source>Not enough space to install this mod: {} needed, {} free.</source>
+        <translation type="unfinished"></translation>
+    </message>
+    <message>
+        <location filename="installer.py" line="1985"/>
+        <source>the free space could not be checked</source>
+        <translation type="unfinished"></translation>
+    </message>
 </context>
 </TS>
@@ -0,0 +1,68 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the base class of the persistent stores of the installer (the
+verdict cache, the hashes of the archives, the index of the files of the mods, the
+manifest of the game files and the journal of the installations).
+"""
+
+import abc
+import os
+import sqlite3
+import threading
+
+from typing import Optional
+
+
+class SQLiteStore(abc.ABC):
+
+    """ Base class of the thread-safe stores in a SQLite database.
+
+    The database is only opened when first used, and the tables are created by
+    _createTables() when it is opened. The subclasses must hold _lock while using the
+    connection returned by _open().
+    """
+
+    _path: str
+
+    _lock: threading.Lock
+    _connection: Optional[sqlite3.Connection]
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path to the database. The database is only opened when first used.
+        """
+        self._path = path
+
+        self._lock = threading.Lock()
+        self._connection = None
+
+    @abc.abstractmethod
+    def _createTables(self, connection: sqlite3.Connection):
+        """ Create the tables of the store, if they do not exist. This is called in a
+        transaction when the database is opened.
+
+        Args:
+            connection: The connection to the database.
+        """
+
+    def _open(self) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        connection = sqlite3.connect(self._path, check_same_thread=False)
+        with connection:
+            self._createTables(connection)
+
+        self._connection = connection
+        return connection
+
+    def close(self):
+        """ Close the database. The store can still be used after this (the database
+        is opened again). """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,263 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains the timing telemetry of the installer: the time spent in each
+phase of an installation is measured and appended as a JSON line to a rotating log
+file, and the log files can be summarized to find regressions (e.g. in the
+mod-data-checker of a game).
+"""
+
+import json
+import logging
+import logging.handlers
+import math
+import os
+import time
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+# Phases of an installation, in order:
+PHASES = (
+    # Retrieval of the game and its mod-data-checker:
+    "lookup",
+    # Calls to the mod-data-checker (see PhaseTimer.samples for each call):
+    "checker",
+    # Analysis of the layout of the archive except for the calls to the checker,
+    # i.e., descent into single folders and data-text checks:
+    "layout",
+    # Search of the conflicts with the installed mods:
+    "conflicts",
+    # Measure of the size of the files to install and of the free space:
+    "footprint",
+    # Time spent waiting for the user in the installation dialog:
+    "dialog",
+    # Removal of the junk entries:
+    "junk",
+    # Removal of the files identical to the game files:
+    "vanilla",
+    # Comparison with the installed mod and extraction of the missing files for
+    # delta installations:
+    "delta",
+    # Restructuring of the tree (detach() and merge()):
+    "restructure",
+    # Total time spent in install():
+    "install",
+    # Deduplication of the installed mod (in the background, separate records):
+    "dedup",
+)
+
+
+# Maximum number of measures kept for each phase - The search of the data folder can
+# call the checker thousands of times, so only the first calls are kept to keep the
+# timer (and the records) small:
+MAX_SAMPLES = 64
+
+
+class PhaseTimer:
+
+    """ Timer accumulating the time spent in each phase of an installation. """
+
+    # Total time spent in each phase, in seconds:
+    phases: Dict[str, float]
+
+    # Individual measures for phases that are measured multiple times (at most
+    # MAX_SAMPLES per phase):
+    samples: Dict[str, List[float]]
+
+    def __init__(self):
+        self.phases = {}
+        self.samples = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """ Context manager measuring the time spent in the given phase. """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        """ Add time to the given phase.
+
+        Args:
+            name: Name of the phase.
+            seconds: Time to add, in seconds.
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def sample(self, name: str, seconds: float):
+        """ Add a single measure to the given phase.
+
+        Args:
+            name: Name of the phase.
+            seconds: The measure, in seconds.
+        """
+        samples = self.samples.setdefault(name, [])
+        if len(samples) < MAX_SAMPLES:
+            samples.append(seconds)
+        self.add(name, seconds)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.phases
+
+    def toRecord(self, **extra: Any) -> Dict[str, Any]:
+        """ Create the record to log for this timer. Times are in milliseconds.
+
+        Args:
+            **extra: Additional fields of the record.
+
+        Returns: A JSON-serializable record.
+        """
+        record: Dict[str, Any] = {"time": time.time()}
+        record.update(extra)
+        record["phases"] = {
+            name: round(seconds * 1000, 4) for name, seconds in self.phases.items()
+        }
+        record["samples"] = {
+            name: [round(s * 1000, 4) for s in samples]
+            for name, samples in self.samples.items()
+        }
+        return record
+
+
+class TelemetryLog:
+
+    """ Rotating log of JSON records. """
+
+    _path: str
+    _logger: logging.Logger
+
+    def __init__(self, path: str, maxBytes: int = 1 << 20, backupCount: int = 3):
+        """
+        Args:
+            path: Path to the log file. The file is only created when the first record
+                is written.
+            maxBytes: Maximum size of a log file.
+            backupCount: Number of rotated files to keep.
+        """
+        self._path = path
+
+        # We use a dedicated logger that does not propagate to the root logger since
+        # the records should not be mixed with other logs:
+        self._logger = logging.getLogger("{}.{:x}".format(__name__, id(self)))
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            path,
+            maxBytes=maxBytes,
+            backupCount=backupCount,
+            encoding="utf-8",
+            delay=True,
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._logger.addHandler(handler)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def append(self, record: Dict[str, Any]):
+        """ Append a record to the log.
+
+        Args:
+            record: The record to append, must be JSON-serializable.
+        """
+        self._logger.info(json.dumps(record, separators=(",", ":")))
+
+    def close(self):
+        for handler in list(self._logger.handlers):
+            handler.close()
+            self._logger.removeHandler(handler)
+
+
+def readRecords(path: str) -> List[Dict[str, Any]]:
+    """ Read the records from the given log file and its rotated files.
+
+    Args:
+        path: Path to the log file.
+
+    Returns: The records, from the oldest to the most recent. Invalid lines are
+        ignored.
+    """
+    # Rotated files are named path.1 (most recent) to path.N (oldest):
+    paths = []
+    index = 1
+    while os.path.exists("{}.{}".format(path, index)):
+        paths.append("{}.{}".format(path, index))
+        index += 1
+    paths.reverse()
+    if os.path.exists(path):
+        paths.append(path)
+
+    records = []
+    for p in paths:
+        with open(p, "r", encoding="utf-8") as fp:
+            for line in fp:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and isinstance(record.get("phases"), dict):
+                    records.append(record)
+    return records
+
+
+def percentile(values: List[float], p: float) -> float:
+    """ Compute the given percentile of a list of values (nearest-rank).
+
+    Args:
+        values: The values, must not be empty.
+        p: The percentile, between 0 and 100.
+
+    Returns: The percentile of the values.
+    """
+    values = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(values)))
+    return values[rank - 1]
+
+
+class PhaseSummary(NamedTuple):
+
+    """ Summary of the times of a phase over multiple installations (in ms). """
+
+    phase: str
+    count: int
+    p50: float
+    p95: float
+
+
+def summarize(
+    records: List[Dict[str, Any]], phases: Optional[List[str]] = None
+) -> List[PhaseSummary]:
+    """ Summarize the times of each phase in the given records.
+
+    Args:
+        records: The records to summarize.
+        phases: The phases to summarize, or None for all the phases in the records.
+
+    Returns: The summary of each phase present in at least one record.
+    """
+    times: Dict[str, List[float]] = {}
+    for record in records:
+        for name, value in record["phases"].items():
+            times.setdefault(name, []).append(value)
+
+    if phases is None:
+        phases = [p for p in PHASES if p in times] + sorted(
+            p for p in times if p not in PHASES
+        )
+
+    summaries = []
+    for name in phases:
+        values = times.get(name)
+        if values:
+            summaries.append(
+                PhaseSummary(
+                    name, len(values), percentile(values, 50), percentile(values, 95)
+                )
+            )
+    return summaries
@@ -0,0 +1,9 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This package contains the tests of the parts of the simple installer that do not
+depend on MO2 (the trees are the pure-Python ones from filetree). The tests can be
+run from the root of the repository:
+
+    python -m pytest installer_quick/tests
+"""
@@ -0,0 +1,28 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains helpers to build the archive trees and rules used by the tests.
+"""
+
+from typing import Optional
+
+from ..filetree import PyFileTree
+from ..listing import ArchiveEntry
+from ..rules import CompiledRules, LayoutRules
+
+
+def makeTree(*paths: str, size: int = 1) -> PyFileTree:
+    """ Build a tree from the given paths. Paths ending with "/" are empty folders,
+    the other ones are files of the given size. """
+    return PyFileTree.fromEntries(
+        ArchiveEntry(path.rstrip("/"), path.endswith("/"), 0, None)
+        if path.endswith("/")
+        else ArchiveEntry(path, False, size, None)
+        for path in paths
+    )
+
+
+def makeRules(rules: Optional[LayoutRules] = None, data: str = "data") -> CompiledRules:
+    """ Compile the given rules (the default ones if not specified) for a game whose
+    data folder is named as given. """
+    return CompiledRules(rules if rules is not None else LayoutRules(), data)
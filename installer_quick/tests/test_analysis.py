@@ -0,0 +1,108 @@
+# -*- encoding: utf-8 -*-
+
+from ..analysis import (
+    LevelVerdict,
+    LayoutKind,
+    classifyLevel,
+    findArchiveBase,
+    restoreAnalysis,
+)
+from ..rules import LayoutRules
+from .helpers import makeRules, makeTree
+
+
+def test_single_folder_is_descended():
+    tree = makeTree("Mod/plugin.esp")
+    assert classifyLevel(tree, makeRules()) == (LevelVerdict.DESCEND, tree.find("Mod"))
+
+
+def test_single_file_is_not_a_layout():
+    tree = makeTree("plugin.esp")
+    assert classifyLevel(tree, makeRules()) == (LevelVerdict.NONE, None)
+
+
+def test_data_folder_with_text_files():
+    tree = makeTree("DATA/plugin.esp", "readme.txt", "manual.PDF")
+    assert classifyLevel(tree, makeRules()) == (
+        LevelVerdict.DATA_TEXT,
+        tree.find("data"),
+    )
+
+
+def test_other_folder_with_text_files():
+    # The original check accepted this level (and rejected the one above), see
+    # classifyLevel():
+    tree = makeTree("Textures/a.dds", "readme.txt")
+    assert classifyLevel(tree, makeRules()) == (LevelVerdict.NONE, None)
+
+
+def test_additional_data_names():
+    tree = makeTree("Data Files/plugin.esp", "readme.txt")
+    rules = makeRules(LayoutRules(dataNames=("Data Files",)))
+    assert classifyLevel(tree, rules)[0] is LevelVerdict.DATA_TEXT
+
+
+def test_other_files_next_to_the_data_folder():
+    tree = makeTree("Data/plugin.esp", "readme.txt", "install.bat")
+    assert classifyLevel(tree, makeRules()) == (LevelVerdict.NONE, None)
+
+
+def test_multiple_folders():
+    tree = makeTree("Data/plugin.esp", "Docs/readme.txt", "readme.txt")
+    assert classifyLevel(tree, makeRules()) == (LevelVerdict.NONE, None)
+
+
+def test_ignored_entries():
+    rules = makeRules()
+
+    # A folder next to ignored entries only is descended:
+    tree = makeTree("Mod/plugin.esp", "Thumbs.db")
+    assert classifyLevel(tree, rules) == (LevelVerdict.DESCEND, tree.find("Mod"))
+
+    # Ignored entries do not prevent a level from being a data-text archive:
+    tree = makeTree("Data/plugin.esp", "readme.txt", "desktop.ini")
+    assert classifyLevel(tree, rules)[0] is LevelVerdict.DATA_TEXT
+
+    # Ignored text files are not text files, and other ignored files are skipped:
+    tree = makeTree("Data/plugin.esp", "._readme.txt")
+    assert classifyLevel(tree, rules) == (LevelVerdict.DESCEND, tree.find("Data"))
+    tree = makeTree("Data/plugin.esp", "readme.txt", "._readme.txt", "._setup.exe")
+    assert classifyLevel(tree, rules)[0] is LevelVerdict.DATA_TEXT
+
+
+def test_find_archive_base():
+    rules = makeRules()
+
+    def checker(tree):
+        return tree.find("plugin.esp") is not None
+
+    tree = makeTree("Mod 1.0/Mod/plugin.esp")
+    analysis = findArchiveBase(tree, rules, checker)
+    assert analysis is not None
+    assert analysis.kind is LayoutKind.DATA
+    assert analysis.base is tree.find("Mod 1.0/Mod")
+    assert analysis.depth == 2
+
+    tree = makeTree("Mod/Data/textures/a.dds", "Mod/readme.txt")
+    analysis = findArchiveBase(tree, rules, checker)
+    assert analysis is not None
+    assert analysis.kind is LayoutKind.DATA_TEXT
+    assert analysis.base is tree.find("Mod")
+    assert analysis.data is tree.find("Mod/Data")
+
+    assert findArchiveBase(makeTree("a.dds", "b.dds"), rules, checker) is None
+
+
+def test_restore_analysis():
+    rules = makeRules()
+
+    def checker(tree):
+        return False
+
+    tree = makeTree("Mod/DATA/textures/a.dds", "Mod/readme.txt")
+    analysis = restoreAnalysis(tree, rules, checker, "mod", LayoutKind.DATA_TEXT)
+    assert analysis is not None
+    assert analysis.data is tree.find("Mod/Data")
+
+    assert restoreAnalysis(tree, rules, checker, "mod", LayoutKind.DATA) is None
+    assert restoreAnalysis(tree, rules, checker, "other", LayoutKind.DATA) is None
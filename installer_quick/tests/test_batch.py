@@ -0,0 +1,95 @@
+# -*- encoding: utf-8 -*-
+
+from ..batch import (
+    BatchInstallQueue,
+    InstallOutcome,
+    OtherInstaller,
+    findBatchArchives,
+    findOtherInstaller,
+    findTreeInstaller,
+)
+from ..listing import ArchiveEntry
+from .helpers import makeTree
+
+
+def entries(*paths: str):
+    return [ArchiveEntry(path, False, 1, None) for path in paths]
+
+
+def test_fomod_installers():
+    assert (
+        findOtherInstaller(entries("Mod/fomod/ModuleConfig.xml", "Mod/a.esp"))
+        is OtherInstaller.FOMOD
+    )
+    assert findOtherInstaller(entries("fomod/script.cs")) is OtherInstaller.SCRIPTED
+
+    # Only the files in a fomod folder count:
+    assert findOtherInstaller(entries("ModuleConfig.xml", "a.esp")) is None
+
+
+def test_bundles():
+    assert findOtherInstaller(entries("a.7z", "b.ZIP")) is OtherInstaller.BUNDLE
+    assert findOtherInstaller(entries("a.7z", "readme.txt")) is None
+    assert findOtherInstaller([]) is None
+
+
+def test_tree_installers():
+    # The archives that cannot be listed are checked from their tree:
+    assert findTreeInstaller(makeTree("Mod/fomod/ModuleConfig.xml", "Mod/a.esp")) is (
+        OtherInstaller.FOMOD
+    )
+    assert findTreeInstaller(makeTree("a.7z", "b.rar")) is OtherInstaller.BUNDLE
+    assert findTreeInstaller(makeTree("Mod/a.esp", "Mod/fomod/")) is None
+
+
+def test_find_batch_archives(tmp_path):
+    for name in ("b.7z", "A.zip", "c.txt"):
+        (tmp_path / name).write_bytes(b"")
+    (tmp_path / "d.rar").mkdir()
+
+    assert findBatchArchives(str(tmp_path)) == [
+        str(tmp_path / "A.zip"),
+        str(tmp_path / "b.7z"),
+    ]
+    assert findBatchArchives(str(tmp_path / "missing")) == []
+
+
+def test_queue_reports_skipped_archives():
+    queue = BatchInstallQueue()
+    queue.add("a.zip")
+    queue.add("b.zip")
+
+    def install(item):
+        # The outcome set for a skipped archive is kept, while an installation that
+        # returns no mod failed:
+        if item.archive == "a.zip":
+            item.outcome = InstallOutcome.EXISTS
+            item.modName = "a"
+        else:
+            item.outcome = InstallOutcome.INSTALLED
+        return None
+
+    report = queue.run(install)
+    assert report.count(InstallOutcome.EXISTS) == 1
+    assert report.count(InstallOutcome.FAILED) == 1
+
+
+def test_queue_can_be_stopped_from_the_progress():
+    queue = BatchInstallQueue()
+    for archive in ("a.zip", "b.zip", "c.zip"):
+        queue.add(archive)
+
+    installed = []
+
+    def install(item):
+        installed.append(item.archive)
+        return None
+
+    # The user cancels the batch while the first archive is installed:
+    def progress(index, item):
+        if index == 1:
+            queue.stop()
+
+    report = queue.run(install, progress)
+    assert installed == ["a.zip"]
+    assert report.count(InstallOutcome.CANCELED) == 2
@@ -0,0 +1,110 @@
+# -*- encoding: utf-8 -*-
+
+import os
+import threading
+
+from ..dedup import (
+    MIN_DEDUP_SIZE,
+    Deduplicator,
+    FileIndex,
+    deduplicateMod,
+    listFiles,
+)
+
+SHARED = b"s" * MIN_DEDUP_SIZE
+
+
+def createMod(folder, files):
+    for path, data in files.items():
+        os.makedirs(os.path.join(folder, os.path.dirname(path)), exist_ok=True)
+        with open(os.path.join(folder, path), "wb") as fp:
+            fp.write(data)
+    return str(folder)
+
+
+def test_list_files(tmp_path):
+    folder = createMod(
+        tmp_path / "A",
+        {"meta.ini": SHARED, "small.txt": b"x", "textures/a.dds": SHARED},
+    )
+    assert [os.path.basename(f.path) for f in listFiles(folder)] == ["a.dds"]
+
+
+def test_identical_files_are_linked(tmp_path):
+    index = FileIndex(str(tmp_path / "files.sqlite"))
+    a = createMod(tmp_path / "A", {"a.dds": SHARED, "other.dds": b"a" * 5000})
+    b = createMod(
+        tmp_path / "B",
+        {
+            "textures/b.dds": SHARED,
+            "same-size.dds": b"b" * 5000,
+            "small.txt": b"x",
+        },
+    )
+
+    deduplicator = Deduplicator(index)
+    try:
+        # The other mods are added to the index first, when it is empty:
+        report = deduplicator.submit("B", b, [("A", a), ("B", b)]).result()
+    finally:
+        deduplicator.shutdown()
+        index.close()
+
+    # Two files of B have the size of a file of A, so four files are hashed, but
+    # only one is identical:
+    assert report.files == 2
+    assert report.hashedFiles == 4
+    assert report.linkedFiles == 1
+    assert report.reclaimedBytes == len(SHARED)
+
+    assert os.path.samefile(
+        os.path.join(a, "a.dds"), os.path.join(b, "textures", "b.dds")
+    )
+    assert not os.path.samefile(
+        os.path.join(a, "other.dds"), os.path.join(b, "same-size.dds")
+    )
+
+
+def test_modified_files_are_not_linked(tmp_path):
+    index = FileIndex(str(tmp_path / "files.sqlite"))
+    a = createMod(tmp_path / "A", {"a.dds": SHARED})
+    b = createMod(tmp_path / "B", {"b.dds": SHARED})
+
+    deduplicator = Deduplicator(index)
+    try:
+        deduplicator.submit("A", a).result()
+
+        # The file of A is modified after it was indexed, so it cannot be used as the
+        # source of a link:
+        with open(os.path.join(a, "a.dds"), "wb") as fp:
+            fp.write(b"m" * len(SHARED))
+        os.utime(os.path.join(a, "a.dds"), ns=(0, 0))
+
+        report = deduplicator.submit("B", b).result()
+    finally:
+        deduplicator.shutdown()
+        index.close()
+
+    assert report.linkedFiles == 0
+    assert not os.path.samefile(os.path.join(a, "a.dds"), os.path.join(b, "b.dds"))
+
+
+def test_interrupted_deduplication(tmp_path):
+    index = FileIndex(str(tmp_path / "files.sqlite"))
+    a = createMod(tmp_path / "A", {"a.dds": SHARED})
+    b = createMod(tmp_path / "B", {"b.dds": SHARED})
+
+    stop = threading.Event()
+    stop.set()
+    try:
+        deduplicateMod(index, "A", a)
+        report = deduplicateMod(index, "B", b, stop=stop)
+
+        # The files of B are still indexed, without hash:
+        files = index.filesWithSizes([len(SHARED)], "A")
+        assert [info.hash for info in files[len(SHARED)]] == [None]
+    finally:
+        index.close()
+
+    assert report.linkedFiles == 0
+    assert not os.path.samefile(os.path.join(a, "a.dds"), os.path.join(b, "b.dds"))
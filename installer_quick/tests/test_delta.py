@@ -0,0 +1,133 @@
+# -*- encoding: utf-8 -*-
+
+import os
+import shutil
+import zlib
+
+from ..delta import finishDelta, planDelta
+from ..listing import ArchiveEntry
+
+# Content of the files of the new version of the mod, by path in the mod folder:
+NEW_VERSION = {"plugin.esp": b"plugin v2", "textures/a.dds": b"texture"}
+
+
+def archiveFiles():
+    """ The files of the new version, as given to planDelta(). """
+    return {
+        path.casefold(): (
+            path,
+            ArchiveEntry("Mod/" + path, False, len(data), zlib.crc32(data)),
+        )
+        for path, data in NEW_VERSION.items()
+    }
+
+
+def extractor(archive, entries):
+    for entry, path in entries.items():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as fp:
+            fp.write(NEW_VERSION[entry[len("Mod/") :]])
+
+
+def installOldVersion(folder):
+    """ Install the previous version of the mod, with a file added by the user, and
+    return the files installed by the previous version. """
+    files = {
+        "meta.ini": b"[General]",
+        "plugin.esp": b"plugin v1",
+        "textures/a.dds": b"texture",
+        "textures/old.dds": b"old",
+        "user.ini": b"created by the user",
+    }
+    for path, data in files.items():
+        os.makedirs(os.path.join(folder, os.path.dirname(path)), exist_ok=True)
+        with open(os.path.join(folder, path), "wb") as fp:
+            fp.write(data)
+    return frozenset(["plugin.esp", "textures/a.dds", "textures/old.dds"])
+
+
+def installTree(folder, plan, replace):
+    """ Do what MO2 does with the tree returned by the installer, i.e., extract the
+    files that are not unchanged after replacing or merging the mod. """
+    if replace:
+        shutil.rmtree(folder)
+    for path, data in NEW_VERSION.items():
+        if path not in plan.unchanged:
+            target = os.path.join(folder, path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as fp:
+                fp.write(data)
+
+
+def test_plan(tmp_path):
+    folder = str(tmp_path / "Mod")
+    previous = installOldVersion(folder)
+
+    plan = planDelta("mod.zip", folder, archiveFiles(), previous)
+    assert plan is not None
+    assert list(plan.unchanged) == ["textures/a.dds"]
+    assert plan.avoidedBytes == len(b"texture")
+
+    # The file created by the user (and meta.ini) are not removed:
+    assert plan.removed == ["textures/old.dds"]
+
+    # Without the files of the previous version, nothing is removed:
+    plan = planDelta("mod.zip", folder, archiveFiles())
+    assert plan is not None and plan.removed == []
+
+
+def test_upgrade_with_replace(tmp_path):
+    folder = str(tmp_path / "Mod")
+    plan = planDelta("mod.zip", folder, archiveFiles(), installOldVersion(folder))
+    assert plan is not None
+
+    installTree(folder, plan, replace=True)
+    report = finishDelta(plan, folder, extractor)
+
+    assert report.replaced
+    assert report.restoredFiles == 1 and report.unchangedFiles == 0
+    assert report.removedFiles == 0
+    assert (tmp_path / "Mod" / "textures" / "a.dds").read_bytes() == b"texture"
+
+
+def test_upgrade_with_merge(tmp_path):
+    folder = str(tmp_path / "Mod")
+    plan = planDelta("mod.zip", folder, archiveFiles(), installOldVersion(folder))
+    assert plan is not None
+
+    installTree(folder, plan, replace=False)
+    report = finishDelta(plan, folder, extractor)
+
+    # Merging keeps the unchanged files and the files of the user, but the files of
+    # the previous version are removed:
+    assert not report.replaced
+    assert report.removedFiles == 1 and report.restoredFiles == 0
+    assert report.unchangedFiles == 1
+    assert not (tmp_path / "Mod" / "textures" / "old.dds").exists()
+    assert (tmp_path / "Mod" / "user.ini").exists()
+    assert (tmp_path / "Mod" / "plugin.esp").read_bytes() == b"plugin v2"
+
+
+def test_files_are_only_removed_from_the_planned_folder(tmp_path):
+    folder = str(tmp_path / "Mod")
+    plan = planDelta("mod.zip", folder, archiveFiles(), installOldVersion(folder))
+    assert plan is not None
+
+    other = str(tmp_path / "Other")
+    installOldVersion(other)
+    installTree(other, plan, replace=False)
+    os.remove(os.path.join(other, "textures", "a.dds"))
+
+    assert finishDelta(plan, other, extractor).removedFiles == 0
+    assert (tmp_path / "Other" / "textures" / "old.dds").exists()
+
+
+def test_unknown_crc(tmp_path):
+    folder = str(tmp_path / "Mod")
+    installOldVersion(folder)
+    files = {
+        path: (install_path, entry._replace(crc=None))
+        for path, (install_path, entry) in archiveFiles().items()
+    }
+    assert planDelta("mod.zip", folder, files) is None
+    assert planDelta("mod.zip", str(tmp_path / "missing"), archiveFiles()) is None
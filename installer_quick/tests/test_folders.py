@@ -0,0 +1,31 @@
+# -*- encoding: utf-8 -*-
+
+import pytest
+
+from ..folders import MOD_META_FILES, iterFolderFiles
+
+
+def test_files_of_sub_folders(tmp_path):
+    (tmp_path / "Textures" / "Empty").mkdir(parents=True)
+    (tmp_path / "Textures" / "A.dds").write_bytes(b"abc")
+    (tmp_path / "plugin.esp").write_bytes(b"")
+
+    files = dict(iterFolderFiles(str(tmp_path)))
+    assert sorted(files) == ["Textures/A.dds", "plugin.esp"]
+    assert files["Textures/A.dds"].stat().st_size == 3
+
+
+def test_meta_files_are_only_skipped_at_the_root(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "Meta.ini").write_bytes(b"")
+    (tmp_path / "docs" / "meta.ini").write_bytes(b"")
+
+    assert [name for name, _ in iterFolderFiles(str(tmp_path), MOD_META_FILES)] == [
+        "docs/meta.ini"
+    ]
+
+
+def test_missing_folder(tmp_path):
+    assert list(iterFolderFiles(str(tmp_path / "missing"))) == []
+    with pytest.raises(OSError):
+        list(iterFolderFiles(str(tmp_path / "missing"), ignore_errors=False))
@@ -0,0 +1,43 @@
+# -*- encoding: utf-8 -*-
+
+from ..analysis import findArchiveBase
+from ..footprint import FREE_SPACE_MARGIN, DiskFootprint, measureFootprint
+from ..listing import ArchiveEntry
+from .helpers import makeRules, makeTree
+
+
+def analyze(*paths):
+    analysis = findArchiveBase(
+        makeTree(*paths), makeRules(), lambda tree: tree.find("plugin.esp") is not None
+    )
+    assert analysis is not None
+    return analysis
+
+
+def test_listed_archive():
+    analysis = analyze("Mod/plugin.esp", "Mod/textures/a.dds")
+    entries = {
+        "mod/plugin.esp": ArchiveEntry("Mod/plugin.esp", False, 10, None),
+        "mod/textures/a.dds": ArchiveEntry("Mod/textures/a.dds", False, 20, None),
+    }
+
+    footprint = measureFootprint(analysis, entries, None, archiveSize=5)
+    assert footprint == DiskFootprint(2, 30, None, False)
+    assert not footprint.checked and footprint.fits
+
+
+def test_archive_size_is_used_without_lister():
+    analysis = analyze("plugin.esp")
+
+    footprint = measureFootprint(analysis, None, None, archiveSize=100)
+    assert footprint.bytes == 100 and footprint.estimated
+
+    # Without the size of the archive, the check is skipped:
+    footprint = measureFootprint(analysis, None, None)
+    assert footprint.bytes is None and not footprint.estimated
+
+
+def test_estimated_footprint_is_refused():
+    # The estimate is a lower bound, so it is enough to refuse an installation:
+    assert not DiskFootprint(1, FREE_SPACE_MARGIN, FREE_SPACE_MARGIN, True).fits
+    assert DiskFootprint(1, 0, FREE_SPACE_MARGIN, True).fits
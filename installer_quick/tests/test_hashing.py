@@ -0,0 +1,36 @@
+# -*- encoding: utf-8 -*-
+
+import threading
+
+import pytest
+
+from ..hashing import ArchiveHasher, HashStore, hashArchive
+
+
+def test_hash_can_be_interrupted(tmp_path):
+    archive = tmp_path / "mod.zip"
+    archive.write_bytes(b"content" * 100)
+
+    stop = threading.Event()
+    assert hashArchive(str(archive), 16, stop) == hashArchive(str(archive))
+
+    stop.set()
+    with pytest.raises(InterruptedError):
+        hashArchive(str(archive), 16, stop)
+
+
+def test_hasher_shutdown(tmp_path):
+    archive = tmp_path / "mod.zip"
+    archive.write_bytes(b"content")
+
+    store = HashStore(str(tmp_path / "hashes.sqlite"))
+    hasher = ArchiveHasher(store)
+    try:
+        assert hasher.submit(str(archive)).result() == hashArchive(str(archive))
+    finally:
+        hasher.shutdown()
+
+    # The archives are not hashed anymore once the hasher is shut down:
+    with pytest.raises(RuntimeError):
+        hasher.submit(str(tmp_path / "other.zip"))
+    store.close()
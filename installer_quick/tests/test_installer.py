@@ -0,0 +1,145 @@
+# -*- encoding: utf-8 -*-
+
+"""
+The tests of the installer itself use the stand-in for mobase and the organizer of the
+development tools (see devtools.benchmark), and require PyQt5 for the dialog.
+"""
+
+import os
+import zipfile
+
+import pytest
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from ..batch import BatchItem, InstallOutcome
+from ..devtools.benchmark import createInstaller
+from ..filetree import PyFileTree
+from ..listing import findLister
+from .helpers import makeTree
+
+# The stand-in is installed by the development tools:
+import mobase  # noqa: E402 isort:skip
+
+
+class FakeMod:
+    def __init__(self, path: str):
+        self._path = path
+
+    def name(self) -> str:
+        return os.path.basename(self._path)
+
+    def absolutePath(self) -> str:
+        return self._path
+
+
+@pytest.fixture
+def installer(tmp_path):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+
+    installer = createInstaller(str(tmp_path / "data"))
+
+    # Accept the dialog as soon as it is shown:
+    def accept():
+        dialog = installer._dialog
+        if dialog is not None and dialog.isVisible():
+            dialog.accept()
+
+    timer = QTimer()
+    timer.timeout.connect(accept)
+    timer.start(1)
+    yield installer
+    timer.stop()
+
+
+def createArchive(path, files):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name in files:
+            archive.writestr(name, name.encode("utf-8"))
+    return str(path)
+
+
+def test_install(installer):
+    tree = makeTree("Mod/Data/plugin.esp", "Mod/readme.txt")
+
+    assert installer.isArchiveSupported(tree)
+    result = installer.install(mobase.GuessedString("Mod"), tree, "", 0)
+
+    # The data folder is the root of the installed tree, with the text files:
+    assert isinstance(result, PyFileTree)
+    assert sorted(e.name() for e in result) == ["plugin.esp", "readme.txt"]
+
+
+def installArchive(installer, archive, result, mod):
+    """ Install the given archive as MO2 does, with the given result. """
+    tree = PyFileTree.fromEntries(findLister(archive)(archive))  # type: ignore
+
+    installer.onInstallationStart(archive, False, None)
+    assert installer.isArchiveSupported(tree)
+    installed = installer.install(mobase.GuessedString("Mod"), tree, "", 0)
+    installer.onInstallationEnd(result, mod)
+    return installed
+
+
+def test_installation_cycle(installer, tmp_path):
+    archive = createArchive(
+        tmp_path / "mod.zip", ["Mod/plugin.esp", "Mod/textures/a.dds"]
+    )
+
+    # The entry of the journal is kept when the installation fails:
+    installArchive(installer, archive, mobase.InstallResult.FAILED, None)
+    entry = installer._findInterrupted(archive)
+    assert entry is not None and entry.name == "Mod"
+
+    result = installArchive(
+        installer,
+        archive,
+        mobase.InstallResult.SUCCESS,
+        FakeMod(str(tmp_path / "mods" / "Mod")),
+    )
+    assert isinstance(result, PyFileTree)
+    assert sorted(e.name() for e in result) == ["plugin.esp", "textures"]
+
+    # The installation is not interrupted anymore, and the installed files are not
+    # recorded since the delta installations are disabled:
+    assert installer._findInterrupted(archive) is None
+    journal = installer._installJournal()
+    assert journal.installedFiles(str(tmp_path / "mods" / "Mod")) is None
+
+
+def test_installed_files_are_recorded_for_the_installed_mod(installer, tmp_path):
+    installer._organizer._settings["delta"] = True
+    installer._context.invalidate()
+
+    # The mod is renamed when MO2 asks to merge or replace it:
+    archive = createArchive(
+        tmp_path / "mod.zip", ["Mod/plugin.esp", "Mod/textures/a.dds"]
+    )
+    folder = os.path.join(installer._organizer.modsPath(), "Renamed")
+    installArchive(installer, archive, mobase.InstallResult.SUCCESS, FakeMod(folder))
+
+    journal = installer._installJournal()
+    assert journal.installedFiles(folder) == {"plugin.esp", "textures/a.dds"}
+
+    installer._onModRemoved("Renamed")
+    assert journal.installedFiles(folder) is None
+
+
+def test_batch_archives_without_lister_are_checked_from_the_tree(installer):
+    item = BatchItem("mod.rar")
+    installer._batchItem = item
+
+    # The installer is asked first, so that it can skip the archives claimed by the
+    # other installers:
+    assert installer.priority() > installer._setting("priority")
+
+    tree = makeTree("Mod/fomod/ModuleConfig.xml", "Mod/plugin.esp")
+    assert installer.isArchiveSupported(tree)
+    result = installer.install(mobase.GuessedString("Mod"), tree, "", 0)
+    assert result == mobase.InstallResult.CANCELED
+    assert item.outcome is InstallOutcome.MANUAL_REQUESTED and item.error
+
+    installer._batchItem = None
+    assert installer.priority() == installer._setting("priority")
@@ -0,0 +1,107 @@
+# -*- encoding: utf-8 -*-
+
+import os
+import zlib
+
+from ..journal import InstallJournal, JournalEntry, filesDigest, planResume
+from ..listing import ArchiveEntry
+
+IDENTITY = (10, 20, b"hash")
+
+# Content of the files of the archive, by path in the mod folder:
+CONTENT = {"Plugin.esp": b"plugin", "Textures/A.dds": b"texture"}
+
+
+def installedFiles():
+    """ The files to install, as given to planResume(). """
+    return {
+        path.casefold(): (
+            path,
+            ArchiveEntry("Mod/" + path, False, len(data), zlib.crc32(data)),
+        )
+        for path, data in CONTENT.items()
+    }
+
+
+def interruptInstallation(folder):
+    """ Extract the files of CONTENT as if the installation was interrupted while
+    extracting Textures/A.dds, and return the entry of the installation. """
+    for path, data in (("Plugin.esp", b"plugin"), ("Textures/A.dds", b"tex")):
+        os.makedirs(os.path.join(folder, os.path.dirname(path)), exist_ok=True)
+        with open(os.path.join(folder, path), "wb") as fp:
+            fp.write(data)
+    return JournalEntry("Mod", "", filesDigest(installedFiles().values()))
+
+
+def test_entries(tmp_path):
+    journal = InstallJournal(str(tmp_path / "journal.sqlite"))
+    entry = JournalEntry("Mod", "Mod 1.0", b"digest")
+
+    assert journal.find(IDENTITY) is None
+    journal.begin(IDENTITY, entry)
+    assert journal.find(IDENTITY) == entry
+    assert journal.find((10, 20, b"other")) is None
+
+    journal.finish(IDENTITY)
+    assert journal.find(IDENTITY) is None
+
+
+def test_installed_files(tmp_path):
+    journal = InstallJournal(str(tmp_path / "journal.sqlite"))
+    folder = str(tmp_path / "mods" / "Mod")
+
+    assert journal.installedFiles(folder) is None
+
+    journal.setInstalledFiles(folder, ["Plugin.esp", "Textures/A.dds"])
+    assert journal.installedFiles(folder) == {"plugin.esp", "textures/a.dds"}
+
+    # The files of the next installation replace the previous ones:
+    journal.setInstalledFiles(folder, ["Plugin.esp"])
+    journal.close()
+    assert journal.installedFiles(folder) == {"plugin.esp"}
+
+    journal.setInstalledFiles(folder, [])
+    assert journal.installedFiles(folder) == frozenset()
+
+    journal.removeMod(folder)
+    assert journal.installedFiles(folder) is None
+
+
+def test_resume(tmp_path):
+    folder = str(tmp_path / "Mod")
+    entry = interruptInstallation(folder)
+
+    plan = planResume("mod.zip", folder, entry, installedFiles())
+    assert plan is not None
+
+    # Only the file completely extracted is kept, and nothing is removed:
+    assert list(plan.unchanged) == ["Plugin.esp"]
+    assert plan.removed == []
+
+
+def test_resume_requires_the_same_files(tmp_path):
+    folder = str(tmp_path / "Mod")
+    entry = interruptInstallation(folder)
+    files = installedFiles()
+
+    # A file was added to the installation:
+    extra = dict(files)
+    extra["readme.txt"] = ("readme.txt", ArchiveEntry("Mod/readme.txt", False, 1, 0))
+    assert planResume("mod.zip", folder, entry, extra) is None
+
+    # A file of the installation changed:
+    path, archive_entry = files["plugin.esp"]
+    changed = dict(files)
+    changed["plugin.esp"] = (path, archive_entry._replace(crc=1))
+    assert planResume("mod.zip", folder, entry, changed) is None
+
+    # The digest does not depend on how the files are given:
+    assert filesDigest(iter(list(files.values()))) == entry.digest
+
+    # The files must all be in the listing of the archive, with their CRC:
+    assert filesDigest([("readme.txt", None)]) is None
+
+    # The CRC of the files are needed to verify them:
+    unknown = {key: (path, e._replace(crc=None)) for key, (path, e) in files.items()}
+    assert filesDigest(unknown.values()) is None
+    assert planResume("mod.zip", folder, entry, unknown) is None
@@ -0,0 +1,128 @@
+# -*- encoding: utf-8 -*-
+
+from ..analysis import findArchiveBase
+from ..conflicts import iterInstalledFiles
+from ..footprint import measureFootprint
+from ..junk import JunkFilter, removeJunk
+from ..listing import ArchiveEntry
+from ..rules import LayoutRules
+from .helpers import makeRules, makeTree
+
+
+def checker(tree):
+    return tree.find("plugin.esp") is not None
+
+
+def analyze(tree, rules):
+    analysis = findArchiveBase(tree, rules, checker)
+    assert analysis is not None
+    return analysis
+
+
+def test_junk_patterns():
+    rules = makeRules()
+    assert rules.isJunk("THUMBS.DB") and rules.isJunk("._Plugin.esp")
+    assert not rules.isJunk("_plugin.esp") and not rules.isJunk("thumbs.db.bak")
+    assert rules.isJunk("__MacOSX", root=True) and not rules.isJunk("__MacOSX")
+
+    # Patterns starting with a wildcard can match any name:
+    rules = makeRules(LayoutRules(junk=("._*", "*.URL")))
+    assert rules.isJunk("Nexus.url") and rules.isJunk("._a")
+    assert not rules.isJunk("readme.txt")
+
+
+def test_nested_junk_is_removed():
+    rules = makeRules()
+    tree = makeTree(
+        "Mod/plugin.esp",
+        "Mod/Thumbs.db",
+        "Mod/textures/desktop.ini",
+        "Mod/textures/a.dds",
+        "Mod/textures/._a.dds",
+    )
+    analysis = analyze(tree, rules)
+
+    report = removeJunk(
+        analysis,
+        rules,
+        lambda: {"mod/thumbs.db": ArchiveEntry("Mod/Thumbs.db", False, 10, None)},
+    )
+    assert report == (3, 10)
+    assert sorted(iterInstalledFiles(analysis)) == ["plugin.esp", "textures/a.dds"]
+
+
+def test_anchored_patterns_only_match_the_root():
+    rules = makeRules()
+    tree = makeTree(
+        "plugin.esp",
+        "Screenshots/a.png",
+        "__MACOSX/._plugin.esp",
+        "textures/screenshots/a.dds",
+    )
+
+    assert removeJunk(analyze(tree, rules), rules).files == 2
+    assert tree.find("textures/screenshots/a.dds") is not None
+    assert tree.find("Screenshots") is None
+    assert tree.find("__MACOSX") is None
+
+
+def test_data_text_root():
+    # For data-text archives, the root of the mod contains the entries of the data
+    # folder and the entries next to it:
+    rules = makeRules()
+    tree = makeTree(
+        "Data/plugin.esp", "Data/Screenshots/a.png", "readme.txt", "Thumbs.db"
+    )
+    analysis = analyze(tree, rules)
+    assert analysis.data is tree.find("Data")
+
+    assert removeJunk(analysis, rules).files == 2
+    assert tree.find("Data/Screenshots") is None
+    assert tree.find("Thumbs.db") is None
+
+
+def test_psd_files_are_not_junk():
+    rules = makeRules()
+    tree = makeTree("plugin.esp", "textures/source.psd")
+    assert removeJunk(analyze(tree, rules), rules).files == 0
+
+
+def test_empty_folders_are_pruned():
+    rules = makeRules()
+    tree = makeTree("Mod/plugin.esp", "Mod/a/b/Thumbs.db", "Mod/a/c.dds")
+    analysis = analyze(tree, rules)
+
+    removeJunk(analysis, rules)
+    assert tree.find("Mod/a/b") is None
+    assert tree.find("Mod/a/c.dds") is not None
+
+    # The roots of the mod are kept even if they are empty:
+    tree = makeTree("Data/Thumbs.db", "readme.txt")
+    analysis = findArchiveBase(tree, rules, lambda t: False)
+    assert analysis is not None and analysis.data is tree.find("Data")
+
+    assert removeJunk(analysis, rules).files == 1
+    assert tree.find("Data") is analysis.data
+
+
+def test_junk_is_found_during_the_footprint():
+    rules = makeRules(LayoutRules(junk=("*.bak",)))
+    tree = makeTree("plugin.esp", "plugin.esp.bak")
+    analysis = analyze(tree, rules)
+
+    junk = JunkFilter(rules)
+    footprint = measureFootprint(
+        analysis, None, None, junk.iterInstalledEntries(analysis)
+    )
+    assert footprint.files == 1
+    assert tree.find("plugin.esp.bak") is not None
+
+    assert junk.remove().files == 1
+    assert [e.name() for e in tree] == ["plugin.esp"]
+
+
+def test_no_junk():
+    rules = makeRules(LayoutRules(junk=()))
+    tree = makeTree("plugin.esp", "Thumbs.db")
+    assert removeJunk(analyze(tree, rules), rules) == (0, 0)
+    assert tree.find("Thumbs.db") is not None
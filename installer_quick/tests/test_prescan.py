@@ -0,0 +1,45 @@
+# -*- encoding: utf-8 -*-
+
+from ..listing import ArchiveEntry
+from ..prescan import ScanVerdict, scanArchive
+from ..rules import LayoutRules
+from .helpers import makeRules
+
+
+def scan(tmp_path, *paths, rules=None):
+    """ Scan an archive containing the given files, with the given rules. """
+    archive = tmp_path / "mod.zip"
+    archive.write_bytes(b"")
+    return scanArchive(
+        str(archive),
+        lambda path: [ArchiveEntry(p, False, 1, None) for p in paths],
+        rules if rules is not None else makeRules(),
+    )
+
+
+def test_data_text_archives(tmp_path):
+    result = scan(tmp_path, "Mod/Data/plugin.esp", "Mod/readme.txt")
+    assert result.verdict is ScanVerdict.SUPPORTED and result.base == "Mod"
+
+    # Data-text archives found by the search in the sub-folders are supported too:
+    result = scan(tmp_path, "Mod/A/Data/a.esp", "Mod/A/readme.txt", "Mod/images/a.png")
+    assert result.verdict is ScanVerdict.SUPPORTED and result.base == "Mod/A"
+
+
+def test_data_layouts(tmp_path):
+    paths = ("Mod/Main/textures/a.dds", "Mod/Main/b.esp", "Mod/docs/readme.txt")
+
+    # Without the entries identifying a data folder, the mod-data-checker decides:
+    result = scan(tmp_path, *paths)
+    assert result.verdict is ScanVerdict.UNKNOWN and result.base == "Mod"
+
+    rules = makeRules(LayoutRules(dataContents=("textures", "*.ESP")))
+    result = scan(tmp_path, *paths, rules=rules)
+    assert result.verdict is ScanVerdict.SUPPORTED and result.base == "Mod/Main"
+
+    result = scan(tmp_path, "Mod/readme.md", rules=rules)
+    assert result.verdict is ScanVerdict.UNKNOWN and result.base == "Mod"
+
+
+def test_empty_archives(tmp_path):
+    assert scan(tmp_path).verdict is ScanVerdict.UNSUPPORTED
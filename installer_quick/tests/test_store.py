@@ -0,0 +1,35 @@
+# -*- encoding: utf-8 -*-
+
+import pytest
+
+from ..analysis import LayoutKind
+from ..cache import CachedVerdict, VerdictCache
+from ..store import SQLiteStore
+
+
+def test_store_is_opened_again_after_close(tmp_path):
+    # The folder of the database is created when the store is first used:
+    cache = VerdictCache(str(tmp_path / "cache" / "verdicts.sqlite"), "1")
+    verdict = CachedVerdict("Mod", 1, LayoutKind.DATA, "Mod")
+
+    cache.put((1, 2, b"hash"), verdict)
+    cache.close()
+    assert cache.get((1, 2, b"hash")) == verdict
+    cache.close()
+
+
+def test_verdicts_of_other_versions_are_discarded(tmp_path):
+    path = str(tmp_path / "verdicts.sqlite")
+    verdict = CachedVerdict("", 0, LayoutKind.DATA_TEXT, None)
+
+    cache = VerdictCache(path, "1")
+    cache.put((1, 2, b"hash"), verdict)
+    cache.close()
+
+    assert VerdictCache(path, "1").get((1, 2, b"hash")) == verdict
+    assert VerdictCache(path, "2").get((1, 2, b"hash")) is None
+
+
+def test_store_must_create_its_tables():
+    with pytest.raises(TypeError):
+        SQLiteStore("store.sqlite")  # type: ignore
@@ -0,0 +1,156 @@
+# -*- encoding: utf-8 -*-
+
+"""
+This module contains statistics on the folders of archive trees (number of folders
+and files, suffixes of the files, ...), computed once per folder and memoized, so that
+the installer does not walk the same folders again and again through the bindings.
+
+The statistics are local to the installer: the mod-data-checkers of the games live in
+other plugins (e.g. GenericGameModDataChecker in game_generic, which only checks that
+the tree is not empty) and do not read them.
+
+The statistics of a folder only describe its direct entries (see TreeStats).
+"""
+
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+# Type of the trees and entries (see analysis.FileTree):
+FileTree = Any
+
+
+class TreeStats(NamedTuple):
+
+    """ Statistics on the direct entries of a folder. The ignored entries are not
+    counted (see TreeStatsCache). """
+
+    # The sub-folders, by casefolded name:
+    folders: Dict[str, FileTree]
+
+    # Number of files, and number of files for each suffix (casefolded, without the
+    # ., empty for files without suffix):
+    files: int
+    suffixes: Counter
+
+    def countSuffixes(self, suffixes: Iterable[str]) -> int:
+        """ Count the files with the given suffixes.
+
+        Args:
+            suffixes: The casefolded suffixes (without the .).
+
+        Returns: The number of files with one of the given suffixes.
+        """
+        return sum(self.suffixes[suffix] for suffix in suffixes)
+
+
+class TreeStatsCache:
+
+    """ Cache of the statistics of the folders of archive trees.
+
+    The statistics are memoized by folder and are computed again if the number of
+    entries of the folder changed. The cache must be cleared when trees are modified
+    in any other way (e.g. by merging trees).
+    """
+
+    _isIgnored: Optional[Callable[[str], bool]]
+
+    # The statistics of each folder, by id of the folder, with the folder itself (so
+    # that the id is not reused) and its number of entries:
+    _levels: Dict[int, Tuple[FileTree, int, TreeStats]]
+
+    # Number of folders walked and number of reads of the statistics:
+    walks: int
+    reads: int
+
+    def __init__(self, isIgnored: Optional[Callable[[str], bool]] = None):
+        """
+        Args:
+            isIgnored: Predicate used to check if an entry should be ignored, given
+                its name, or None to count all the entries.
+        """
+        self._isIgnored = isIgnored
+        self._levels = {}
+        self.walks = 0
+        self.reads = 0
+
+    def reset(self, isIgnored: Optional[Callable[[str], bool]] = None):
+        """ Clear the cache and change the predicate for the ignored entries, e.g.,
+        when the rules change.
+
+        Args:
+            isIgnored: See __init__().
+        """
+        self.clear()
+        self._isIgnored = isIgnored
+
+    def cached(self, tree: FileTree) -> Optional[TreeStats]:
+        """ Retrieve the statistics on the direct entries of the given folder if they
+        were already computed.
+
+        This is useful for checks that can stop before walking all the entries, for
+        which computing the statistics would be slower when they are not needed
+        afterwards.
+
+        Args:
+            tree: The folder.
+
+        Returns: The statistics of the folder, or None if they are not known.
+        """
+        cached = self._levels.get(id(tree))
+        if cached is not None and cached[0] is tree and cached[1] == len(tree):
+            self.reads += 1
+            return cached[2]
+        return None
+
+    def level(self, tree: FileTree) -> TreeStats:
+        """ Retrieve the statistics on the direct entries of the given folder,
+        computing them if needed (in a single pass over the entries).
+
+        Args:
+            tree: The folder.
+
+        Returns: The statistics of the folder.
+        """
+        self.reads += 1
+        count = len(tree)
+        cached = self._levels.get(id(tree))
+        if cached is not None and cached[0] is tree and cached[1] == count:
+            return cached[2]
+
+        self.walks += 1
+        is_ignored = self._isIgnored
+
+        folders: Dict[str, FileTree] = {}
+        files = 0
+        suffixes: Counter = Counter()
+
+        for e in tree:
+            name = e.name()
+            if is_ignored is not None and is_ignored(name):
+                continue
+            if e.isDir():
+                folders[name.casefold()] = e
+            else:
+                files += 1
+                suffixes[e.suffix().casefold()] += 1
+
+        stats = TreeStats(folders, files, suffixes)
+        self._levels[id(tree)] = (tree, count, stats)
+        return stats
+
+    def discard(self, tree: FileTree):
+        """ Drop the statistics of the given folder, e.g., when they are not needed
+        anymore.
+
+        Args:
+            tree: The folder.
+        """
+        self._levels.pop(id(tree), None)
+
+    def clear(self):
+        """ Drop all the statistics (and the references to the trees). """
+        self._levels.clear()
+
+    def counters(self) -> Dict[str, int]:
+        """ Retrieve the counters of the cache, e.g., for the telemetry. """
+        return {"walks": self.walks, "reads": self.reads}
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'batchinstalldialog.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_BatchInstallDialog(object):
+    def setupUi(self, BatchInstallDialog):
+        BatchInstallDialog.setObjectName("BatchInstallDialog")
+        BatchInstallDialog.resize(500, 400)
+        self.verticalLayout = QtWidgets.QVBoxLayout(BatchInstallDialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.label = QtWidgets.QLabel(BatchInstallDialog)
+        self.label.setWordWrap(True)
+        self.label.setObjectName("label")
+        self.verticalLayout.addWidget(self.label)
+        self.archiveList = QtWidgets.QListWidget(BatchInstallDialog)
+        self.archiveList.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.archiveList.setObjectName("archiveList")
+        self.verticalLayout.addWidget(self.archiveList)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.installBtn = QtWidgets.QPushButton(BatchInstallDialog)
+        self.installBtn.setDefault(True)
+        self.installBtn.setObjectName("installBtn")
+        self.horizontalLayout.addWidget(self.installBtn)
+        self.cancelBtn = QtWidgets.QPushButton(BatchInstallDialog)
+        self.cancelBtn.setObjectName("cancelBtn")
+        self.horizontalLayout.addWidget(self.cancelBtn)
+        self.verticalLayout.addLayout(self.horizontalLayout)
+
+        self.retranslateUi(BatchInstallDialog)
+        QtCore.QMetaObject.connectSlotsByName(BatchInstallDialog)
+
+    def retranslateUi(self, BatchInstallDialog):
+        _translate = QtCore.QCoreApplication.translate
+        BatchInstallDialog.setWindowTitle(_translate("BatchInstallDialog", "Batch Install - Python"))
+        self.label.setText(_translate("BatchInstallDialog", "The selected archives are installed one after the other, without showing any dialog. Archives that need a choice from you are skipped and listed at the end."))
+        self.installBtn.setText(_translate("BatchInstallDialog", "Install"))
+        self.cancelBtn.setText(_translate("BatchInstallDialog", "Cancel"))
@@ -27,6 +27,16 @@ class Ui_SimpleInstallDialog(object):
         self.horizontalLayout.addWidget(self.nameCombo)
         self.horizontalLayout.setStretch(1, 1)
         self.verticalLayout.addLayout(self.horizontalLayout)
+        self.conflictLabel = QtWidgets.QLabel(SimpleInstallDialog)
+        self.conflictLabel.setText("")
+        self.conflictLabel.setWordWrap(True)
+        self.conflictLabel.setObjectName("conflictLabel")
+        self.verticalLayout.addWidget(self.conflictLabel)
+        self.spaceLabel = QtWidgets.QLabel(SimpleInstallDialog)
+        self.spaceLabel.setText("")
+        self.spaceLabel.setWordWrap(True)
+        self.spaceLabel.setObjectName("spaceLabel")
+        self.verticalLayout.addWidget(self.spaceLabel)
         self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_2.setObjectName("horizontalLayout_2")
         self.manualBtn = QtWidgets.QPushButton(SimpleInstallDialog)